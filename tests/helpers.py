@@ -0,0 +1,12 @@
+"""Stand-ins shared by several test modules."""
+from webresearch.tools.base import Tool
+
+
+class StubSearch(Tool):
+    """search tool that echoes its query without any network access."""
+
+    @property
+    def name(self): return "search"
+    @property
+    def description(self): return "stub search"
+    def execute(self, query: str) -> str: return f"results for {query}"
@@ -0,0 +1,125 @@
+"""Tests for AsyncReActAgent and the async tool / LLM contract — no API keys needed."""
+import asyncio
+import re
+import time
+
+from webresearch.agent import AsyncReActAgent
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.tools import ToolManager, ThinkTool
+
+from tests.helpers import StubSearch
+
+
+class _SyncLLM:
+    """Blocking LLM with no agenerate — exercises the thread adapter."""
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self._index = 0
+
+    def generate(self, prompt: str) -> str:
+        resp = self._responses[self._index % len(self._responses)]
+        self._index += 1
+        return resp
+
+
+class _AsyncLLM:
+    """Native-async LLM that takes `delay` seconds per call."""
+
+    def __init__(self, responses, delay=0.0):
+        self._responses = list(responses)
+        self.delay = delay
+        self.calls = 0
+        self._per_task = {}
+
+    def generate(self, prompt: str) -> str:
+        raise AssertionError("blocking generate() must not be used when agenerate exists")
+
+    async def agenerate(self, prompt: str) -> str:
+        await asyncio.sleep(self.delay)
+        # Script position is tracked per task so concurrent sessions don't interleave
+        task = re.search(r"TASK:\n(.+)", prompt).group(1)
+        step = self._per_task.get(task, 0)
+        self._per_task[task] = step + 1
+        self.calls += 1
+        return self._responses[min(step, len(self._responses) - 1)]
+
+
+_SCRIPT = [
+    'Thought: Search.\nAction: search\nAction Input: {"query": "q"}',
+    'Thought: Done.\nFinal Answer: Found it.',
+]
+
+
+def _tm():
+    tm = ToolManager()
+    tm.register_tool(ThinkTool())
+    tm.register_tool(StubSearch())
+    return tm
+
+
+def test_async_run_with_sync_llm_adapter():
+    agent = AsyncReActAgent(llm=_SyncLLM(_SCRIPT), tool_manager=_tm(), max_iterations=4)
+    result = asyncio.run(agent.run("Find it"))
+    assert result == "Found it."
+    trace = agent.get_execution_trace()
+    assert trace[0]["action"] == "search"
+    assert "results for q" in trace[0]["observation"]
+
+
+def test_async_run_uses_native_agenerate():
+    llm = _AsyncLLM(_SCRIPT)
+    agent = AsyncReActAgent(llm=llm, tool_manager=_tm(), max_iterations=4)
+    assert asyncio.run(agent.run("Find it")) == "Found it."
+    assert llm.calls == 2
+
+
+def test_many_sessions_share_one_event_loop():
+    llm = _AsyncLLM(_SCRIPT, delay=0.05)
+    tm = _tm()
+    agents = [AsyncReActAgent(llm=llm, tool_manager=tm, max_iterations=4) for _ in range(100)]
+
+    async def main():
+        return await asyncio.gather(*(a.run(f"task {i}") for i, a in enumerate(agents)))
+
+    start = time.time()
+    answers = asyncio.run(main())
+    elapsed = time.time() - start
+
+    assert answers == ["Found it."] * 100
+    # Two sequential LLM calls per session; run serially this would take 10s
+    assert elapsed < 3.0
+
+
+def test_async_step_callback_fires():
+    seen = []
+    agent = AsyncReActAgent(llm=_AsyncLLM(_SCRIPT), tool_manager=_tm(), max_iterations=4)
+    asyncio.run(agent.run("Find it", step_callback=lambda i, s: seen.append(i)))
+    assert seen == [1, 2]
+
+
+def test_default_aexecute_adapts_sync_tool():
+    assert asyncio.run(StubSearch().aexecute(query="x")) == "results for x"
+
+
+def test_aexecute_tool_unknown_tool_returns_error():
+    result = asyncio.run(ToolManager().aexecute_tool("nope"))
+    assert result.startswith("Error: Tool 'nope' not found")
+
+
+def test_chain_agenerate_falls_back_on_quota_error():
+    class _Failing:
+        provider_name = "primary"
+        async def agenerate(self, prompt):
+            raise Exception("429 quota exceeded")
+        def generate(self, prompt):
+            raise AssertionError
+
+    class _Ok:
+        provider_name = "fallback"
+        def generate(self, prompt):
+            return "from fallback"
+
+    chain = ModelFallbackChain([_Failing(), _Ok()])
+    assert asyncio.run(chain.agenerate("hi")) == "from fallback"
+    assert chain.current_name == "fallback"
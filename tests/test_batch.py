@@ -0,0 +1,129 @@
+"""Tests for the multi-process batch runner — no API keys needed."""
+import json
+import os
+import time
+from types import SimpleNamespace
+
+from webresearch.batch import JobCheckpoint, job_id_for, run_batch
+from webresearch.ratelimit import RateLimit, SharedRateLimiter, rate_limit_for
+
+
+class _StubAgent:
+    """Answers with the task text; "boom" raises, "quota" returns an error answer.  Holds the "stub" provider slot while working."""
+
+    def __init__(self):
+        self.limiter = rate_limit_for(SimpleNamespace(rate_limits=""), "stub")
+        self.steps = 0
+
+    def run(self, task):
+        if task == "boom":
+            raise RuntimeError("tool exploded")
+        if task == "quota":
+            return "⚠ Error: The agent encountered an error: 429 quota exceeded"
+        if task == "long":
+            return "⚠ Max iterations (2) reached — answer may be incomplete.\n\npartial"
+        if isinstance(self.limiter, SharedRateLimiter):
+            with self.limiter.slot():
+                start = time.time()
+                time.sleep(0.1)
+                return f"{task}|{os.getpid()}|{start}|{time.time()}"
+        return f"{task}|{os.getpid()}"
+
+    def get_execution_trace(self):
+        return [{"step": 1}]
+
+
+def _make_agent():
+    return _StubAgent()
+
+
+def test_sequential_batch_keeps_order():
+    seen = []
+    results = run_batch(["a", "boom", "c"], _make_agent, workers=1,
+                        on_result=lambda i, r: seen.append(i))
+    assert seen == [0, 1, 2]
+    assert [r["answer"].split("|")[0] for r in (results[0], results[2])] == ["a", "c"]
+    assert results[1]["error"] == "tool exploded"
+    assert results[0]["num_steps"] == 1
+
+
+def test_process_pool_shares_rate_limit():
+    tasks = [f"t{i}" for i in range(6)]
+    seen = []
+    results = run_batch(tasks, _make_agent, workers=2,
+                        on_result=lambda i, r: seen.append(i),
+                        rate_limits={"stub": RateLimit(max_in_flight=1)})
+
+    assert sorted(seen) == list(range(6))
+    answers = [r["answer"].split("|") for r in results]
+    assert [a[0] for a in answers] == tasks
+
+    # One in-flight slot across the pool: the calls never overlap
+    spans = sorted((float(a[2]), float(a[3])) for a in answers)
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert start >= end - 0.01
+
+
+def test_process_pool_records_task_errors():
+    results = run_batch(["ok", "boom"], _make_agent, workers=2)
+    assert results[0]["answer"].startswith("ok|")
+    assert results[1]["error"] == "tool exploded"
+
+
+class _CountingAgent(_StubAgent):
+    runs = []
+
+    def run(self, task):
+        _CountingAgent.runs.append(task)
+        return super().run(task)
+
+
+def test_checkpoint_resumes_and_retries_failures(tmp_path):
+    checkpoint = JobCheckpoint("job", directory=tmp_path)
+    tasks = ["a", "boom", "c"]
+    run_batch(tasks, _StubAgent, checkpoint=checkpoint)
+    records = [json.loads(line) for line in checkpoint.path.read_text().splitlines()]
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert records[0]["trace"] == [{"step": 1}]
+    assert "started_at" in records[0] and "finished_at" in records[0]
+
+    _CountingAgent.runs = []
+    seen = []
+    results = run_batch(tasks, _CountingAgent, checkpoint=checkpoint,
+                        on_result=lambda i, r: seen.append((i, bool(r.get("resumed")))))
+    assert _CountingAgent.runs == ["boom"]              # only the failed task re-ran
+    assert seen == [(0, True), (2, True), (1, False)]
+    assert results[2]["answer"].startswith("c|")
+
+
+def test_checkpoint_retries_error_answers(tmp_path):
+    checkpoint = JobCheckpoint("job", directory=tmp_path)
+    tasks = ["a", "quota", "long"]
+    results = run_batch(tasks, _StubAgent, checkpoint=checkpoint)
+    assert "429 quota exceeded" in results[1]["error"]
+    assert "error" not in results[2]
+
+    _CountingAgent.runs = []
+    run_batch(tasks, _CountingAgent, checkpoint=checkpoint)
+    assert _CountingAgent.runs == ["quota"]             # max-iterations answers count as done
+
+
+def test_checkpoint_ignores_changed_tasks_and_torn_line(tmp_path):
+    checkpoint = JobCheckpoint("job", directory=tmp_path)
+    run_batch(["a", "b"], _StubAgent, checkpoint=checkpoint)
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"index": 2, "task_ha')                # crash mid-write
+
+    assert set(checkpoint.completed(["a", "changed"])) == {0}
+
+    _CountingAgent.runs = []
+    run_batch(["a", "b", "c"], _CountingAgent, checkpoint=checkpoint)
+    assert _CountingAgent.runs == ["c"]
+    lines = checkpoint.path.read_text().splitlines()
+    assert json.loads(lines[-1])["task"] == "c"         # torn tail was cut off
+
+
+def test_job_id_tracks_task_content():
+    assert job_id_for("nightly tasks.txt", ["a"]) == job_id_for("nightly tasks.txt", ["a"])
+    assert job_id_for("nightly tasks.txt", ["a"]) != job_id_for("nightly tasks.txt", ["b"])
+    assert job_id_for("dir/nightly tasks.txt", ["a"]).startswith("nightly_tasks-")
@@ -0,0 +1,181 @@
+"""Tests for provider circuit breakers in ModelFallbackChain — no API keys needed."""
+import asyncio
+import time
+
+import pytest
+
+from webresearch.health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.ratelimit import RateLimit, RateLimiter
+
+
+class _ScriptedLLM:
+    """Raises the queued errors in order, then answers with its name."""
+
+    def __init__(self, name, errors=()):
+        self.provider_name = name
+        self.errors = list(errors)
+        self.calls = 0
+        self.rate_limiter = RateLimiter(RateLimit(max_in_flight=4))
+
+    def generate(self, prompt):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.provider_name
+
+
+def test_breaker_opens_on_error_rate():
+    breaker = CircuitBreaker(min_calls=4, error_threshold=0.5)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(min_calls=2, slow_call_seconds=1.0)
+    breaker.record_success(5.0)
+    breaker.record_success(5.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_admits_single_probe():
+    breaker = CircuitBreaker(cooldown=0.05)
+    breaker.trip()
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    probe = breaker.allow()
+    assert probe.probe
+    assert not breaker.allow()           # second caller waits for the probe
+    breaker.record_success(0.1, probe)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_doubles_cooldown():
+    breaker = CircuitBreaker(cooldown=0.05, max_cooldown=0.08)
+    breaker.trip()
+    time.sleep(0.06)
+    probe = breaker.allow()
+    breaker.record_failure(probe)
+    assert breaker.state == OPEN
+    assert breaker.retry_at - time.monotonic() > 0.06   # capped at 0.08, not 0.05
+    time.sleep(0.09)
+    assert breaker.allow()
+
+
+def test_released_probe_can_be_retried():
+    breaker = CircuitBreaker(cooldown=0.01)
+    breaker.trip()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_parallel_quota_errors_open_the_circuit_once():
+    breaker = CircuitBreaker(cooldown=0.05, max_cooldown=1.0)
+    permits = [breaker.allow() for _ in range(4)]
+    for permit in permits:               # four in-flight calls all hit the same 429
+        breaker.trip(permit)
+    assert breaker.state == OPEN
+    assert breaker.retry_at - time.monotonic() <= 0.05   # base cool-down, not doubled
+    time.sleep(0.06)
+    assert breaker.allow().probe
+
+
+def test_late_results_do_not_settle_an_open_circuit():
+    breaker = CircuitBreaker(cooldown=0.05, slow_call_seconds=1.0)
+    early, late_fast, late_slow = breaker.allow(), breaker.allow(), breaker.allow()
+    breaker.trip(early)
+    retry_at = breaker.retry_at
+    breaker.record_success(0.1, late_fast)       # would close it if taken for the probe
+    breaker.record_success(5.0, late_slow)       # would re-open it with a doubled cool-down
+    assert breaker.state == OPEN
+    assert breaker.retry_at == retry_at
+
+
+def test_only_the_probe_closes_a_half_open_circuit():
+    breaker = CircuitBreaker(cooldown=0.05)
+    stale = breaker.allow()
+    breaker.trip()
+    time.sleep(0.06)
+    probe = breaker.allow()
+    breaker.record_success(0.1, stale)   # admitted before the circuit opened
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()           # the probe is still in flight
+    breaker.record_success(0.1, probe)
+    assert breaker.state == CLOSED
+    breaker.record_failure(stale)        # results from before the trip stay ignored
+    assert breaker.health() == 1.0
+
+
+def test_quota_error_skips_provider_until_cooldown():
+    primary = _ScriptedLLM("primary", [Exception("429 quota exceeded")])
+    backup = _ScriptedLLM("backup")
+    switches = []
+    chain = ModelFallbackChain([primary, backup], switch_callback=lambda a, b: switches.append(b),
+                               breaker_cooldown=0.1)
+    assert chain.generate("hi") == "backup"
+    assert chain.generate("hi") == "backup"
+    assert primary.calls == 1             # not re-hit while its circuit is open
+    assert switches == ["backup"]
+
+    time.sleep(0.12)
+    assert chain.generate("hi") == "primary"   # probe succeeds, traffic returns
+    assert chain.current_name == "primary"
+    assert chain.health()[0]["state"] == CLOSED
+
+
+def test_failed_probe_keeps_traffic_on_fallback():
+    primary = _ScriptedLLM("primary", [Exception("429 quota"), Exception("503 service unavailable")])
+    backup = _ScriptedLLM("backup")
+    chain = ModelFallbackChain([primary, backup], breaker_cooldown=0.05)
+    chain.generate("hi")
+    time.sleep(0.06)
+    assert chain.generate("hi") == "backup"    # probe failed
+    assert primary.calls == 2
+    assert chain.breakers[0].state == OPEN
+    time.sleep(0.06)
+    assert chain.generate("hi") == "backup"    # cool-down doubled — still skipped
+    assert primary.calls == 2
+
+
+def test_all_open_tries_soonest_provider():
+    primary = _ScriptedLLM("primary", [Exception("quota")])
+    backup = _ScriptedLLM("backup", [Exception("quota")])
+    chain = ModelFallbackChain([primary, backup], breaker_cooldown=30)
+    with pytest.raises(Exception, match="quota"):
+        chain.generate("hi")
+    assert chain.generate("hi") == "primary"
+
+
+def test_non_provider_error_does_not_trip():
+    primary = _ScriptedLLM("primary", [ValueError("bad request")] * 5)
+    chain = ModelFallbackChain([primary, _ScriptedLLM("backup")])
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            chain.generate("hi")
+    assert chain.breakers[0].state == CLOSED
+
+
+def test_async_cancel_releases_probe():
+    class _Hanging(_ScriptedLLM):
+        async def agenerate(self, prompt):
+            await asyncio.sleep(10)
+
+    llm = _Hanging("slow")
+    chain = ModelFallbackChain([llm], breaker_cooldown=0.01)
+    chain.breakers[0].trip()
+    time.sleep(0.02)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(chain.agenerate("hi"), timeout=0.05)
+
+    asyncio.run(main())
+    assert chain.breakers[0].allow()      # probe slot was given back
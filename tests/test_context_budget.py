@@ -0,0 +1,93 @@
+"""Tests for token-budget prompt trimming — no API keys needed."""
+from unittest.mock import MagicMock
+
+from webresearch.agent import ReActAgent, Step
+from webresearch.context import (
+    ContextBudget,
+    DEFAULT_CONTEXT_TOKENS,
+    Segment,
+    clip_to_tokens,
+    estimate_tokens,
+)
+from webresearch.llm_chain import ModelFallbackChain
+
+
+def _segments(*full_sizes):
+    return [Segment(summary="s" * 35, full="f" * size) for size in full_sizes]
+
+
+def test_estimate_tokens_is_conservative():
+    assert estimate_tokens("") == 0
+    # 4 chars/token is typical English; the estimate must not come in under it
+    assert estimate_tokens("a" * 4000) >= 1000
+
+
+def test_plan_keeps_everything_when_it_fits():
+    plan = ContextBudget(10_000).plan(100, _segments(350, 350, 350))
+    assert (plan.dropped, plan.summarised, plan.full) == (0, 0, 3)
+
+
+def test_plan_summarises_then_drops_oldest_first():
+    # Each full segment ≈ 100 tokens, each summary ≈ 10
+    budget = ContextBudget(100 + 32 + 200 + 20)
+    plan = budget.plan(100, _segments(*[350] * 6))
+    assert plan.full == 2
+    assert plan.summarised == 2
+    assert plan.dropped == 2
+
+
+def test_plan_clips_oversized_newest_step():
+    plan = ContextBudget(2000).plan(100, _segments(350, 350_000))
+    assert plan.full == 1
+    assert plan.clip_tokens is not None and plan.clip_tokens < 2000
+
+
+def test_clip_to_tokens_marks_the_cut():
+    clipped = clip_to_tokens("x" * 10_000, 100)
+    assert len(clipped) < 1000
+    assert clipped.endswith("[... clipped to fit the context budget]")
+    assert clip_to_tokens("short", 100) == "short"
+
+
+def test_budget_capped_by_model_window():
+    llm = MagicMock()
+    llm.context_window = 8000
+    assert ContextBudget.for_llm(llm, 32000).max_tokens == 8000
+    # MagicMock attributes that are not ints are ignored
+    assert ContextBudget.for_llm(MagicMock()).max_tokens == DEFAULT_CONTEXT_TOKENS
+
+
+def test_chain_reports_smallest_provider_window():
+    big, small, unknown = MagicMock(), MagicMock(), MagicMock()
+    big.context_window, small.context_window = 1_000_000, 8000
+    assert ModelFallbackChain([big, small, unknown]).context_window == 8000
+
+
+def _agent(budget):
+    tm = MagicMock()
+    tm.get_tool_descriptions.return_value = "TOOLS"
+    return ReActAgent(llm=MagicMock(), tool_manager=tm, context_budget=budget)
+
+
+def test_agent_prompt_stays_within_budget():
+    agent = _agent(None)
+    agent._static_prefix()
+    agent.context_budget = ContextBudget(agent._prefix_tokens + 1500)
+    for i in range(1, 30):
+        agent.steps.append(Step(thought=f"t{i:02d}", action="search", action_input={"q": i},
+                                observation=f"obs-{i:02d} " + "y" * 2000, iteration=i))
+    prompt = agent._build_prompt("task")
+    assert estimate_tokens(prompt) <= agent.context_budget.max_tokens
+    assert "obs-29" in prompt                   # newest step always kept
+    assert "obs-01" not in prompt
+    assert "oldest steps omitted" in prompt or "summarised to save context" in prompt
+
+
+def test_large_budget_keeps_full_history():
+    agent = _agent(1_000_000)
+    for i in range(1, 13):
+        agent.steps.append(Step(thought=f"t{i:02d}", action="search", action_input={"q": i},
+                                observation=f"obs-{i:02d}", iteration=i))
+    prompt = agent._build_prompt("task")
+    assert all(f"obs-{i:02d}" in prompt for i in range(1, 13))
+    assert "summarised" not in prompt
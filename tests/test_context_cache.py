@@ -0,0 +1,181 @@
+"""Tests for the stable-prefix / dynamic-suffix generate API — no API keys needed."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from webresearch.agent import AsyncReActAgent, ReActAgent
+from webresearch.llm import LLMInterface
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.tools import ToolManager
+
+from tests.helpers import StubSearch
+
+
+_SCRIPT = [
+    'Thought: Search.\nAction: search\nAction Input: {"query": "q"}',
+    'Thought: Done.\nFinal Answer: Found it.',
+]
+
+
+class _PrefixLLM:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompt):
+        raise AssertionError("generate_with_prefix should be preferred")
+
+    def generate_with_prefix(self, prefix, suffix):
+        self.calls.append((prefix, suffix))
+        return _SCRIPT[min(len(self.calls) - 1, len(_SCRIPT) - 1)]
+
+
+def _tm():
+    tm = ToolManager()
+    tm.register_tool(StubSearch())
+    return tm
+
+
+def test_agent_sends_identical_prefix_every_iteration():
+    llm = _PrefixLLM()
+    agent = ReActAgent(llm=llm, tool_manager=_tm(), max_iterations=4)
+    assert agent.run("Find it") == "Found it."
+    prefixes = {prefix for prefix, _ in llm.calls}
+    assert len(prefixes) == 1
+    assert "stub search" in prefixes.pop()
+    assert "TASK:\nFind it" in llm.calls[0][1]
+    assert "results for q" in llm.calls[1][1]
+
+
+def test_prompt_parts_join_to_full_prompt():
+    agent = ReActAgent(llm=MagicMock(), tool_manager=_tm())
+    prefix, suffix = agent._build_prompt_parts("task")
+    assert prefix + suffix == agent._build_prompt("task")
+    assert "TASK" not in prefix
+
+
+def test_async_agent_adapts_sync_prefix_llm():
+    llm = _PrefixLLM()
+    agent = AsyncReActAgent(llm=llm, tool_manager=_tm(), max_iterations=4)
+    assert asyncio.run(agent.run("Find it")) == "Found it."
+    assert len(llm.calls) == 2
+
+
+def test_chain_forwards_prefix_and_joins_for_plain_providers():
+    class _Failing:
+        provider_name = "primary"
+        def generate_with_prefix(self, prefix, suffix):
+            raise Exception("429 quota exceeded")
+
+    class _Plain:
+        provider_name = "fallback"
+        def generate(self, prompt):
+            return prompt
+
+    chain = ModelFallbackChain([_Failing(), _Plain()])
+    assert chain.generate_with_prefix("PRE|", "SUF") == "PRE|SUF"
+    assert chain.current_name == "fallback"
+
+
+# ── Gemini cached content ───────────────────────────────────────────────────
+
+def _gemini():
+    llm = LLMInterface(api_key="test-key", model_name="gemini-test", context_cache=True)
+    llm.model = MagicMock()
+    llm.model.generate_content.return_value.text = "inline"
+    return llm
+
+
+def test_gemini_creates_cache_once_and_sends_suffix_only():
+    llm = _gemini()
+    cached_model = MagicMock()
+    cached_model.generate_content.return_value.text = "cached"
+    with patch("webresearch.llm.genai.caching.CachedContent.create") as create, \
+         patch("webresearch.llm.genai.GenerativeModel.from_cached_content", return_value=cached_model):
+        assert llm.generate_with_prefix("PREFIX", "suffix 1") == "cached"
+        assert llm.generate_with_prefix("PREFIX", "suffix 2") == "cached"
+    create.assert_called_once()
+    assert create.call_args.kwargs["system_instruction"] == "PREFIX"
+    sent = [c.args[0] for c in cached_model.generate_content.call_args_list]
+    assert sent == ["suffix 1", "suffix 2"]
+    llm.model.generate_content.assert_not_called()
+
+
+def test_gemini_falls_back_when_caching_unsupported():
+    llm = _gemini()
+    with patch("webresearch.llm.genai.caching.CachedContent.create",
+               side_effect=Exception("400 cached content is too small")) as create:
+        assert llm.generate_with_prefix("PREFIX", "a") == "inline"
+        assert llm.generate_with_prefix("PREFIX", "b") == "inline"
+    create.assert_called_once()      # unsupported is remembered, not retried every step
+    llm.model.generate_content.assert_called_with("PREFIXb")
+
+
+def test_gemini_transient_create_failure_backs_off_and_retries():
+    llm = _gemini()
+    cached_model = MagicMock()
+    cached_model.generate_content.return_value.text = "cached"
+    with patch("webresearch.llm.genai.caching.CachedContent.create",
+               side_effect=[Exception("429 Resource has been exhausted"), MagicMock()]) as create, \
+         patch("webresearch.llm.genai.GenerativeModel.from_cached_content", return_value=cached_model):
+        assert llm.generate_with_prefix("PREFIX", "a") == "inline"
+        assert llm.generate_with_prefix("PREFIX", "b") == "inline"    # still backing off
+        assert create.call_count == 1
+        assert llm.context_cache is True
+        llm._context_retry_at[llm._context_key("PREFIX")] = 0          # back-off elapsed
+        assert llm.generate_with_prefix("PREFIX", "c") == "cached"
+    assert create.call_count == 2
+
+
+def test_gemini_unsupported_model_disables_caching():
+    llm = _gemini()
+    with patch("webresearch.llm.genai.caching.CachedContent.create",
+               side_effect=Exception("400 Model gemini-test is not supported for createCachedContent")):
+        assert llm.generate_with_prefix("PREFIX", "a") == "inline"
+    assert llm.context_cache is False
+
+
+def test_gemini_concurrent_callers_create_cache_once():
+    llm = _gemini()
+    cached_model = MagicMock()
+    cached_model.generate_content.return_value.text = "cached"
+
+    def slow_create(**kwargs):
+        time.sleep(0.1)
+        return MagicMock()
+
+    results = []
+    with patch("webresearch.llm.genai.caching.CachedContent.create", side_effect=slow_create) as create, \
+         patch("webresearch.llm.genai.GenerativeModel.from_cached_content", return_value=cached_model):
+        threads = [threading.Thread(target=lambda: results.append(llm.generate_with_prefix("PREFIX", "s")))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        # The lock is not held across the RPC: an unrelated lookup returns at once
+        time.sleep(0.02)
+        started = time.time()
+        with llm._context_lock:
+            pass
+        assert time.time() - started < 0.05
+        for t in threads:
+            t.join()
+    assert create.call_count == 1
+    assert results == ["cached"] * 4
+
+
+def test_gemini_expired_cache_falls_back_to_full_prompt():
+    llm = _gemini()
+    cached_model = MagicMock()
+    cached_model.generate_content.side_effect = Exception("404 CachedContent not found")
+    with patch("webresearch.llm.genai.caching.CachedContent.create"), \
+         patch("webresearch.llm.genai.GenerativeModel.from_cached_content", return_value=cached_model):
+        assert llm.generate_with_prefix("PREFIX", "s") == "inline"
+    assert llm._context_models == {}
+
+
+def test_gemini_context_cache_disabled():
+    llm = _gemini()
+    llm.context_cache = False
+    with patch("webresearch.llm.genai.caching.CachedContent.create") as create:
+        assert llm.generate_with_prefix("PREFIX", "s") == "inline"
+    create.assert_not_called()
@@ -0,0 +1,111 @@
+"""Tests for adaptive fan-out width and worker-pool sizing — no API keys needed."""
+import threading
+import time
+from unittest.mock import MagicMock
+
+from webresearch.fanout import FanOutController, FanOutSignals
+from webresearch.health import RollingRate
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.parallel import ParallelResearchAgent
+from webresearch.ratelimit import RateLimit, RateLimiter
+
+
+class _StubLLM:
+    def __init__(self, limit=RateLimit(max_in_flight=4)):
+        self.provider_name = "stub"
+        self.rate_limiter = RateLimiter(limit)
+
+    def generate(self, prompt):
+        return "ok"
+
+
+def _chain(limit=RateLimit(max_in_flight=4), p50=None, throttled=0, calls=10):
+    chain = ModelFallbackChain([_StubLLM(limit)])
+    for _ in range(5 if p50 else 0):
+        chain.latency[0].record(p50)
+    for n in range(calls):
+        chain.throttled[0].record(n < throttled)
+    return chain
+
+
+def test_width_follows_planner_and_halves_when_throttled():
+    calm = FanOutController(_chain(), max_sub_queries=6)
+    assert calm.width(3) == 3
+    assert calm.width(9) == 6
+
+    throttled = FanOutController(_chain(throttled=4), max_sub_queries=6)
+    assert throttled.width(6) == 3
+    assert "throttled" in throttled.decisions[-1]["reason"]
+
+
+def test_initial_workers_capped_by_quota():
+    # Two in-flight LLM slots keep about four sub-agents busy
+    assert FanOutController(_chain(RateLimit(max_in_flight=2)), max_workers=8).initial_workers(8) == 4
+    # 20 requests/min at 3s per call sustains 20 * 3 / 60 = 1 busy agent per slot
+    rpm_bound = FanOutController(_chain(RateLimit(rpm=20, max_in_flight=8), p50=3.0), max_workers=8)
+    assert rpm_bound.initial_workers(8) == 2
+    # Never more workers than sub-questions
+    assert FanOutController(_chain(), max_workers=8).initial_workers(2) == 2
+
+
+def test_pool_shrinks_under_throttling_and_grows_back():
+    chain = _chain(calls=0)
+    ctl = FanOutController(chain, max_workers=4)
+    assert ctl.initial_workers(6) == 4
+
+    for _ in range(5):
+        chain.throttled[0].record(True)
+    assert ctl.adjust(4) == 3
+    assert ctl.decisions[-1]["signals"]["throttle_rate"] == 1.0
+
+    chain.throttled[0] = RollingRate()
+    chain.throttled[0].record(False)
+    assert ctl.adjust(3) == 4
+    assert ctl.adjust(4) == 4            # already at the cap: no new decision
+    assert [d["value"] for d in ctl.decisions if d["decision"] == "workers"] == [4, 3, 4]
+
+
+def test_pool_shrinks_when_latency_rises():
+    chain = _chain(p50=1.0)
+    ctl = FanOutController(chain, max_workers=4)
+    ctl.initial_workers(6)
+    for _ in range(50):
+        chain.latency[0].record(4.0)
+    assert ctl.adjust(4) == 3
+    assert "latency" in ctl.decisions[-1]["reason"]
+
+
+def test_unknown_llm_keeps_configured_bounds():
+    assert FanOutSignals.from_llm(MagicMock()) == FanOutSignals()
+    ctl = FanOutController(MagicMock(), max_sub_queries=4, max_workers=3)
+    assert ctl.width(4) == 4
+    assert ctl.initial_workers(4) == 3
+
+
+def test_run_uses_planner_width_and_dynamic_pool(monkeypatch):
+    llm = MagicMock()
+    llm.generate.side_effect = lambda p: "1. Q1\n2. Q2\n3. Q3\n4. Q4" if "research planner" in p else "Synthesis."
+    agent = ParallelResearchAgent(llm=llm, tool_manager=MagicMock(), max_sub_queries=5, max_workers=2)
+
+    # Shrink to one worker after the first sub-question finishes
+    monkeypatch.setattr(FanOutController, "adjust", lambda self, workers: 1)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def research(q, idx, cb=None):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05 if q == "Q1" else 0.1)
+        with lock:
+            running[0] -= 1
+        return f"answer {q}"
+
+    monkeypatch.setattr(agent, "_research_sub_question", research)
+    assert agent.run("task") == "Synthesis."
+
+    fan_out = agent.get_fan_out()
+    assert fan_out["planned"] == 4 and fan_out["width"] == 4
+    assert [d["decision"] for d in fan_out["decisions"]] == ["width", "workers"]
+    # Q3 waits for Q2 instead of taking Q1's slot; Q4 waits for Q3
+    assert [t["workers"] for t in agent.get_execution_trace()] == [2, 2, 1, 1]
+    assert peak[0] == 2
@@ -0,0 +1,132 @@
+"""Tests for the persistent fetch cache and ScrapeTool revalidation."""
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from webresearch.tools.cache import DiskCache, normalize_url
+from webresearch.tools.scrape import ScrapeTool
+
+
+_HTML = "<html><body><main>" + ("Cached article text. " * 20) + "</main></body></html>"
+
+
+def _response(status=200, body=_HTML, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = body.encode("utf-8")
+    r.encoding = "utf-8"
+    r.url = "https://example.com/page"
+    r.headers.update({"Content-Type": "text/html; charset=utf-8", **(headers or {})})
+    return r
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache("fetch", ttl=60, root=tmp_path)
+
+
+# ── URL normalisation ───────────────────────────────────────────────────────
+
+def test_normalize_url_is_case_and_fragment_insensitive():
+    assert normalize_url("HTTPS://Example.COM/a#section") == normalize_url("https://example.com/a")
+
+
+def test_normalize_url_drops_tracking_params_and_sorts_query():
+    a = normalize_url("https://example.com/a?b=2&a=1&utm_source=x&fbclid=y")
+    b = normalize_url("https://example.com/a?a=1&b=2")
+    assert a == b
+
+
+def test_normalize_url_drops_default_port_only():
+    assert normalize_url("https://example.com:443/") == "https://example.com/"
+    assert normalize_url("https://example.com:8443/") == "https://example.com:8443/"
+
+
+# ── DiskCache ───────────────────────────────────────────────────────────────
+
+def test_set_and_get_roundtrip(cache):
+    cache.set("k", b"body bytes", {"etag": '"abc"'})
+    entry = cache.get("k")
+    assert entry.body == b"body bytes"
+    assert entry.meta["etag"] == '"abc"'
+    assert cache.is_fresh(entry)
+
+
+def test_get_miss_returns_none(cache):
+    assert cache.get("missing") is None
+
+
+def test_stale_entry_still_returned(tmp_path):
+    c = DiskCache("fetch", ttl=0, root=tmp_path)
+    c.set("k", b"x")
+    entry = c.get("k")
+    assert entry is not None
+    assert not c.is_fresh(entry)
+
+
+def test_oversize_body_not_stored(tmp_path):
+    c = DiskCache("fetch", max_entry_bytes=4, root=tmp_path)
+    assert c.set("k", b"too large") is False
+    assert c.get("k") is None
+
+
+def test_lru_eviction_removes_least_recently_used(tmp_path):
+    c = DiskCache("fetch", max_bytes=600, root=tmp_path)
+    c.set("old", b"a" * 200)
+    c.set("used", b"b" * 200)
+    # Age both entries, then touch "used" so "old" is the LRU victim
+    past = time.time() - 100
+    for key in ("old", "used"):
+        os.utime(c._file_for(key), (past, past))
+    c.get("used")
+    c.set("new", b"c" * 200)
+    assert c.get("old") is None
+    assert c.get("used") is not None
+    assert c.get("new") is not None
+
+
+# ── ScrapeTool integration ──────────────────────────────────────────────────
+
+def test_fresh_cache_hit_skips_network(cache):
+    tool = ScrapeTool(cache=cache)
+    with patch("webresearch.tools.scrape.requests.get", return_value=_response()) as get:
+        first = tool.execute("https://example.com/page")
+        second = tool.execute("https://EXAMPLE.com/page#top")
+    assert get.call_count == 1
+    assert "Cached article text." in first
+    assert "Cached article text." in second
+
+
+def test_stale_entry_revalidated_with_conditional_get(tmp_path):
+    c = DiskCache("fetch", ttl=0, root=tmp_path)
+    tool = ScrapeTool(cache=c)
+    live = _response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    not_modified = _response(status=304, body="")
+
+    with patch("webresearch.tools.scrape.requests.get", side_effect=[live, not_modified]) as get:
+        tool.execute("https://example.com/page")
+        result = tool.execute("https://example.com/page")
+
+    sent = get.call_args_list[1].kwargs["headers"]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert "Cached article text." in result
+
+
+def test_no_store_responses_are_not_cached(cache):
+    tool = ScrapeTool(cache=cache)
+    resp = _response(headers={"Cache-Control": "private, no-store"})
+    with patch("webresearch.tools.scrape.requests.get", return_value=resp):
+        tool.execute("https://example.com/page")
+    assert cache.get(normalize_url("https://example.com/page")) is None
+
+
+def test_error_responses_are_not_cached(cache):
+    tool = ScrapeTool(cache=cache)
+    with patch("webresearch.tools.scrape.requests.get", return_value=_response(status=403)):
+        result = tool.execute("https://example.com/page")
+    assert result.startswith("Skipped")
+    assert cache.get(normalize_url("https://example.com/page")) is None
@@ -0,0 +1,131 @@
+"""Tests for latency histograms and hedged requests in ModelFallbackChain — no API keys needed."""
+import asyncio
+import time
+
+from webresearch.agent import ReActAgent
+from webresearch.health import LatencyHistogram
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.ratelimit import RateLimit, RateLimiter
+from webresearch.tools import ToolManager
+
+from tests.helpers import StubSearch
+
+
+class _TimedLLM:
+    def __init__(self, name, delay, fail=False):
+        self.provider_name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.rate_limiter = RateLimiter(RateLimit(max_in_flight=4))
+
+    def generate(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise Exception("503 service unavailable")
+        return self.provider_name
+
+    async def agenerate(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise Exception("503 service unavailable")
+        return self.provider_name
+
+
+def _warm(chain, i, seconds, n=10):
+    for _ in range(n):
+        chain.latency[i].record(seconds)
+
+
+def test_histogram_percentile():
+    hist = LatencyHistogram()
+    assert hist.percentile(0.95) is None
+    for _ in range(90):
+        hist.record(1.0)
+    for _ in range(10):
+        hist.record(30.0)
+    assert 1.0 <= hist.percentile(0.5) < 1.3
+    assert hist.percentile(0.95) >= 30.0
+
+
+def test_histogram_forgets_old_samples():
+    hist = LatencyHistogram(max_samples=100)
+    for _ in range(99):
+        hist.record(50.0)
+    for _ in range(300):
+        hist.record(0.5)
+    assert hist.percentile(0.9) < 1.0
+
+
+def test_no_hedge_by_default():
+    slow, fast = _TimedLLM("slow", 0.3), _TimedLLM("fast", 0.0)
+    chain = ModelFallbackChain([slow, fast])
+    _warm(chain, 0, 0.1)
+    assert chain.generate("hi") == "slow"
+    assert fast.calls == 0
+
+
+def test_hedge_fires_after_percentile_deadline():
+    slow, fast = _TimedLLM("slow", 1.0), _TimedLLM("fast", 0.0)
+    chain = ModelFallbackChain([slow, fast], hedge=True)
+    _warm(chain, 0, 0.1)
+    start = time.time()
+    assert chain.generate("hi") == "fast"
+    assert time.time() - start < 0.6
+    assert chain.current_name == "slow"      # hedging does not switch providers
+
+
+def test_no_hedge_before_enough_samples():
+    slow, fast = _TimedLLM("slow", 0.3), _TimedLLM("fast", 0.0)
+    chain = ModelFallbackChain([slow, fast], hedge=True)
+    assert chain.generate("hi") == "slow"
+    assert fast.calls == 0
+    assert chain.latency[0].count == 1
+
+
+def test_hedge_waits_for_primary_when_backup_fails():
+    primary, backup = _TimedLLM("primary", 0.4), _TimedLLM("backup", 0.0, fail=True)
+    chain = ModelFallbackChain([primary, backup], hedge=True)
+    _warm(chain, 0, 0.1)
+    assert chain.generate("hi") == "primary"
+
+
+def test_async_hedge_cancels_loser():
+    slow, fast = _TimedLLM("slow", 2.0), _TimedLLM("fast", 0.0)
+    chain = ModelFallbackChain([slow, fast], hedge=True)
+    _warm(chain, 0, 0.1)
+    start = time.time()
+    assert asyncio.run(chain.agenerate("hi")) == "fast"
+    assert time.time() - start < 1.0
+    assert slow.rate_limiter.in_flight == 0   # cancelled task released its slot
+
+
+def _react(name, delay):
+    def generate(prompt):
+        time.sleep(delay)
+        if "results for q" not in prompt:
+            return 'Thought: Search.\nAction: search\nAction Input: {"query": "q"}'
+        return f"Thought: Done.\nFinal Answer: {name}"
+    llm = _TimedLLM(name, delay)
+    llm.generate = generate
+    return llm
+
+
+def test_streaming_react_loop_is_hedged():
+    # ReActAgent streams by default; the race is over the first chunk
+    slow, fast = _react("slow", 1.0), _react("fast", 0.0)
+    chain = ModelFallbackChain([slow, fast], hedge=True)
+    for _ in range(10):
+        chain.first_chunk[0].record(0.1)
+    tm = ToolManager()
+    tm.register_tool(StubSearch())
+
+    agent = ReActAgent(llm=chain, tool_manager=tm, max_iterations=4)
+    assert agent.stream
+    start = time.time()
+    assert agent.run("question") == "fast"
+    assert time.time() - start < 1.0           # two steps, neither waited out the slow provider
+    time.sleep(1.2)
+    assert slow.rate_limiter.in_flight == 0    # losing streams closed once they opened
@@ -0,0 +1,109 @@
+"""Parity tests: single-pass lxml/selectolax extraction vs the BeautifulSoup + html2text path."""
+from unittest.mock import patch
+
+import pytest
+
+from webresearch.tools.html_extract import extract_text, resolve_backend
+from webresearch.tools.scrape import ScrapeTool
+
+_ARTICLE = """<!DOCTYPE html><html><head><title>Report</title><style>.x{}</style></head><body>
+<header><nav><a href="/">Home</a> | <a href="/news">News</a></nav></header>
+<div class="wrapper"><main id="content">
+<h1>Carbon   report <em>2023</em></h1>
+<p>Emissions fell by <strong>12%</strong> in 2023, per the <a href="/r">annual report</a>.<br>Second line&nbsp;here.</p>
+<ul><li>Scope 1: direct</li><li>Scope 2: <b>indirect</b> energy</li></ul>
+<ol><li>First</li><li>Second<ul><li>nested</li></ul></li></ol>
+<table><thead><tr><th>Year</th><th>Tonnes CO2e</th></tr></thead>
+<tbody><tr><td>2022</td><td>1,200</td></tr><tr><td>2023</td><td> 1,056 </td></tr></tbody></table>
+<blockquote><p>We are on track.</p></blockquote>
+<pre>code  line 1
+  line 2</pre>
+<div>Some <span>inline</span> text<script>var x=1;</script> continues.</div>
+<hr>
+<h3>Notes</h3><p>Final paragraph.</p>
+</main></div>
+<aside>Related stories</aside><footer>Copyright</footer></body></html>"""
+
+_CLASS_SELECTED = """<html><body>
+<div class="sidebar">Trending now</div>
+<div class="layout post-content"><h2>Title</h2><p>Body text of the post.</p>
+<table><tr><td>a</td><td></td></tr><tr><td>b</td><td>c</td><td>d</td></tr></table></div>
+<div class="entry-content">Lower priority block</div>
+</body></html>"""
+
+_DOCUMENT_ORDER = """<html><body>
+<article class="teaser">Outside the container</article>
+<div class="container"><section><article><p>Inside the container.</p></article></section></div>
+</body></html>"""
+
+_BODY_FALLBACK = """<?xml version="1.0" encoding="utf-8"?>
+<html><body><div><p>No semantic markup &amp; no known classes.</p><p>Second <i>block</i>.</p></div></body></html>"""
+
+_BLOCKS_IN_ITEMS = """<html><body><article>
+<ul><li><p>Paragraph item</p></li><li><p>First block</p><p>Second block</p></li><li><h3>Heading item</h3></li></ul>
+<ol><li><div>Numbered</div></li><li>Plain</li></ol>
+<p>Call <code>fetch()</code> or press <kbd>Ctrl</kbd>, see <b><code>flag</code></b>.</p>
+<p>Chart <img src="chart.png" alt="chart"> below,<img src="x.png">inline.</p>
+<pre><code>x = 1</code></pre>
+</article></body></html>"""
+
+_PAGES = [_ARTICLE, _CLASS_SELECTED, _DOCUMENT_ORDER, _BODY_FALLBACK, _BLOCKS_IN_ITEMS]
+
+
+def _reference(html):
+    return ScrapeTool(parser="bs4")._extract_text(html)
+
+
+@pytest.fixture(params=["lxml", "selectolax"])
+def backend(request):
+    pytest.importorskip("lxml.html" if request.param == "lxml" else "selectolax.lexbor")
+    return request.param
+
+
+@pytest.mark.parametrize("html", _PAGES)
+def test_output_matches_html2text_path(backend, html):
+    assert extract_text(html, backend) == _reference(html)
+
+
+def test_main_content_selection(backend):
+    assert "Trending" not in extract_text(_CLASS_SELECTED, backend)
+    assert "Lower priority" not in extract_text(_CLASS_SELECTED, backend)
+    # select_one semantics: the first <article> in document order wins
+    assert extract_text(_DOCUMENT_ORDER, backend) == "Outside the container"
+
+
+def test_list_items_code_and_images(backend):
+    lines = extract_text(_BLOCKS_IN_ITEMS, backend).splitlines()
+    assert lines[:3] == ["* Paragraph item", "* First block", "Second block"]
+    assert "1. Numbered" in lines
+    assert "Call `fetch()` or press `Ctrl`, see **`flag`**." in lines
+    assert "Chart  below,inline." in lines     # the dropped image keeps its spacing
+
+
+def test_tables_rendered_as_markdown(backend):
+    lines = extract_text(_ARTICLE, backend).splitlines()
+    assert "| Year | Tonnes CO2e |" in lines
+    assert "| 2023 | 1,056       |" in lines
+
+
+def test_fast_backend_skips_html2text(backend):
+    tool = ScrapeTool(parser=backend)
+    with patch.object(tool.html_converter, "handle") as handle:
+        out = tool._parse_html(_ARTICLE, "https://example.com")
+    handle.assert_not_called()
+    assert "Emissions fell by **12%**" in out
+
+
+def test_fast_backend_error_falls_back_to_bs4(backend):
+    tool = ScrapeTool(parser=backend)
+    with patch("webresearch.tools.scrape.extract_text", side_effect=RuntimeError("boom")):
+        assert tool._extract_text(_ARTICLE) == _reference(_ARTICLE)
+
+
+def test_resolve_backend():
+    assert resolve_backend("bs4") == "bs4"
+    assert resolve_backend("auto") in ("selectolax", "lxml", "bs4")
+    with patch("webresearch.tools.html_extract.selectolax_available", False):
+        assert resolve_backend("selectolax") == "bs4"
+    with pytest.raises(ValueError):
+        resolve_backend("html5lib")
@@ -0,0 +1,71 @@
+"""Tests for the shared keep-alive HTTP session layer."""
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from webresearch.tools import ToolManager, SearchTool, ScrapeTool, PDFExtractTool, ThinkTool
+from webresearch.tools.http import HTTPSessionPool
+
+
+def test_session_created_once_across_threads():
+    pool = HTTPSessionPool()
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(pool.session)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(s) for s in seen}) == 1
+
+
+def test_adapter_uses_configured_pool_and_retries():
+    pool = HTTPSessionPool(pool_connections=5, pool_maxsize=7, max_retries=3)
+    adapter = pool.session.get_adapter("https://google.serper.dev/search")
+    assert adapter._pool_connections == 5
+    assert adapter._pool_maxsize == 7
+    assert adapter.max_retries.connect == 3
+    # Status handling stays in the tools — the adapter must not retry on 5xx/429
+    assert adapter.max_retries.status == 0
+
+
+def test_close_resets_session():
+    pool = HTTPSessionPool()
+    first = pool.session
+    pool.close()
+    assert pool.session is not first
+
+
+def test_tool_manager_binds_shared_session_to_network_tools():
+    pool = HTTPSessionPool()
+    tm = ToolManager(http_pool=pool)
+    search = SearchTool(api_key="k")
+    scrape = ScrapeTool()
+    pdf = PDFExtractTool()
+    for tool in (ThinkTool(), search, scrape, pdf):
+        tm.register_tool(tool)
+    assert search.session is pool.session
+    assert scrape.session is pool.session
+    assert pdf.session is pool.session
+
+
+def test_explicit_session_not_overridden():
+    own = requests.Session()
+    tm = ToolManager(http_pool=HTTPSessionPool())
+    scrape = ScrapeTool(session=own)
+    tm.register_tool(scrape)
+    assert scrape.session is own
+
+
+def test_tools_fall_back_to_requests_module_without_pool():
+    tool = ScrapeTool()
+    assert tool.http is requests
+
+
+def test_search_uses_injected_session():
+    session = MagicMock()
+    session.post.return_value.json.return_value = {"organic": []}
+    tool = SearchTool(api_key="k", session=session)
+    with patch("webresearch.tools.search._increment_usage", return_value=1):
+        tool.execute("anything")
+    session.post.assert_called_once()
@@ -0,0 +1,137 @@
+"""Tests for multi-action ReAct steps dispatched concurrently — no API keys needed."""
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from webresearch.agent import AsyncReActAgent, ReActAgent, _MAX_PARALLEL_ACTIONS
+from webresearch.tools import ToolManager
+from webresearch.tools.base import Tool
+
+
+class _SlowScrape(Tool):
+    """Scrape stub that takes 0.2s per call."""
+
+    @property
+    def name(self): return "scrape"
+    @property
+    def description(self): return "stub scrape"
+
+    def execute(self, url: str) -> str:
+        time.sleep(0.2)
+        return f"content of {url}"
+
+
+class _ScriptedLLM:
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        resp = self._responses[min(self.calls, len(self._responses) - 1)]
+        self.calls += 1
+        return resp
+
+
+_THREE_SCRAPES = (
+    "Thought: The three result pages are independent — read them together.\n"
+    'Action: scrape\nAction Input: {"url": "https://a.example"}\n'
+    'Action: scrape\nAction Input: {"url": "https://b.example"}\n'
+    'Action: scrape\nAction Input: {"url": "https://c.example"}'
+)
+
+
+def _agent(responses, agent_cls=ReActAgent):
+    tm = ToolManager()
+    tm.register_tool(_SlowScrape())
+    return agent_cls(llm=_ScriptedLLM(responses), tool_manager=tm, max_iterations=4)
+
+
+def _parser():
+    tm = MagicMock()
+    tm.get_tool_descriptions.return_value = "No tools"
+    return ReActAgent(llm=MagicMock(), tool_manager=tm)
+
+
+# ── Parsing ─────────────────────────────────────────────────────────────────
+
+def test_parse_actions_returns_all_pairs_in_order():
+    calls = _parser()._parse_actions(_THREE_SCRAPES)
+    assert [c[1]["url"] for c in calls] == ["https://a.example", "https://b.example", "https://c.example"]
+    assert all(c[0] == "scrape" for c in calls)
+
+
+def test_parse_actions_single_action():
+    calls = _parser()._parse_actions('Thought: x\nAction: search\nAction Input: {"query": "q"}')
+    assert calls == [("search", {"query": "q"})]
+
+
+def test_parse_actions_ignores_action_text_inside_json_strings():
+    response = (
+        'Thought: x\nAction: think\n'
+        'Action Input: {"thought": "Next: Action: scrape with {braces}"}'
+    )
+    calls = _parser()._parse_actions(response)
+    assert len(calls) == 1
+    assert calls[0][0] == "think"
+
+
+def test_parse_actions_nested_json():
+    calls = _parser()._parse_actions('Action: x\nAction Input: {"a": {"b": 1}}')
+    assert calls == [("x", {"a": {"b": 1}})]
+
+
+# ── Execution ───────────────────────────────────────────────────────────────
+
+def test_batch_runs_concurrently_in_one_step():
+    agent = _agent([_THREE_SCRAPES, "Thought: done\nFinal Answer: ok"])
+    start = time.time()
+    assert agent.run("task") == "ok"
+    elapsed = time.time() - start
+
+    assert agent.llm.calls == 2          # one LLM turn for all three scrapes
+    assert elapsed < 0.5                 # 3 × 0.2s run in parallel, not serially
+    step = agent.steps[0]
+    assert len(step.batch) == 3
+    for host in ("a", "b", "c"):
+        assert f"content of https://{host}.example" in step.observation
+
+
+def test_batch_observation_keeps_order():
+    agent = _agent([_THREE_SCRAPES, "Thought: done\nFinal Answer: ok"])
+    agent.run("task")
+    obs = agent.steps[0].observation
+    assert obs.index("a.example") < obs.index("b.example") < obs.index("c.example")
+
+
+def test_batch_appears_in_trace_and_prompt():
+    agent = _agent([_THREE_SCRAPES, "Thought: done\nFinal Answer: ok"])
+    agent.run("task")
+    trace = agent.get_execution_trace()
+    assert len(trace[0]["batch"]) == 3
+    prompt = agent._build_prompt("task")
+    assert prompt.count('"url": "https://') >= 3
+
+
+def test_batch_over_limit_runs_only_first_n():
+    lines = ["Thought: many"]
+    for i in range(_MAX_PARALLEL_ACTIONS + 2):
+        lines.append(f'Action: scrape\nAction Input: {{"url": "https://{i}.example"}}')
+    agent = _agent(["\n".join(lines), "Thought: done\nFinal Answer: ok"])
+    agent.run("task")
+    batch = agent.steps[0].batch
+    ran = [c for c in batch if c["observation"].startswith("content of")]
+    assert len(ran) == _MAX_PARALLEL_ACTIONS
+    assert batch[-1]["observation"].startswith("Not run")
+
+
+def test_batch_satisfies_research_requirement():
+    agent = _agent([_THREE_SCRAPES, "Thought: done\nFinal Answer: ok"])
+    assert agent.run("task") == "ok"
+
+
+def test_async_agent_gathers_batch():
+    agent = _agent([_THREE_SCRAPES, "Thought: done\nFinal Answer: ok"], AsyncReActAgent)
+    start = time.time()
+    assert asyncio.run(agent.run("task")) == "ok"
+    assert time.time() - start < 0.5
+    assert len(agent.steps[0].batch) == 3
@@ -0,0 +1,159 @@
+"""Tests for the observation store shared by a deep-research run's sub-agents."""
+import asyncio
+import threading
+import time
+
+from webresearch.observations import ObservationStore
+from webresearch.parallel import ParallelResearchAgent
+from webresearch.tools import ToolManager
+from webresearch.tools.base import Tool
+
+
+class _CountingScrape(Tool):
+    """Scrape stub that takes 0.2s per call and counts executions."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self): return "scrape"
+    @property
+    def description(self): return "stub scrape"
+
+    def execute(self, url: str) -> str:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return f"content of {url}"
+
+
+class _SubAgentLLM:
+    """Plans three sub-questions; every sub-agent scrapes the same page, then answers."""
+
+    def generate(self, prompt: str) -> str:
+        if "research planner" in prompt:
+            return "1. First facet?\n2. Second facet?\n3. Third facet?"
+        if "research synthesizer" in prompt:
+            return "Synthesized answer."
+        if "content of https://shared.example" in prompt:
+            return "Thought: I have what I need.\nFinal Answer: facet answered"
+        return (
+            "Thought: Read the main source.\n"
+            'Action: scrape\nAction Input: {"url": "https://shared.example"}'
+        )
+
+
+def _counted(result="page text", delay=0.0):
+    calls = []
+
+    def call():
+        calls.append(1)
+        time.sleep(delay)
+        return result
+    return call, calls
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    store = ObservationStore()
+    call, calls = _counted(delay=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.run("scrape:1", "scrape", call)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["page text"] * 4
+    assert store.stats() == {"calls": 1, "hits": 0, "joined": 3}
+
+
+def test_completed_observation_is_reused():
+    store = ObservationStore()
+    call, calls = _counted()
+    store.run("search:1", "search", call)
+    assert store.run("search:1", "search", call) == "page text"
+    assert len(calls) == 1
+    assert store.stats()["hits"] == 1
+
+
+def test_errors_are_not_kept():
+    store = ObservationStore()
+    call, calls = _counted(result="Error: timed out")
+    store.run("scrape:1", "scrape", call)
+    store.run("scrape:1", "scrape", call)
+    assert len(calls) == 2
+
+
+def test_agent_local_tools_always_run():
+    store = ObservationStore()
+    call, calls = _counted()
+    store.run("think:1", "think", call)
+    store.run("think:1", "think", call)
+    assert len(calls) == 2
+    assert store.stats()["calls"] == 0
+
+
+def test_exception_reaches_waiters_and_is_not_kept():
+    store = ObservationStore()
+    started = threading.Event()
+
+    def boom():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("network down")
+
+    errors = []
+
+    def waiter():
+        started.wait()
+        try:
+            store.run("scrape:1", "scrape", lambda: "unused")
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    try:
+        store.run("scrape:1", "scrape", boom)
+    except RuntimeError:
+        pass
+    t.join()
+
+    assert errors == ["network down"]
+    assert store.run("scrape:1", "scrape", lambda: "retried") == "retried"
+
+
+def test_async_callers_share_one_fetch():
+    store = ObservationStore()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "page text"
+
+    async def main():
+        return await asyncio.gather(*(store.arun("scrape:1", "scrape", fetch) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["page text"] * 3
+    assert len(calls) == 1
+
+
+def test_parallel_sub_agents_fetch_a_shared_page_once():
+    scrape = _CountingScrape()
+    tm = ToolManager()
+    tm.register_tool(scrape)
+    agent = ParallelResearchAgent(
+        llm=_SubAgentLLM(), tool_manager=tm, max_sub_queries=3, sub_iterations=3, max_workers=3,
+    )
+
+    assert agent.run("Big question") == "Synthesized answer."
+    assert scrape.calls == 1
+    stats = agent.get_observation_stats()
+    assert stats["calls"] == 1
+    assert stats["hits"] + stats["joined"] == 2
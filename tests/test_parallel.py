@@ -1,8 +1,11 @@
 """Tests for ParallelResearchAgent decomposition and synthesis logic."""
 import re
+import threading
+import time
 from unittest.mock import MagicMock, call
 import pytest
-from webresearch.parallel import ParallelResearchAgent
+from webresearch.agent import ReActAgent
+from webresearch.parallel import ParallelResearchAgent, _IterationBudget
 
 
 def make_parallel_agent(llm_responses=None):
@@ -181,3 +184,201 @@ def test_status_callbacks_are_fired(monkeypatch):
     # Both sub-queries should have been signalled as pending
     pending = [(i, s) for i, s in statuses if s == "pending"]
     assert len(pending) == 2
+
+
+def _fold_llm(fail_folds=False):
+    """Decomposes into three sub-questions; folds append to the draft, synthesis is marked."""
+    def generate(prompt):
+        if "research planner" in prompt:
+            return "1. Q1\n2. Q2\n3. Q3"
+        if "CURRENT DRAFT" in prompt:
+            if fail_folds:
+                raise RuntimeError("quota")
+            draft = prompt.split("CURRENT DRAFT:\n", 1)[1].split("\n", 1)[0]
+            new = re.search(r"sub-query \d of 3: (Q\d)", prompt).group(1)
+            return new if draft.startswith("(none") else f"{draft}+{new}"
+        return "Full synthesis."
+    return generate
+
+
+def test_incremental_folds_sub_results_in_completion_order(monkeypatch):
+    agent = make_parallel_agent()
+    agent.incremental = True
+    agent.llm.generate.side_effect = _fold_llm()
+    delays = {"Q1": 0.2, "Q2": 0.0, "Q3": 0.1}
+    agent.max_workers = 3
+
+    def research(q, idx, cb=None):
+        time.sleep(delays[q])
+        return f"answer {q}"
+
+    monkeypatch.setattr(agent, "_research_sub_question", research)
+    assert agent.run("task") == "Q2+Q3+Q1"
+
+
+def test_incremental_falls_back_to_synthesis_when_a_fold_fails(monkeypatch):
+    agent = make_parallel_agent()
+    agent.incremental = True
+    agent.llm.generate.side_effect = _fold_llm(fail_folds=True)
+    monkeypatch.setattr(agent, "_research_sub_question", lambda q, idx, cb=None: "answer")
+    assert agent.run("task") == "Full synthesis."
+
+
+def test_deadline_cancels_stragglers(monkeypatch):
+    agent = make_parallel_agent()
+    agent.incremental = True
+    agent.deadline = 0.3
+    agent.max_workers = 3
+    agent.llm.generate.side_effect = _fold_llm()
+    stopped = []
+
+    def research(q, idx, cb=None):
+        if q == "Q3":
+            # A straggler: runs until the agent's cancel event fires
+            stopped.append(agent._cancel.wait(timeout=5))
+            return "late"
+        return f"answer {q}"
+
+    monkeypatch.setattr(agent, "_research_sub_question", research)
+    statuses = []
+    t0 = time.monotonic()
+    answer = agent.run("task", sub_status_callback=lambda idx, state, *a, **kw: statuses.append((idx, state)))
+
+    assert time.monotonic() - t0 < 2
+    assert answer.startswith("Q1+Q2") or answer.startswith("Q2+Q1")
+    assert "did not finish before the deadline" in answer and "- Q3" in answer
+    assert (2, "cancelled") in statuses
+    assert agent.get_execution_trace()[2]["answer_preview"] == "Not finished before the deadline."
+    time.sleep(0.05)
+    assert stopped == [True]
+
+
+def test_deadline_drops_a_fold_in_flight(monkeypatch):
+    agent = make_parallel_agent()
+    agent.incremental = True
+    agent.deadline = 0.3
+    fold = _fold_llm()
+
+    def generate(prompt):
+        if "sub-query 2 of" in prompt:
+            time.sleep(2)                       # a fold that outlives the deadline
+        return fold(prompt)
+    agent.llm.generate.side_effect = generate
+    delays = {"Q1": 0.0, "Q2": 0.05, "Q3": 0.15}
+    agent.max_workers = 3
+
+    def research(q, idx, cb=None):
+        time.sleep(delays[q])
+        return f"answer {q}"
+
+    monkeypatch.setattr(agent, "_research_sub_question", research)
+    t0 = time.monotonic()
+    answer = agent.run("task")
+
+    assert time.monotonic() - t0 < 1
+    assert answer.startswith("Q1")
+    assert "answer Q2" in answer and "answer Q3" in answer    # not folded in time: kept raw
+
+
+def test_deadline_bounds_final_synthesis(monkeypatch):
+    agent = make_parallel_agent()
+    agent.deadline = 0.3
+
+    def generate(prompt):
+        if "research planner" in prompt:
+            return "1. Q1\n2. Q2"
+        time.sleep(2)
+        return "Full synthesis."
+    agent.llm.generate.side_effect = generate
+    monkeypatch.setattr(agent, "_research_sub_question", lambda q, idx, cb=None: f"answer {q}")
+
+    t0 = time.monotonic()
+    answer = agent.run("task")
+    assert time.monotonic() - t0 < 1
+    assert "not synthesized before the deadline" in answer
+    assert "## 1. Q1\nanswer Q1" in answer and "## 2. Q2\nanswer Q2" in answer
+
+
+def test_react_agent_stops_when_cancelled():
+    cancel = threading.Event()
+    cancel.set()
+    llm = MagicMock()
+    sub_agent = ReActAgent(llm=llm, tool_manager=MagicMock(), cancel=cancel)
+    assert sub_agent.run("question").startswith("⚠ Cancelled")
+    llm.generate.assert_not_called()
+
+
+def test_recursive_split_merges_parts_within_budget(monkeypatch):
+    llm = MagicMock()
+
+    def generate(prompt):
+        if "research planner. Break" in prompt:
+            return "1. Q1\n2. Q2"
+        if "ORIGINAL QUESTION: Q1" in prompt:
+            return "merged Q1"
+        if "QUESTION: Q1" in prompt:
+            return "1. Q1a\n2. Q1b\n3. Q1c"
+        if "QUESTION: Q2" in prompt:
+            return "LEAF"
+        return "Final."
+    llm.generate.side_effect = generate
+
+    # One worker: Q1 splits first, then its parts run (newest first), then Q2
+    agent = ParallelResearchAgent(
+        llm=llm, tool_manager=MagicMock(), max_sub_queries=3, sub_iterations=4, max_workers=1, max_depth=2,
+    )
+    leaves = {}
+
+    def leaf(question, node):
+        granted = agent._budget.reserve(agent.sub_iterations)
+        leaves[question] = granted
+        node["iterations"] = 1
+        agent._budget.refund(granted - 1)
+        return f"answer {question}"
+
+    monkeypatch.setattr(agent, "_research_leaf", leaf)
+    assert agent.run("Big survey question") == "Final."
+
+    # Budget 12 → Q1's share of 6 covers two parts of 3.  Each leaf answers
+    # in one iteration and refunds the rest, so every later leaf can still
+    # take the full sub_iterations instead of a static 12 / 2 / 2 = 3
+    assert leaves == {"Q1a": 4, "Q1b": 4, "Q2": 4}
+    assert agent.get_fan_out()["iterations_used"] == 3
+    trace = agent.get_execution_trace()
+    assert trace[0]["answer_preview"] == "merged Q1"
+    assert [p["question"] for p in trace[0]["parts"]] == ["Q1a", "Q1b"]
+    assert "parts" not in trace[1]
+
+
+def test_iteration_budget_is_shared_and_refunded():
+    budget = _IterationBudget(10, waiting=4)
+    assert budget.share() == 2
+    assert budget.reserve(8) == 3              # floor of _MIN_LEAF_ITERATIONS
+    budget.refund(2)                           # answered after one iteration
+    assert budget.used == 1
+    assert budget.reserve(8) == 3              # 9 left among 3 waiting
+    budget.split(3)                            # a waiting node became three parts
+    assert budget.share() == 6 // 4
+    for _ in range(4):
+        budget.reserve(8)
+    assert budget.reserve(8) == 0
+    assert budget.used == 10
+
+
+def test_flat_run_never_asks_to_split(monkeypatch):
+    agent = make_parallel_agent()
+    agent.llm.generate.side_effect = lambda p: "1. Q1\n2. Q2" if "research planner" in p else "Final."
+    monkeypatch.setattr(agent, "_research_leaf", lambda q, node: "answer")
+    agent.run("task")
+    assert not any("LEAF" in c.args[0] for c in agent.llm.generate.call_args_list)
+
+
+def test_exhausted_iteration_budget_skips_research():
+    agent = make_parallel_agent()
+    agent.iteration_budget = 1
+    agent.llm.generate.side_effect = lambda p: "1. Q1\n2. Q2" if "research planner" in p else "Final."
+    agent.run("task")
+    # The single iteration goes to whichever leaf starts first
+    previews = [t["answer_preview"] for t in agent.get_execution_trace()]
+    assert sum(p.startswith("Not researched") for p in previews) == 1
+    assert agent.get_fan_out()["iterations_used"] == 1
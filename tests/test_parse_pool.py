@@ -0,0 +1,118 @@
+"""Tests for the process pool that scrape and pdf_extract offload parsing to."""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from webresearch.tools import PDFExtractTool, ScrapeTool, ToolManager
+from webresearch.tools.parse_pool import ParsePool
+from webresearch.tools.scrape import _extract_text_in_worker
+
+_BIG_PAGE = "<html><body><main>" + "<p>Offloaded paragraph text.</p>" * 2000 + "</main></body></html>"
+
+
+def _pid(_):
+    return os.getpid()
+
+
+class _InlinePool(ParsePool):
+    """Runs jobs on threads so tests can watch the pending-job limit without spawning."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.running = 0
+        self.peak = 0
+        self._count_lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=8)
+        return self._pool
+
+    def track(self, seconds):
+        with self._count_lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(seconds)
+        with self._count_lock:
+            self.running -= 1
+        return seconds
+
+
+def test_jobs_run_in_another_process():
+    pool = ParsePool(workers=1)
+    try:
+        assert pool.run(_pid, None) != os.getpid()
+        text = pool.run(_extract_text_in_worker, _BIG_PAGE, "bs4")
+    finally:
+        pool.close()
+    assert text == ScrapeTool(parser="bs4")._extract_text_local(_BIG_PAGE)
+
+
+def test_pending_jobs_are_bounded():
+    pool = _InlinePool(workers=1, max_pending=2)
+    callers = [threading.Thread(target=pool.run, args=(pool.track, 0.05)) for _ in range(6)]
+    for t in callers:
+        t.start()
+    for t in callers:
+        t.join()
+    pool.close()
+    assert pool.peak == 2
+
+
+def test_broken_pool_falls_back_inline():
+    pool = ParsePool(workers=1, max_pending=1)
+    broken = MagicMock()
+    broken.submit.side_effect = BrokenProcessPool("worker died")
+    pool._pool = broken
+    assert pool.run(_pid, None) == os.getpid()
+    assert pool._pool is None            # a fresh pool is started next time
+    # The slot was handed back despite the failure
+    assert pool._slots.acquire(blocking=False)
+
+
+def test_tool_manager_binds_parse_pool():
+    pool = ParsePool()
+    tm = ToolManager(parse_pool=pool)
+    scrape, pdf = ScrapeTool(), PDFExtractTool()
+    tm.register_tool(scrape)
+    tm.register_tool(pdf)
+    assert scrape.parse_pool is pool
+    assert pdf.parse_pool is pool
+
+
+def test_scrape_offloads_only_large_pages():
+    pool = MagicMock(min_size=1000)
+    pool.run.return_value = "from the pool"
+    tool = ScrapeTool(parser="bs4")
+    tool.bind_parse_pool(pool)
+
+    assert tool._extract_text(_BIG_PAGE) == "from the pool"
+    pool.run.assert_called_once_with(_extract_text_in_worker, _BIG_PAGE, "bs4")
+
+    pool.run.reset_mock()
+    assert tool._extract_text("<p>tiny page</p>") == "tiny page"
+    pool.run.assert_not_called()
+
+
+def test_pdf_pages_extracted_by_path_in_pool():
+    pytest.importorskip("pdfplumber")
+    from tests.test_pdf_extract import _URL, _session
+
+    pool = MagicMock()
+    pool.run.side_effect = lambda fn, *args: fn(*args)
+    tool = PDFExtractTool(session=_session())
+    tool.bind_parse_pool(pool)
+    with patch.object(PDFExtractTool, "_extract_pages", autospec=True,
+                      side_effect=PDFExtractTool._extract_pages) as extract_pages:
+        out = tool.execute(_URL, pages="2-3")
+
+    path = pool.run.call_args.args[1]
+    assert isinstance(path, str) and path.endswith(".pdf")
+    assert not os.path.exists(path)          # spool removed afterwards
+    assert extract_pages.call_count == 1
+    assert "Emissions figures on page 3" in out
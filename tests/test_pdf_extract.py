@@ -0,0 +1,105 @@
+"""Tests for lazy, cached PDF page extraction — no network needed."""
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+pytest.importorskip("pdfplumber")
+
+from webresearch.tools.cache import DiskCache
+from webresearch.tools.pdf import PDFExtractTool
+
+_URL = "https://example.com/report.pdf"
+
+
+def _make_pdf(pages):
+    """Minimal valid PDF with one line of Helvetica text per page."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>")
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+_PDF = _make_pdf([f"Emissions figures on page {n}" for n in range(1, 31)])
+
+
+def _session(body=_PDF):
+    def get(*args, **kwargs):
+        r = requests.Response()
+        r.status_code = 200
+        r.raw = io.BytesIO(body)
+        r.headers["Content-Type"] = "application/pdf"
+        return r
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def test_extraction_stops_when_budget_is_full():
+    tool = PDFExtractTool(session=_session(), max_length=300)
+    with patch.object(tool, "_extract_page", wraps=tool._extract_page) as extract_page:
+        out = tool.execute(_URL)
+    assert "Total pages: 30" in out
+    assert "Emissions figures on page 1" in out
+    assert extract_page.call_count < 10
+    assert f"Truncated at page {extract_page.call_count}" in out
+
+
+def test_page_range():
+    out = PDFExtractTool(session=_session()).execute(_URL, pages="4-5")
+    assert "--- Page 4 ---" in out and "Emissions figures on page 5" in out
+    assert "page 3" not in out
+
+
+def test_cached_pages_served_without_download(tmp_path):
+    cache = DiskCache("pdf", ttl=60, root=tmp_path)
+    session = _session()
+    tool = PDFExtractTool(session=session, cache=cache)
+    first = tool.execute(_URL, pages="1-10")
+    assert session.get.call_count == 1
+
+    with patch.object(tool, "_extract_page") as extract_page:
+        again = tool.execute(_URL, pages="3")
+        first_again = tool.execute(_URL, pages="1-10")
+    assert session.get.call_count == 1
+    extract_page.assert_not_called()
+    assert "Emissions figures on page 3" in again
+    assert first_again == first
+
+
+def test_uncached_page_downloads_once(tmp_path):
+    cache = DiskCache("pdf", ttl=60, root=tmp_path)
+    session = _session()
+    tool = PDFExtractTool(session=session, cache=cache)
+    tool.execute(_URL, pages="1")
+    out = tool.execute(_URL, pages="1-2")
+    assert session.get.call_count == 2
+    assert "Emissions figures on page 2" in out
+
+
+def test_html_response_reported():
+    session = MagicMock()
+    r = requests.Response()
+    r.status_code = 200
+    r._content = b"<html>login</html>"
+    r.headers["Content-Type"] = "text/html"
+    session.get.return_value = r
+    out = PDFExtractTool(session=session).execute(_URL)
+    assert out.startswith("URL returned HTML instead of PDF")
@@ -0,0 +1,138 @@
+"""Tests for the per-provider rate-limit scheduler — no API keys needed."""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.ratelimit import (
+    DEFAULT_RATE_LIMITS,
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+    parse_rate_limits,
+    rate_limit_for,
+)
+
+
+class _SlowLLM:
+    """Tracks peak concurrency across threads."""
+
+    def __init__(self, delay=0.1, limit=None):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.rate_limiter = RateLimiter(limit) if limit else None
+
+    def generate(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return "ok"
+
+
+def _fan_out(chain, n):
+    threads = [threading.Thread(target=chain.generate, args=("hi",)) for _ in range(n)]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.time() - start
+
+
+def test_default_limit_is_one_in_flight():
+    llm = _SlowLLM(delay=0.05)
+    _fan_out(ModelFallbackChain([llm]), 3)
+    assert llm.peak == 1
+
+
+def test_in_flight_budget_allows_concurrency():
+    llm = _SlowLLM(delay=0.2, limit=RateLimit(max_in_flight=3))
+    elapsed = _fan_out(ModelFallbackChain([llm]), 3)
+    assert llm.peak == 3
+    assert elapsed < 0.5
+
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(per_minute=60)      # 1 per second, burst of 60
+    now = bucket.updated
+    assert bucket.wait_time(60, now) == 0.0
+    bucket.take(60)
+    assert abs(bucket.wait_time(2, now) - 2.0) < 1e-6
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+
+
+def test_requests_per_minute_throttles():
+    limiter = RateLimiter(RateLimit(rpm=600, max_in_flight=10))  # 10/s after the burst
+    limiter._requests.level = 1
+    limiter.acquire()
+    start = time.time()
+    limiter.acquire()                        # must wait ~0.1s for a refill
+    assert time.time() - start >= 0.08
+
+
+def test_tokens_per_minute_charged_with_prompt_size():
+    limiter = RateLimiter(RateLimit(tpm=6000, max_in_flight=10))
+    limiter.acquire(tokens=6000)
+    with limiter._cond:
+        assert limiter._try_acquire(100) > 0
+
+
+def test_defer_pauses_new_calls():
+    limiter = RateLimiter(RateLimit(max_in_flight=5))
+    limiter.defer(0.2)
+    start = time.time()
+    with limiter.slot():
+        pass
+    assert time.time() - start >= 0.15
+
+
+def test_async_slot_respects_in_flight():
+    limiter = RateLimiter(RateLimit(max_in_flight=2))
+    active = peak = 0
+
+    async def call():
+        nonlocal active, peak
+        async with limiter.aslot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_parse_rate_limits_overrides_defaults():
+    limits = parse_rate_limits("gemini=rpm:1000,inflight:8; groq=tpm:0 ; bogus")
+    assert limits["gemini"] == RateLimit(rpm=1000, tpm=DEFAULT_RATE_LIMITS["gemini"].tpm, max_in_flight=8)
+    assert limits["groq"].tpm is None
+    assert "bogus" in limits and limits["bogus"] == RateLimit()
+
+
+def test_parse_rate_limits_skips_malformed():
+    assert parse_rate_limits("gemini=rpm:lots") == {}
+
+
+def test_rate_limit_for_config():
+    cfg = SimpleNamespace(rate_limits="ollama=inflight:3")
+    assert rate_limit_for(cfg, "ollama").max_in_flight == 3
+    assert rate_limit_for(cfg, "gemini") == DEFAULT_RATE_LIMITS["gemini"]
+
+
+def test_gemini_retry_hint_defers_shared_limiter():
+    from webresearch.llm import LLMInterface
+
+    llm = LLMInterface(api_key="test-key", model_name="gemini-test", rate_limit=RateLimit(max_in_flight=4))
+    delay = llm._retry_delay(Exception("429 quota retry_delay { seconds: 7 }"), 0, 3)
+    assert delay == 7.0
+    assert llm.rate_limiter._blocked_until - time.monotonic() > 6
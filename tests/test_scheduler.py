@@ -0,0 +1,81 @@
+"""Tests for the work-stealing scheduler behind recursive deep research."""
+import threading
+import time
+
+from webresearch.scheduler import WorkStealingScheduler
+
+
+def _tree_sum(sched, depth):
+    """Each node forks two children and adds their results — a small fork/join tree."""
+    if depth == 0:
+        return 1
+    left = sched.fork(_tree_sum, sched, depth - 1)
+    right = sched.fork(_tree_sum, sched, depth - 1)
+    return sched.join(left) + sched.join(right)
+
+
+def test_fork_join_tree_resolves():
+    sched = WorkStealingScheduler(3)
+    try:
+        assert sched.submit(_tree_sum, sched, 6).result(timeout=5) == 64
+    finally:
+        sched.shutdown()
+    assert sched.stats()["executed"] == 127
+
+
+def test_idle_workers_steal_forked_parts():
+    sched = WorkStealingScheduler(3)
+
+    def part():
+        time.sleep(0.1)
+        return 1
+
+    def branch():
+        futures = [sched.fork(part) for _ in range(6)]
+        return sum(sched.join(f) for f in futures)
+
+    t0 = time.monotonic()
+    try:
+        assert sched.submit(branch).result(timeout=5) == 6
+    finally:
+        sched.shutdown()
+    # Serially the six parts take 0.6s; three workers share them
+    assert time.monotonic() - t0 < 0.45
+    assert sched.steals > 0
+
+
+def test_limit_caps_concurrent_tasks():
+    sched = WorkStealingScheduler(4, limit=2)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def task():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    try:
+        for f in [sched.submit(task) for _ in range(6)]:
+            f.result(timeout=5)
+        assert peak[0] == 2
+        sched.resize(4)
+        peak[0] = 0
+        for f in [sched.submit(task) for _ in range(8)]:
+            f.result(timeout=5)
+        assert peak[0] > 2
+    finally:
+        sched.shutdown()
+
+
+def test_shutdown_cancels_queued_tasks():
+    sched = WorkStealingScheduler(1)
+    release = threading.Event()
+    first = sched.submit(release.wait, 5)
+    queued = sched.submit(lambda: "never")
+    time.sleep(0.05)
+    sched.shutdown(wait=False)
+    release.set()
+    assert first.result(timeout=5) is True
+    assert queued.cancelled()
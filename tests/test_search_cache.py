@@ -0,0 +1,96 @@
+"""Tests for the persistent search-result cache and query normalisation."""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from webresearch.tools.cache import DiskCache, normalize_query
+from webresearch.tools.search import SearchTool
+
+_SERPER = {"organic": [{"title": "France GDP", "link": "https://example.com", "snippet": "2.8 trillion"}]}
+
+
+def _response(data=_SERPER):
+    r = requests.Response()
+    r.status_code = 200
+    r._content = json.dumps(data).encode("utf-8")
+    return r
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache("search", ttl=60, root=tmp_path)
+
+
+@pytest.fixture
+def usage():
+    with patch("webresearch.tools.search._increment_usage", return_value=1) as inc:
+        yield inc
+
+
+# ── Query normalisation ─────────────────────────────────────────────────────
+
+def test_normalize_query_ignores_case_whitespace_and_stopwords():
+    assert normalize_query("What is the GDP of France?") == normalize_query("what is  GDP of france")
+
+
+def test_normalize_query_keeps_question_words_and_prepositions():
+    assert normalize_query("when did Einstein die") != normalize_query("where did Einstein die")
+    assert normalize_query("who founded OpenAI") != normalize_query("how founded OpenAI")
+    assert normalize_query("flights from Paris to London") != normalize_query("flights to Paris from London")
+
+
+def test_normalize_query_keeps_phrases_and_operators():
+    assert normalize_query('"The Who" site:BBC.com') == '"the who" site:bbc.com'
+    assert normalize_query("jaguar -car") != normalize_query("jaguar car")
+
+
+def test_normalize_query_all_stopwords_kept():
+    assert normalize_query("The The") == "the the"
+
+
+# ── SearchTool ──────────────────────────────────────────────────────────────
+
+def test_repeat_query_served_from_cache(cache, usage):
+    session = MagicMock()
+    session.post.return_value = _response()
+    tool = SearchTool(api_key="k", session=session, cache=cache)
+
+    first = tool.execute("What is the GDP of France?")
+    second = SearchTool(api_key="k", session=session, cache=cache).execute("what is  GDP of france")
+
+    assert session.post.call_count == 1
+    assert usage.call_count == 1                          # cache hit spends no quota
+    assert "2.8 trillion" in second
+    assert second.startswith("Search results for: what is  GDP of france")   # formatted for the new query
+    assert "2.8 trillion" in first
+
+
+def test_expired_entry_refetched(cache, usage):
+    session = MagicMock()
+    session.post.return_value = _response()
+    tool = SearchTool(api_key="k", session=session, cache=cache)
+    tool.execute("gdp france")
+    cache.ttl = 0
+    tool.execute("gdp france")
+    assert session.post.call_count == 2
+
+
+def test_stale_entry_served_when_serper_down(cache, usage):
+    session = MagicMock()
+    session.post.return_value = _response()
+    tool = SearchTool(api_key="k", session=session, cache=cache)
+    tool.execute("gdp france")
+    cache.ttl = 0
+    session.post.side_effect = requests.exceptions.ConnectionError("down")
+    assert "2.8 trillion" in tool.execute("gdp france")
+
+
+def test_empty_results_not_cached(cache, usage):
+    session = MagicMock()
+    session.post.return_value = _response({"organic": []})
+    tool = SearchTool(api_key="k", session=session, cache=cache)
+    tool.execute("nothing here")
+    tool.execute("nothing here")
+    assert session.post.call_count == 2
@@ -0,0 +1,135 @@
+"""Tests for batched Serper searches and the search_many tool — no API keys needed."""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from webresearch.parallel import ParallelResearchAgent
+from webresearch.tools import ToolManager
+from webresearch.tools.cache import DiskCache
+from webresearch.tools.search import MultiSearchTool, SearchTool
+
+
+def _hits(*links):
+    return {"organic": [{"title": link, "link": link, "snippet": f"about {link}"} for link in links]}
+
+
+def _response(payload):
+    r = requests.Response()
+    r.status_code = 200
+    r._content = json.dumps(payload).encode("utf-8")
+    return r
+
+
+@pytest.fixture
+def usage():
+    with patch("webresearch.tools.search._increment_usage", return_value=1) as inc:
+        yield inc
+
+
+def test_search_many_sends_one_request(usage):
+    session = MagicMock()
+    session.post.return_value = _response([_hits("https://a.com"), _hits("https://b.com")])
+    tool = SearchTool(api_key="k", session=session)
+
+    results = tool.search_many(["alpha query", "beta query", "Alpha  query"])
+
+    session.post.assert_called_once()
+    sent = session.post.call_args.kwargs["json"]
+    assert [q["q"] for q in sent] == ["alpha query", "beta query"]   # duplicate key sent once
+    assert results[0] is results[2]
+    assert results[1]["organic"][0]["link"] == "https://b.com"
+    assert usage.call_count == 2
+
+
+def test_search_many_skips_cached_queries(tmp_path, usage):
+    cache = DiskCache("search", ttl=60, root=tmp_path)
+    session = MagicMock()
+    session.post.return_value = _response(_hits("https://a.com"))
+    tool = SearchTool(api_key="k", session=session, cache=cache)
+    tool.execute("alpha")
+
+    session.post.return_value = _response([_hits("https://b.com")])
+    results = tool.search_many(["alpha", "beta"])
+    assert [q["q"] for q in session.post.call_args.kwargs["json"]] == ["beta"]
+    assert results[0]["organic"][0]["link"] == "https://a.com"
+
+    # Batch results are cached for execute() too
+    session.post.reset_mock()
+    tool.execute("beta")
+    session.post.assert_not_called()
+
+
+def test_search_many_failure_returns_none(usage):
+    session = MagicMock()
+    session.post.side_effect = requests.exceptions.ConnectionError("down")
+    assert SearchTool(api_key="k", session=session).search_many(["a", "b"]) == [None, None]
+
+
+def test_merge_dedupes_and_ranks_by_agreement():
+    merged = SearchTool.merge_results([
+        _hits("https://a.com", "https://shared.com/page"),
+        _hits("https://b.com", "https://SHARED.com/page#top"),
+        _hits("https://shared.com/page?utm_source=x"),
+    ])
+    assert merged[0]["link"] == "https://shared.com/page"
+    assert merged[0]["matches"] == 3
+    assert len(merged) == 3
+
+
+def test_multi_search_tool_output(usage):
+    session = MagicMock()
+    session.post.return_value = _response([
+        _hits("https://a.com", "https://shared.com"),
+        {**_hits("https://shared.com"), "answerBox": {"answer": "42"}},
+    ])
+    tool = MultiSearchTool(SearchTool(api_key="k", session=session))
+    out = tool.execute(queries=["first angle", "second angle"])
+    assert out.index("https://shared.com") < out.index("https://a.com")
+    assert "Returned by 2/2 queries" in out
+    assert "second angle: 42" in out
+
+
+def test_multi_search_counts_equivalent_queries_once(usage):
+    session = MagicMock()
+    session.post.return_value = _response([
+        {**_hits("https://a.com"), "answerBox": {"answer": "42"}},
+        _hits("https://b.com"),
+    ])
+    tool = MultiSearchTool(SearchTool(api_key="k", session=session))
+    out = tool.execute(queries=["GDP of France", "the gdp of  france?", "French economy"])
+    assert "Merged search results for 2 queries" in out
+    assert "Returned by 1/2 queries" in out
+    assert "Returned by 2/" not in out
+    assert out.count(": 42") == 1
+
+
+def test_merge_counts_a_repeated_response_once():
+    data = _hits("https://a.com", "https://b.com")
+    merged = SearchTool.merge_results([data, data, _hits("https://b.com")])
+    assert merged[0]["link"] == "https://b.com"
+    assert [item["matches"] for item in merged] == [2, 1]
+
+
+def test_multi_search_accepts_newline_string(usage):
+    session = MagicMock()
+    session.post.return_value = _response([_hits("https://a.com"), _hits("https://b.com")])
+    out = MultiSearchTool(SearchTool(api_key="k", session=session)).execute(queries="one\ntwo\n")
+    assert "Merged search results for 2 queries" in out
+
+
+def test_parallel_agent_prefetches_sub_questions(tmp_path, usage):
+    session = MagicMock()
+    session.post.return_value = _response([_hits("https://a.com"), _hits("https://b.com")])
+    tm = ToolManager()
+    search = SearchTool(api_key="k", session=session, cache=DiskCache("search", ttl=60, root=tmp_path))
+    tm.register_tool(search)
+
+    agent = ParallelResearchAgent(llm=MagicMock(), tool_manager=tm)
+    agent._prefetch(["who founded a", "when was b founded"])
+    session.post.assert_called_once()
+
+    session.post.reset_mock()
+    assert "https://b.com" in search.execute("When was B founded?")
+    session.post.assert_not_called()
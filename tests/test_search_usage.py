@@ -1,6 +1,6 @@
 """Tests for Serper API monthly usage tracking."""
 import json
-from datetime import datetime
+import sqlite3
 from pathlib import Path
 from unittest.mock import patch
 import pytest
@@ -9,7 +9,20 @@ import webresearch.tools.search as search_mod
 
 
 def _make_usage_path(tmp_path: Path) -> Path:
-    return tmp_path / "usage.json"
+    return tmp_path / "usage.db"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_counters():
+    search_mod._counters.clear()
+    yield
+    search_mod._counters.clear()
+
+
+def _stored_count(path: Path, month: str) -> int:
+    with sqlite3.connect(str(path)) as conn:
+        row = conn.execute("SELECT count FROM usage WHERE month = ?", (month,)).fetchone()
+    return row[0] if row else 0
 
 
 def test_get_monthly_usage_when_no_file(tmp_path):
@@ -44,15 +57,49 @@ def test_get_monthly_usage_matches_increment(tmp_path):
 
 def test_month_rollover_resets_count(tmp_path):
     path = _make_usage_path(tmp_path)
-    # Write stale data from a previous month
-    path.write_text(json.dumps({"month": "2020-01", "count": 999}), encoding="utf-8")
+    # Stale data from a previous month
     with patch.object(search_mod, "_get_usage_path", return_value=path):
+        search_mod._counter()._write("2020-01", 999)
         count = search_mod._increment_usage()
     assert count == 1
 
 
 def test_get_usage_ignores_stale_month(tmp_path):
     path = _make_usage_path(tmp_path)
-    path.write_text(json.dumps({"month": "2020-01", "count": 999}), encoding="utf-8")
     with patch.object(search_mod, "_get_usage_path", return_value=path):
+        search_mod._counter()._write("2020-01", 999)
         assert search_mod.get_monthly_usage() == 0
+
+
+def test_increments_are_buffered_then_flushed(tmp_path):
+    path = _make_usage_path(tmp_path)
+    month = search_mod._current_month()
+    with patch.object(search_mod, "_get_usage_path", return_value=path), \
+            patch.object(search_mod, "_FLUSH_INTERVAL", 3600):
+        for _ in range(search_mod._FLUSH_EVERY - 1):
+            search_mod._increment_usage()
+        assert _stored_count(path, month) == 0          # nothing written yet
+        search_mod._increment_usage()
+        assert _stored_count(path, month) == search_mod._FLUSH_EVERY
+        search_mod._increment_usage()
+        search_mod._flush_all()
+    assert _stored_count(path, month) == search_mod._FLUSH_EVERY + 1
+
+
+def test_counters_in_separate_processes_add_up(tmp_path):
+    path = _make_usage_path(tmp_path)
+    a, b = search_mod.UsageCounter(path), search_mod.UsageCounter(path)
+    for _ in range(3):
+        a.increment()
+        b.increment()
+    a.flush()
+    b.flush()
+    assert _stored_count(path, search_mod._current_month()) == 6
+
+
+def test_legacy_json_imported(tmp_path):
+    month = search_mod._current_month()
+    (tmp_path / "usage.json").write_text(json.dumps({"month": month, "count": 42}), encoding="utf-8")
+    with patch.object(search_mod, "_get_usage_path", return_value=_make_usage_path(tmp_path)):
+        assert search_mod.get_monthly_usage() == 42
+    assert not (tmp_path / "usage.json").exists()
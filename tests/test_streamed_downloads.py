@@ -0,0 +1,133 @@
+"""Tests for streamed, size-capped downloads in the scrape and PDF tools."""
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from webresearch.tools.cache import DiskCache, normalize_url
+from webresearch.tools.http import ResponseTooLarge, read_body, read_text
+from webresearch.tools.pdf import PDFExtractTool
+from webresearch.tools.scrape import ScrapeTool
+
+
+class _Raw(io.BytesIO):
+    """Socket stand-in that counts how many bytes were actually pulled."""
+
+    def read(self, *args, **kwargs):
+        data = super().read(*args, **kwargs)
+        self.pulled = getattr(self, "pulled", 0) + len(data)
+        return data
+
+
+def _streamed(body: bytes, content_type="text/html; charset=utf-8", length=True):
+    r = requests.Response()
+    r.status_code = 200
+    r.url = "https://example.com/page"
+    r.raw = _Raw(body)
+    r.headers["Content-Type"] = content_type
+    if length:
+        r.headers["Content-Length"] = str(len(body))
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    return r
+
+
+def _session(response):
+    session = MagicMock()
+    session.get.return_value = response
+    return session
+
+
+# ── read_body / read_text ───────────────────────────────────────────────────
+
+def test_read_body_truncates_and_stops_pulling():
+    r = _streamed(b"x" * 1_000_000)
+    body, complete = read_body(r, 100_000)
+    assert len(body) == 100_000
+    assert not complete
+    assert r.raw.pulled < 200_000
+    assert r.content == body
+
+
+def test_read_body_rejects_oversize_content_length_before_reading():
+    r = _streamed(b"x" * 1000)
+    with pytest.raises(ResponseTooLarge):
+        read_body(r, 100, truncate=False)
+    assert getattr(r.raw, "pulled", 0) == 0
+
+
+def test_read_body_rejects_oversize_stream_without_content_length():
+    r = _streamed(b"x" * 300_000, length=False)
+    with pytest.raises(ResponseTooLarge):
+        read_body(r, 100_000, truncate=False)
+
+
+def test_read_text_decodes_across_chunk_boundaries():
+    text = "é" * 100_000                       # 2 bytes each — chunks split characters
+    r = _streamed(text.encode("utf-8"), "text/plain; charset=utf-8")
+    decoded, complete = read_text(r, 0, 1_000_000)
+    assert decoded == text
+    assert complete
+
+
+def test_read_text_stops_at_max_chars():
+    r = _streamed(b"a" * 2_000_000, "text/plain; charset=utf-8")
+    decoded, complete = read_text(r, 0, 5000)
+    assert len(decoded) == 5000
+    assert not complete
+    assert r.raw.pulled < 200_000
+
+
+# ── ScrapeTool ──────────────────────────────────────────────────────────────
+
+def test_scrape_streams_and_parses_capped_page():
+    html = "<html><body><main>" + "<p>Useful article text.</p>" * 50 + "</main>"
+    body = (html + "<div>" + "filler " * 200_000 + "</div></body></html>").encode("utf-8")
+    session = _session(_streamed(body))
+    tool = ScrapeTool(session=session, max_bytes=64 * 1024, parser="bs4")
+
+    out = tool.execute("https://example.com/page")
+    assert session.get.call_args.kwargs["stream"] is True
+    assert "Useful article text." in out
+    assert session.get.return_value.raw.pulled < 256 * 1024
+
+
+def test_truncated_page_not_cached(tmp_path):
+    cache = DiskCache("fetch", ttl=60, root=tmp_path)
+    body = b"<html><body><main>" + b"text " * 50_000 + b"</main></body></html>"
+    tool = ScrapeTool(session=_session(_streamed(body)), cache=cache, max_bytes=16 * 1024)
+    tool.execute("https://example.com/page")
+    assert cache.get(normalize_url("https://example.com/page")) is None
+
+
+def test_complete_page_cached(tmp_path):
+    cache = DiskCache("fetch", ttl=60, root=tmp_path)
+    body = b"<html><body><main>" + b"Cached article text. " * 20 + b"</main></body></html>"
+    tool = ScrapeTool(session=_session(_streamed(body)), cache=cache)
+    tool.execute("https://example.com/page")
+    assert cache.get(normalize_url("https://example.com/page")).body == body
+
+
+def test_plain_text_only_downloads_what_fits():
+    session = _session(_streamed(b"line of text\n" * 500_000, "text/plain; charset=utf-8"))
+    out = ScrapeTool(session=session, max_length=2000).execute("https://example.com/data.txt")
+    assert "the rest was not downloaded" in out
+    assert session.get.return_value.raw.pulled < 256 * 1024
+
+
+def test_pdf_link_reported_without_downloading():
+    session = _session(_streamed(b"%PDF-1.7" + b"0" * 500_000, "application/pdf"))
+    out = ScrapeTool(session=session).execute("https://example.com/report.pdf")
+    assert "pdf_extract" in out
+    assert "500,008 bytes" in out
+    assert getattr(session.get.return_value.raw, "pulled", 0) == 0
+
+
+# ── PDFExtractTool ──────────────────────────────────────────────────────────
+
+def test_pdf_oversize_content_length_refused():
+    session = _session(_streamed(b"%PDF-1.7" + b"0" * 10_000, "application/pdf"))
+    with patch("webresearch.tools.pdf.pdfplumber_available", True):
+        out = PDFExtractTool(session=session, max_bytes=1000).execute("https://example.com/big.pdf")
+    assert out.startswith("Skipped (PDF too large)")
+    assert getattr(session.get.return_value.raw, "pulled", 0) == 0
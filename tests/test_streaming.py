@@ -0,0 +1,164 @@
+"""Tests for streamed LLM output and early action dispatch — no API keys needed."""
+import time
+from unittest.mock import MagicMock
+
+from webresearch.agent import ReActAgent
+from webresearch.llm import LLMInterface
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.tools import ToolManager
+from webresearch.tools.base import Tool
+
+
+class _RecordingSearch(Tool):
+    def __init__(self, events):
+        self.events = events
+
+    @property
+    def name(self): return "search"
+    @property
+    def description(self): return "stub search"
+
+    def execute(self, query: str) -> str:
+        self.events.append(f"tool:{query}")
+        return f"results for {query}"
+
+
+class _StreamingLLM:
+    """Yields scripted responses chunk by chunk, logging what was consumed."""
+
+    def __init__(self, scripts, events, delay=0.0):
+        self._scripts = list(scripts)
+        self.events = events
+        self.delay = delay
+        self.calls = 0
+        self.closed_early = 0
+
+    def generate(self, prompt):
+        raise AssertionError("streaming path expected")
+
+    def generate_stream_with_prefix(self, prefix, suffix):
+        chunks = self._scripts[min(self.calls, len(self._scripts) - 1)]
+        self.calls += 1
+        finished = False
+        try:
+            for chunk in chunks:
+                self.events.append(f"chunk:{chunk[:12]}")
+                yield chunk
+                time.sleep(self.delay)
+            finished = True
+        finally:
+            if not finished:
+                self.closed_early += 1
+
+
+_DONE = ["Thought: done\n", "Final Answer: ", "All ", "found."]
+
+
+def _agent(llm, events):
+    tm = ToolManager()
+    tm.register_tool(_RecordingSearch(events))
+    return ReActAgent(llm=llm, tool_manager=tm, max_iterations=4)
+
+
+def test_stream_cut_after_complete_action():
+    events = []
+    action = [
+        "Thought: look it up\n",
+        'Action: search\nAction Input: {"query": ',
+        '"q1"}\n',
+        "Observation: made-up result\n",
+        "Thought: hallucinated continuation",
+    ]
+    llm = _StreamingLLM([action, _DONE], events)
+    agent = _agent(llm, events)
+    assert agent.run("task") == "All found."
+    assert llm.closed_early == 1
+    assert "chunk:Thought: hall" not in events          # remainder never read
+    assert agent.steps[0].observation == "results for q1"
+    assert "made-up" not in agent._build_prompt("task")
+
+
+def test_first_action_starts_while_second_is_streaming():
+    events = []
+    batch = [
+        "Thought: two independent lookups\n",
+        'Action: search\nAction Input: {"query": "a"}\n',
+        'Action: search\nAction Input: {"query": "b"}',
+    ]
+    llm = _StreamingLLM([batch, _DONE], events, delay=0.1)
+    agent = _agent(llm, events)
+    agent.run("task")
+    # tool "a" ran before the chunk carrying the second action was produced
+    second_chunk = max(i for i, e in enumerate(events) if e.startswith("chunk:Action: sear"))
+    assert events.index("tool:a") < second_chunk
+    assert len(agent.steps[0].batch) == 2
+    assert events.count("tool:a") == 1                  # not re-run when the step executes
+
+
+def test_answer_callback_receives_growing_text():
+    events = []
+    search = ["Thought: s\n", 'Action: search\nAction Input: {"query": "q"}']
+    llm = _StreamingLLM([search, _DONE], events)
+    seen = []
+    _agent(llm, events).run("task", answer_callback=seen.append)
+    assert seen[-1] == "All found."
+    assert seen[0] != seen[-1]
+
+
+def test_answer_not_streamed_before_research():
+    events = []
+    llm = _StreamingLLM([_DONE, ["Thought: s\n", 'Action: search\nAction Input: {"query": "q"}'], _DONE], events)
+    seen = []
+    _agent(llm, events).run("task", answer_callback=seen.append)
+    # The first (rejected) answer came before any search and must not be shown
+    assert llm.calls == 3
+    assert seen == ["", "All ", "All found."]
+
+
+def test_scan_actions_complete_only_ignores_open_json():
+    agent = _agent(MagicMock(), [])
+    calls, end = agent._scan_actions('Action: search\nAction Input: {"query": "a"}\nAction: search\nAction Input: {"qu',
+                                     complete_only=True)
+    assert calls == [("search", {"query": "a"})]
+    assert end == len('Action: search\nAction Input: {"query": "a"}')
+
+
+def test_non_streaming_llm_still_works():
+    class _Plain:
+        def __init__(self):
+            self.responses = iter([
+                'Thought: s\nAction: search\nAction Input: {"query": "q"}',
+                "Thought: d\nFinal Answer: ok",
+            ])
+
+        def generate(self, prompt):
+            return next(self.responses)
+
+    assert _agent(_Plain(), []).run("task") == "ok"
+
+
+def test_chain_stream_falls_back_before_first_chunk():
+    class _Failing:
+        provider_name = "primary"
+        def generate_stream_with_prefix(self, prefix, suffix):
+            raise Exception("429 quota exceeded")
+            yield  # pragma: no cover
+
+    class _Ok:
+        provider_name = "fallback"
+        def generate_stream_with_prefix(self, prefix, suffix):
+            yield "a"
+            yield "b"
+
+    chain = ModelFallbackChain([_Failing(), _Ok()])
+    assert "".join(chain.generate_stream_with_prefix("p", "s")) == "ab"
+    assert chain.current_name == "fallback"
+
+
+def test_gemini_generate_stream_yields_chunks():
+    llm = LLMInterface(api_key="test-key", model_name="gemini-test")
+    llm.model = MagicMock()
+    chunks = [MagicMock(text="Hel"), MagicMock(text="lo")]
+    llm.model.generate_content.return_value = chunks
+    assert list(llm.generate_stream("hi")) == ["Hel", "lo"]
+    llm.model.generate_content.assert_called_once_with("hi", stream=True)
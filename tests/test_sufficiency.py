@@ -0,0 +1,117 @@
+"""Tests for early termination when a step's evidence already answers the task — no API keys needed."""
+import asyncio
+
+from webresearch.agent import AsyncReActAgent, ReActAgent
+from webresearch.sufficiency import answer_boxes, covers_task, is_simple_task, sufficient_evidence
+from webresearch.tools import ToolManager
+from webresearch.tools.base import Tool
+from webresearch.tools.search import SearchTool
+
+_TASK = "What is the capital of Australia?"
+_DATA = {
+    "organic": [{"title": "Canberra", "link": "https://en.wikipedia.org/wiki/Canberra", "snippet": "Capital city"}],
+    "answerBox": {"answer": "Canberra"},
+}
+
+
+class _FakeSearch(Tool):
+    """search stub whose output is the real SearchTool formatting of _DATA."""
+
+    @property
+    def name(self): return "search"
+    @property
+    def description(self): return "stub search"
+
+    def execute(self, query: str) -> str:
+        return SearchTool(api_key="k")._format_results(_DATA, query)
+
+
+class _ScriptedLLM:
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.prompts = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self._responses[min(len(self.prompts), len(self._responses)) - 1]
+
+
+_SEARCH_STEP = (
+    "Thought: Look it up.\n"
+    'Action: search\nAction Input: {"query": "capital of Australia"}'
+)
+
+
+def _agent(responses, **kwargs):
+    tm = ToolManager()
+    tm.register_tool(_FakeSearch())
+    return ReActAgent(llm=_ScriptedLLM(responses), tool_manager=tm, max_iterations=6, **kwargs)
+
+
+def test_task_shape_and_coverage():
+    assert is_simple_task(_TASK)
+    assert not is_simple_task("List 10 statements the minister made on separate occasions")
+    assert not is_simple_task("Compare the GDP of France and Germany")
+    assert covers_task(_TASK, "capital of Australia\nCanberra")
+    assert not covers_task(_TASK, "capital of Austria\nVienna")
+
+
+def test_answer_box_parsed_from_search_and_search_many_output():
+    out = SearchTool(api_key="k")._format_results(_DATA, "capital of Australia")
+    assert answer_boxes("search", {"query": "capital of Australia"}, out) == [("capital of Australia", "Canberra")]
+    many = "Merged search results\n\n\nANSWER BOXES:\n" + "=" * 80 + "\ncapital of Australia: Canberra"
+    assert answer_boxes("search_many", {}, many) == [("capital of Australia", "Canberra")]
+    assert answer_boxes("scrape", {}, out) == []
+
+
+def test_no_answer_box_is_not_sufficient():
+    out = SearchTool(api_key="k")._format_results({"organic": _DATA["organic"]}, "capital of Australia")
+    assert sufficient_evidence(_TASK, [("search", {"query": "capital of Australia"}, out)]) is None
+
+
+def test_answer_box_hit_short_circuits_the_loop():
+    agent = _agent([_SEARCH_STEP, "Canberra is the capital of Australia (en.wikipedia.org/wiki/Canberra)."])
+    answer = agent.run(_TASK)
+
+    assert answer.startswith("Canberra is the capital")
+    assert len(agent.llm.prompts) == 2
+    assert "Answer box: Canberra" in agent.llm.prompts[1]
+    assert agent.saved_iterations == 5
+
+    # The early answer is recorded as the final step, like a Final Answer
+    trace = agent.get_execution_trace()
+    assert [t.get("action") for t in trace] == ["search", None]
+    assert trace[-1]["iteration"] == 1 and "answer box" in trace[-1]["thought"]
+
+
+def test_insufficient_verdict_continues_the_loop():
+    agent = _agent([
+        _SEARCH_STEP,
+        "INSUFFICIENT",
+        _SEARCH_STEP.replace("Look it up.", "Search once more."),
+        "Thought: Done.\nFinal Answer: Canberra.",
+    ])
+    assert agent.run(_TASK) == "Canberra."
+    # The second search hit the same answer box but was not checked again
+    assert len(agent.llm.prompts) == 4
+    assert agent.saved_iterations == 0
+
+
+def test_disabled_or_complex_tasks_run_normally():
+    final = "Thought: Done.\nFinal Answer: Canberra."
+    off = _agent([_SEARCH_STEP, final], early_stop=False)
+    assert off.run(_TASK) == "Canberra."
+
+    complex_task = "Explain why Canberra was chosen as the capital of Australia"
+    on = _agent([_SEARCH_STEP, final])
+    assert on.run(complex_task) == "Canberra."
+    assert on.saved_iterations == 0
+
+
+def test_async_agent_answers_early():
+    tm = ToolManager()
+    tm.register_tool(_FakeSearch())
+    agent = AsyncReActAgent(llm=_ScriptedLLM([_SEARCH_STEP, "Canberra."]), tool_manager=tm, max_iterations=6)
+    assert asyncio.run(agent.run(_TASK)) == "Canberra."
+    assert agent.saved_iterations == 5
+    assert len(agent.get_execution_trace()) == 2
@@ -29,7 +29,7 @@ __author__ = "Victor Jotham Ashioya"
 __license__ = "MIT"
 
 # Import main components for easy access
-from .agent import ReActAgent, Step
+from .agent import ReActAgent, AsyncReActAgent, Step
 from .config import config, Config
 from .llm import LLMInterface
 from .llm_compat import OpenAICompatibleLLMInterface, openai_available, PROVIDERS
@@ -41,6 +41,7 @@ from .tools import (
     Tool,
     ToolManager,
     SearchTool,
+    MultiSearchTool,
     ScrapeTool,
     BrowserScrapeTool,
     CodeExecutorTool,
@@ -53,6 +54,7 @@ __all__ = [
     "__author__",
     "__license__",
     "ReActAgent",
+    "AsyncReActAgent",
     "ParallelResearchAgent",
     "Step",
     "Config",
@@ -69,6 +71,7 @@ __all__ = [
     "Tool",
     "ToolManager",
     "SearchTool",
+    "MultiSearchTool",
     "ScrapeTool",
     "BrowserScrapeTool",
     "CodeExecutorTool",
@@ -9,16 +9,26 @@ The agent follows a loop:
 2. Action: Execute a tool with specific parameters
 3. Observation: Receive the result
 4. Repeat until the task is complete
+
+ReActAgent drives the loop synchronously; AsyncReActAgent runs the same loop
+as a coroutine so many sessions can share one event loop.
 """
 
+import asyncio
 import json
 import re
+import threading
 import time
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Optional, Any, Tuple
 
+from .context import ContextBudget, Segment, clip_to_tokens, estimate_tokens
 from .llm import LLMInterface
+from .llm_chain import agenerate_with, agenerate_with_prefix, generate_with_prefix, stream_with_prefix
+from .observations import ObservationStore
+from .sufficiency import sufficient_evidence
 from .tools import ToolManager
 
 logger = logging.getLogger(__name__)
@@ -40,145 +50,21 @@ _OBSERVATION_INJECTION_PATTERNS = [
     # legitimate content from news articles (e.g. "Action: The company announced...")
 ]
 
-# How many recent steps to include in full; older ones are summarised (issue #11)
-_FULL_HISTORY_WINDOW = 8
-
-
-@dataclass
-class Step:
-    """Represents a single step in the ReAct loop."""
-
-    thought: str
-    action: Optional[str] = None
-    action_input: Optional[Dict[str, Any]] = None
-    observation: Optional[str] = None
-    # Iteration metadata (issue #10)
-    iteration: int = 0
-    timestamp: float = field(default_factory=time.time)
-    elapsed_ms: Optional[float] = None
-
-
-class AgentError(Exception):
-    """Raised when the agent encounters an unrecoverable error."""
-    pass
-
-
-class ReActAgent:
-    """
-    ReAct agent that reasons about and executes tasks using available tools.
-
-    The agent follows the ReAct paradigm:
-    - Thought: Reasoning about the current state and what to do next
-    - Action: Executing a tool to gather information or perform an operation
-    - Observation: Processing the result of the action
-    """
-
-    def __init__(
-        self,
-        llm: LLMInterface,
-        tool_manager: ToolManager,
-        max_iterations: int = 15,
-        max_tool_output_length: int = 5000,
-    ):
-        self.llm = llm
-        self.tool_manager = tool_manager
-        self.max_iterations = max_iterations
-        self.max_tool_output_length = max_tool_output_length
-        self.steps: List[Step] = []
-        self._action_cache: Dict[str, str] = {}  # issue #8
-
-    def run(self, task: str, step_callback: Optional[StepCallback] = None) -> str:
-        """
-        Run the agent on a given task.
-
-        Args:
-            task: The task description
-            step_callback: Optional callable(iteration, step) called after each step
-
-        Returns:
-            The final answer string. Errors are prefixed with "⚠ Error:" so the
-            caller can distinguish them from valid answers (issue #12).
-        """
-        logger.info(f"Starting task: {task[:100]}...")
-        self.steps = []
-        self._action_cache = {}
-
-        try:
-            for iteration in range(self.max_iterations):
-                logger.info(f"Iteration {iteration + 1}/{self.max_iterations}")
-
-                prompt = self._build_prompt(task)
-                t0 = time.time()
-                response = self.llm.generate(prompt)
-
-                thought, action, action_input, final_answer = self._parse_response(response)
-
-                step = Step(thought=thought, iteration=iteration + 1)
+_OBSERVATION_INJECTION_RES = [re.compile(p) for p in _OBSERVATION_INJECTION_PATTERNS]
 
-                if final_answer:
-                    # Enforce at least one real research tool call before accepting the answer.
-                    # 'think' is reasoning scaffolding, not a research tool.
-                    _RESEARCH_TOOLS = frozenset({"search", "scrape", "scrape_js", "pdf_extract"})
-                    used_research = any(s.action in _RESEARCH_TOOLS for s in self.steps)
-                    if not used_research:
-                        logger.warning("Agent attempted Final Answer without any research tool use — forcing search.")
-                        step.observation = (
-                            "You provided a Final Answer without calling any research tools. "
-                            "This is not permitted — you are a research agent, not a knowledge base. "
-                            "Your training data may be outdated or wrong. "
-                            "You must call search or scrape at least once before answering. "
-                            "Begin with a think step, then search."
-                        )
-                        step.elapsed_ms = (time.time() - t0) * 1000
-                        self.steps.append(step)
-                        if step_callback:
-                            step_callback(iteration + 1, step)
-                        continue
-
-                    logger.info("Agent produced final answer")
-                    step.elapsed_ms = (time.time() - t0) * 1000
-                    self.steps.append(step)
-                    if step_callback:
-                        step_callback(iteration + 1, step)
-                    return final_answer
+# 'think' is reasoning scaffolding, not a research tool.
+_RESEARCH_TOOLS = frozenset({"search", "search_many", "scrape", "scrape_js", "pdf_extract"})
 
-                if action and action_input is not None:
-                    step.action = action
-                    step.action_input = action_input
+# Upper bound on tool calls dispatched concurrently from a single step
+_MAX_PARALLEL_ACTIONS = 4
 
-                    observation = self._execute_action(action, action_input)
-                    step.observation = observation
-                    step.elapsed_ms = (time.time() - t0) * 1000
-                    self.steps.append(step)
-                    logger.info(f"Action: {action}, Observation length: {len(observation)}")
-                else:
-                    step.observation = "No valid action found. Please provide a thought and then an action."
-                    step.elapsed_ms = (time.time() - t0) * 1000
-                    self.steps.append(step)
+_FINAL_ANSWER_RE = re.compile(r"Final Answer:\s*", re.IGNORECASE)
 
-                if step_callback:
-                    step_callback(iteration + 1, step)
+# Receives the Final Answer text produced so far while the response streams in
+AnswerCallback = Callable[[str], None]
 
-            logger.warning("Max iterations reached without final answer")
-            best_effort = self._generate_best_effort_answer(task)
-            return f"⚠ Max iterations ({self.max_iterations}) reached — answer may be incomplete.\n\n{best_effort}"
 
-        except Exception as e:
-            logger.error(f"Error during agent execution: {str(e)}")
-            # Prefix with "⚠ Error:" so callers can render it differently (issue #12)
-            return f"⚠ Error: The agent encountered an error: {str(e)}"
-
-    def _sanitize_observation(self, obs: str) -> str:
-        """Strip prompt-injection patterns from scraped observations (issue #1)."""
-        for pattern in _OBSERVATION_INJECTION_PATTERNS:
-            obs = re.sub(pattern, "[FILTERED]", obs)
-        return obs
-
-    def _build_prompt(self, task: str) -> str:
-        """Build the prompt with a sliding-window history to cap context size (issue #11)."""
-        prompt_parts = []
-
-        prompt_parts.append("""You are a research agent that can use tools to complete tasks. You follow the ReAct (Reasoning and Acting) paradigm.
+_REACT_INSTRUCTIONS = """You are a research agent that can use tools to complete tasks. You follow the ReAct (Reasoning and Acting) paradigm.
 
 For each step, you should:
 1. Think about what you need to do next (Thought)
@@ -195,6 +81,14 @@ Thought: [your reasoning about what to do next]
 Action: [the tool name to use]
 Action Input: [the parameters as a JSON object]
 
+OR, to run several INDEPENDENT tool calls at once (they execute in parallel):
+
+Thought: [why these calls don't depend on each other]
+Action: [tool name]
+Action Input: [JSON]
+Action: [tool name]
+Action Input: [JSON]
+
 OR, when you have the final answer:
 
 Thought: [your reasoning about why you have enough information]
@@ -205,6 +99,8 @@ IMPORTANT RULES:
 - Use "Action:" only when you want to use a tool
 - Use "Action Input:" with valid JSON for parameters — ensure all string values use escaped characters (\\n, \\", etc.) and never contain raw newlines or unescaped backslashes
 - Use "Final Answer:" only when you can fully answer the task
+- Batch actions only when no call needs another's result — e.g. scraping the three best URLs
+  from one set of search results. At most 4 actions per step; observations come back together
 - Be thorough and verify information from multiple sources when needed
 - For tasks requiring lists or compilations, gather comprehensive information before concluding
 - Always cite sources (URLs) in your final answer
@@ -276,42 +172,476 @@ Action: think
 Action Input: {"thought": "Page confirms COO is [Name]. Source is their official team page. Sufficient to answer."}
 
 Final Answer: The COO of [Org X] is [Name]. Source: [URL]
-""")
+"""
 
-        prompt_parts.append("\n" + self.tool_manager.get_tool_descriptions())
-        prompt_parts.append(f"\n\nTASK:\n{task}")
 
-        if self.steps:
-            earlier = self.steps[:-_FULL_HISTORY_WINDOW] if len(self.steps) > _FULL_HISTORY_WINDOW else []
-            recent = self.steps[-_FULL_HISTORY_WINDOW:]
+@dataclass
+class Step:
+    """Represents a single step in the ReAct loop."""
 
-            if earlier:
-                prompt_parts.append(f"\n\n[{len(earlier)} earlier steps — summarised to save context]:")
-                for i, step in enumerate(earlier, 1):
-                    summary = f"\nStep {i}: Thought: {step.thought}"
-                    if step.action:
-                        summary += f" → Action: {step.action}"
-                    prompt_parts.append(summary)
+    thought: str
+    action: Optional[str] = None
+    action_input: Optional[Dict[str, Any]] = None
+    observation: Optional[str] = None
+    # Iteration metadata (issue #10)
+    iteration: int = 0
+    timestamp: float = field(default_factory=time.time)
+    elapsed_ms: Optional[float] = None
+    # Multi-action steps: every call as {"action", "action_input", "observation"}.
+    # action/action_input above mirror the first call; observation is the merge.
+    batch: Optional[List[Dict[str, Any]]] = None
 
-            prompt_parts.append("\n\nPREVIOUS STEPS (full detail):" if earlier else "\n\nPREVIOUS STEPS:")
-            offset = len(earlier)
-            for i, step in enumerate(recent, offset + 1):
-                prompt_parts.append(f"\nStep {i}:")
-                prompt_parts.append(f"Thought: {step.thought}")
+    def calls(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return every (action, action_input) pair issued by this step."""
+        if self.batch:
+            return [(c["action"], c["action_input"]) for c in self.batch]
+        if self.action:
+            return [(self.action, self.action_input or {})]
+        return []
+
+
+def _action_block_ended(rest: str) -> bool:
+    """
+    True once the text after a completed Action Input is clearly not another
+    Action — e.g. a hallucinated "Observation:" — so the stream can be cut.
+    """
+    rest = rest.lstrip()
+    return bool(rest) and not "action:".startswith(rest[:len("Action:")].lower())
+
+
+def _json_object_end(text: str, start: int) -> int:
+    """
+    Return the index just past the JSON object that opens at text[start], or 0
+    if it is never closed.  Braces inside string literals are ignored.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return 0
+
+
+class AgentError(Exception):
+    """Raised when the agent encounters an unrecoverable error."""
+    pass
+
+
+class ReActAgent:
+    """
+    ReAct agent that reasons about and executes tasks using available tools.
+
+    The agent follows the ReAct paradigm:
+    - Thought: Reasoning about the current state and what to do next
+    - Action: Executing a tool to gather information or perform an operation
+    - Observation: Processing the result of the action
+    """
+
+    def __init__(
+        self,
+        llm: LLMInterface,
+        tool_manager: ToolManager,
+        max_iterations: int = 15,
+        max_tool_output_length: int = 5000,
+        context_budget: Optional[int] = None,
+        stream: bool = True,
+        observations: Optional[ObservationStore] = None,
+        cancel: Optional[threading.Event] = None,
+        early_stop: bool = True,
+    ):
+        self.llm = llm
+        self.tool_manager = tool_manager
+        self.max_iterations = max_iterations
+        self.max_tool_output_length = max_tool_output_length
+        # Prompt token budget, capped by the model's input window (see context.py)
+        self.context_budget = ContextBudget.for_llm(llm, context_budget)
+        # Stream responses and start tool calls as soon as their input is complete
+        self.stream = stream
+        self.steps: List[Step] = []
+        self._action_cache: Dict[str, str] = {}  # issue #8
+        self._inflight: Dict[str, Future] = {}   # started mid-stream, keyed like _action_cache
+        # Observations shared with sibling agents of the same run (see observations.py)
+        self.observations = observations
+        # Set by the owner (e.g. a deep-research deadline) to stop before the next step
+        self.cancel = cancel
+        # Answer as soon as a step's observation settles the task (see sufficiency.py)
+        self.early_stop = early_stop
+        self.saved_iterations = 0       # iterations an early answer left unused in the last run
+        self._early_checked = False
+        # Prompt pieces reused across iterations (see _build_prompt)
+        self._prefix_cache: Optional[str] = None
+        self._prefix_tokens = 0
+        self._step_blocks: List[Segment] = []
+
+    def run(
+        self,
+        task: str,
+        step_callback: Optional[StepCallback] = None,
+        answer_callback: Optional[AnswerCallback] = None,
+    ) -> str:
+        """
+        Run the agent on a given task.
+
+        Args:
+            task: The task description
+            step_callback: Optional callable(iteration, step) called after each step
+            answer_callback: Optional callable(text) called with the Final Answer
+                produced so far each time more of it streams in
+
+        Returns:
+            The final answer string. Errors are prefixed with "⚠ Error:" so the
+            caller can distinguish them from valid answers (issue #12).
+        """
+        self._start_run(task)
+
+        try:
+            for iteration in range(self.max_iterations):
+                if self._cancelled():
+                    return self._cancelled_answer()
+                logger.info(f"Iteration {iteration + 1}/{self.max_iterations}")
+
+                prefix, suffix = self._build_prompt_parts(task)
+                t0 = time.time()
+                if self.stream:
+                    response = self._stream_response(prefix, suffix, answer_callback)
+                else:
+                    response = generate_with_prefix(self.llm, prefix, suffix)
+
+                step, final_answer = self._interpret_response(response, iteration + 1)
+                if step.batch and step.observation is None:
+                    self._merge_batch(step, self._execute_batch(step.batch))
+                elif step.action and step.observation is None:
+                    step.observation = self._execute_action(step.action, step.action_input)
+                self._record_step(step, t0, step_callback)
+
+                if final_answer:
+                    return final_answer
+
+                early_prompt = self._early_answer_prompt(task, step)
+                if early_prompt is not None:
+                    t0 = time.time()
+                    try:
+                        early = self._accept_early_answer(
+                            self.llm.generate(early_prompt), iteration + 1, t0, step_callback
+                        )
+                    except Exception as e:
+                        logger.warning(f"Early answer failed: {e}")
+                        early = None
+                    if early:
+                        return early
+
+            logger.warning("Max iterations reached without final answer")
+            best_effort = self._generate_best_effort_answer(task)
+            return self._max_iterations_answer(best_effort)
+
+        except Exception as e:
+            return self._error_answer(e)
+
+    def _stream_response(
+        self, prefix: str, suffix: str, answer_callback: Optional[AnswerCallback]
+    ) -> str:
+        """
+        Consume the LLM response as a stream and act on it before it finishes.
+
+        Each Action whose Action Input JSON has closed is started immediately
+        (its result is picked up by _execute_action).  Once the text after the
+        last complete action is anything but another "Action:", the rest of
+        the generation is abandoned and the response is cut there.  Final
+        Answer text is forwarded to answer_callback as it arrives.
+        """
+        text = ""
+        n_started = 0
+        pool: Optional[ThreadPoolExecutor] = None
+        stream = stream_with_prefix(self.llm, prefix, suffix)
+        try:
+            for chunk in stream:
+                text += chunk
+                answer = _FINAL_ANSWER_RE.search(text)
+                if answer:
+                    if answer_callback and self._used_research():
+                        answer_callback(text[answer.end():])
+                    continue
+                if "}" not in chunk and not n_started:
+                    continue
+
+                calls, end = self._scan_actions(text, complete_only=True)
+                for name, params in calls[n_started:_MAX_PARALLEL_ACTIONS]:
+                    key = self._cache_key(name, params)
+                    if key not in self._action_cache and key not in self._inflight:
+                        pool = pool or ThreadPoolExecutor(max_workers=_MAX_PARALLEL_ACTIONS)
+                        self._inflight[key] = pool.submit(self._run_action, key, name, params)
+                n_started = len(calls)
+                if calls and (n_started >= _MAX_PARALLEL_ACTIONS or _action_block_ended(text[end:])):
+                    logger.info(f"Cut response after {n_started} complete action(s)")
+                    return text[:end]
+            return text
+        finally:
+            stream.close()
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+    # ── Loop helpers shared by ReActAgent and AsyncReActAgent ─────────────────
+
+    def _start_run(self, task: str) -> None:
+        logger.info(f"Starting task: {task[:100]}...")
+        self.steps = []
+        self._action_cache = {}
+        self._inflight = {}
+        self._step_blocks = []
+        self.saved_iterations = 0
+        self._early_checked = False
+
+    def _interpret_response(self, response: str, iteration: int) -> Tuple[Step, Optional[str]]:
+        """
+        Turn one LLM response into a Step.
+
+        Returns (step, final_answer).  final_answer is set only when the answer
+        is accepted.  When the step carries an action (or a batch) whose
+        observation is still None, the caller must execute it before recording
+        the step.
+        """
+        thought, action, action_input, final_answer = self._parse_response(response)
+        step = Step(thought=thought, iteration=iteration)
+
+        if final_answer:
+            # Enforce at least one real research tool call before accepting the answer.
+            if not self._used_research():
+                logger.warning("Agent attempted Final Answer without any research tool use — forcing search.")
+                step.observation = (
+                    "You provided a Final Answer without calling any research tools. "
+                    "This is not permitted — you are a research agent, not a knowledge base. "
+                    "Your training data may be outdated or wrong. "
+                    "You must call search or scrape at least once before answering. "
+                    "Begin with a think step, then search."
+                )
+                return step, None
+
+            logger.info("Agent produced final answer")
+            return step, final_answer
+
+        calls = self._parse_actions(response)
+        if len(calls) > 1:
+            step.action, step.action_input = calls[0]
+            step.batch = [{"action": name, "action_input": params} for name, params in calls]
+            if len(calls) > _MAX_PARALLEL_ACTIONS:
+                logger.warning(
+                    f"Step requested {len(calls)} actions — running the first {_MAX_PARALLEL_ACTIONS}"
+                )
+                for call in step.batch[_MAX_PARALLEL_ACTIONS:]:
+                    call["observation"] = (
+                        f"Not run — at most {_MAX_PARALLEL_ACTIONS} actions are executed per step. "
+                        "Issue it again in your next step if still needed."
+                    )
+        elif action and action_input is not None:
+            step.action = action
+            step.action_input = action_input
+        else:
+            step.observation = "No valid action found. Please provide a thought and then an action."
+        return step, None
+
+    def _used_research(self) -> bool:
+        return any(name in _RESEARCH_TOOLS for s in self.steps for name, _ in s.calls())
+
+    def _merge_batch(self, step: Step, observations: List[str]) -> None:
+        """Attach each call's observation to the batch and merge them into step.observation."""
+        n = len(step.batch)
+        parts = []
+        for i, (call, obs) in enumerate(zip(step.batch, observations), 1):
+            call["observation"] = obs
+            parts.append(
+                f"[{i}/{n}] {call['action']} {self._format_action_input(call['action_input'], indent=None)}\n{obs}"
+            )
+        step.observation = "\n\n".join(parts)
+
+    def _record_step(
+        self, step: Step, t0: float, step_callback: Optional[StepCallback]
+    ) -> None:
+        step.elapsed_ms = (time.time() - t0) * 1000
+        self.steps.append(step)
+        self._render_new_steps()
+        if step.action:
+            names = ", ".join(name for name, _ in step.calls())
+            logger.info(f"Action: {names}, Observation length: {len(step.observation or '')}")
+        if step_callback:
+            step_callback(step.iteration, step)
+
+    def _early_answer_prompt(self, task: str, step: Step) -> Optional[str]:
+        """
+        Prompt to answer straight from this step's evidence, or None to keep
+        iterating.  Tried at most once per run, and never on the last iteration
+        (nothing would be saved).
+        """
+        if not self.early_stop or self._early_checked or step.iteration >= self.max_iterations:
+            return None
+        if step.batch:
+            calls = [(c["action"], c["action_input"], c.get("observation")) for c in step.batch]
+        elif step.action:
+            calls = [(step.action, step.action_input or {}, step.observation)]
+        else:
+            return None
+        evidence = sufficient_evidence(task, calls)
+        if evidence is None:
+            return None
+        self._early_checked = True
+        evidence = self._sanitize_observation(evidence)[: self.max_tool_output_length]
+        return f"""A web search returned a direct answer to this task.
+
+TASK:
+{task}
+
+EVIDENCE:
+{evidence}
+
+If the evidence answers the task, write the final answer now: state it directly and cite the source URL(s) above.
+If it does not actually answer the task, reply with the single word INSUFFICIENT."""
 
-                if step.action:
-                    prompt_parts.append(f"Action: {step.action}")
-                    prompt_parts.append(f"Action Input: {self._format_action_input(step.action_input)}")
+    def _accept_early_answer(
+        self, response: str, iteration: int, t0: float, step_callback: Optional[StepCallback]
+    ) -> Optional[str]:
+        """
+        The early answer, or None if the model judged the evidence insufficient.
 
-                if step.observation:
-                    obs = step.observation
-                    if len(obs) > self.max_tool_output_length:
-                        obs = obs[:self.max_tool_output_length] + f"\n... [truncated from {len(step.observation)} chars]"
-                    # Sanitize before injecting into prompt (issue #1)
-                    prompt_parts.append(f"Observation: {self._sanitize_observation(obs)}")
+        An accepted answer is recorded as the run's final step, like a Final
+        Answer, so traces and source extraction end on it.
+        """
+        if not response or response.strip().upper().startswith("INSUFFICIENT"):
+            logger.info("Evidence judged insufficient — continuing the loop")
+            return None
+        self.saved_iterations = self.max_iterations - iteration
+        logger.info(f"Answered from step {iteration}'s evidence — {self.saved_iterations} iteration(s) saved")
+        step = Step(thought="The search's answer box settles the task — answering from that evidence.",
+                    iteration=iteration)
+        self._record_step(step, t0, step_callback)
+        return response.strip()
+
+    def _cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _cancelled_answer(self) -> str:
+        logger.info(f"Run cancelled after {len(self.steps)} step(s)")
+        return f"⚠ Cancelled after {len(self.steps)} step(s) — answer not finished."
+
+    def _max_iterations_answer(self, best_effort: str) -> str:
+        return f"⚠ Max iterations ({self.max_iterations}) reached — answer may be incomplete.\n\n{best_effort}"
+
+    @staticmethod
+    def _error_answer(e: Exception) -> str:
+        logger.error(f"Error during agent execution: {str(e)}")
+        # Prefix with "⚠ Error:" so callers can render it differently (issue #12)
+        return f"⚠ Error: The agent encountered an error: {str(e)}"
 
-        prompt_parts.append("\n\nWhat is your next step?")
-        return "\n".join(prompt_parts)
+    def _sanitize_observation(self, obs: str) -> str:
+        """Strip prompt-injection patterns from scraped observations (issue #1)."""
+        for pattern in _OBSERVATION_INJECTION_RES:
+            obs = pattern.sub("[FILTERED]", obs)
+        return obs
+
+    def _build_prompt(self, task: str) -> str:
+        """Full prompt text — the static prefix followed by the per-iteration suffix."""
+        prefix, suffix = self._build_prompt_parts(task)
+        return prefix + suffix
+
+    def _build_prompt_parts(self, task: str) -> Tuple[str, str]:
+        """
+        Assemble the prompt from cached pieces, trimmed to the token budget.
+
+        Returns (prefix, suffix).  The prefix — instructions + tool descriptions —
+        is built once per agent and is byte-identical on every call, so providers
+        can serve it from their context cache (see generate_with_prefix).  Each
+        step is rendered (truncated + sanitised) once when it is recorded, so
+        per-iteration work is proportional to the new step, not the history.
+        History is fitted newest-first by self.context_budget: recent steps in
+        full, older ones as one-line summaries, the oldest dropped (issue #11).
+        """
+        self._render_new_steps()
+        prefix = self._static_prefix()
+        prompt_parts = ["", f"\n\nTASK:\n{task}"]
+        tail = "\n\nWhat is your next step?"
+
+        if self._step_blocks:
+            fixed = self._prefix_tokens + estimate_tokens(task) + estimate_tokens(tail)
+            plan = self.context_budget.plan(fixed, self._step_blocks)
+            kept = self._step_blocks[plan.dropped:]
+            if plan.dropped:
+                prompt_parts.append(f"\n\n[{plan.dropped} oldest steps omitted to fit the context budget]")
+            if plan.summarised:
+                prompt_parts.append(f"\n\n[{plan.summarised} earlier steps — summarised to save context]:")
+                prompt_parts.extend(seg.summary for seg in kept[:plan.summarised])
+            earlier = plan.dropped or plan.summarised
+            prompt_parts.append("\n\nPREVIOUS STEPS (full detail):" if earlier else "\n\nPREVIOUS STEPS:")
+            prompt_parts.extend(seg.full for seg in kept[plan.summarised:])
+            if plan.clip_tokens is not None:
+                prompt_parts[-1] = clip_to_tokens(prompt_parts[-1], plan.clip_tokens)
+
+        prompt_parts.append(tail)
+        return prefix, "\n".join(prompt_parts)
+
+    def _static_prefix(self) -> str:
+        """Instructions + tool descriptions — identical for every iteration and every task."""
+        if self._prefix_cache is None:
+            self._prefix_cache = "\n".join(
+                [_REACT_INSTRUCTIONS, "\n" + self.tool_manager.get_tool_descriptions()]
+            )
+            self._prefix_tokens = estimate_tokens(self._prefix_cache)
+        return self._prefix_cache
+
+    def _render_new_steps(self) -> None:
+        """Render prompt segments for steps recorded since the last call."""
+        if len(self._step_blocks) > len(self.steps):
+            self._step_blocks = []
+        for i in range(len(self._step_blocks), len(self.steps)):
+            self._step_blocks.append(self._render_step(i + 1, self.steps[i]))
+
+    def _render_step(self, i: int, step: Step) -> Segment:
+        summary = f"\nStep {i}: Thought: {step.thought}"
+        if step.action:
+            summary += f" → Action: {', '.join(name for name, _ in step.calls())}"
+
+        lines = [f"\nStep {i}:", f"Thought: {step.thought}"]
+        for name, params in step.calls():
+            lines.append(f"Action: {name}")
+            lines.append(f"Action Input: {self._format_action_input(params)}")
+        if step.observation:
+            obs = self._truncate_observation(step)
+            # Sanitize before injecting into prompt (issue #1) — once per step
+            lines.append(f"Observation: {self._sanitize_observation(obs)}")
+        return Segment(summary=summary, full="\n".join(lines))
+
+    def _truncate_observation(self, step: Step) -> str:
+        """
+        Cap a step's observation at max_tool_output_length for the prompt.
+        Batched steps split the budget evenly so later calls aren't cut off.
+        """
+        limit = self.max_tool_output_length
+        if not step.batch:
+            obs = step.observation
+            if len(obs) > limit:
+                obs = obs[:limit] + f"\n... [truncated from {len(step.observation)} chars]"
+            return obs
+
+        share = max(200, limit // len(step.batch))
+        parts = []
+        for i, call in enumerate(step.batch, 1):
+            obs = call.get("observation", "")
+            if len(obs) > share:
+                obs = obs[:share] + f"\n... [truncated from {len(call['observation'])} chars]"
+            parts.append(f"[{i}/{len(step.batch)}] {call['action']}\n{obs}")
+        return "\n\n".join(parts)
 
     def _parse_response(
         self, response: str
@@ -372,6 +702,51 @@ Final Answer: The COO of [Org X] is [Name]. Source: [URL]
 
         return thought, action, action_input, final_answer
 
+    def _parse_actions(self, response: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Extract every Action / Action Input pair from a response, in order.
+
+        Scanning resumes after each parsed JSON object, so "Action:" text
+        inside an input's string values is never mistaken for a new call.
+        """
+        return self._scan_actions(response)[0]
+
+    def _scan_actions(
+        self, response: str, complete_only: bool = False
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        """
+        _parse_actions() plus the index just past the last parsed Action Input.
+
+        With complete_only, scanning stops at the first Action Input whose JSON
+        object has not closed yet — used on partial, still-streaming responses.
+        """
+        calls = []
+        last_end = 0
+        pos = 0
+        action_re = re.compile(r"Action:\s*(\w+)", re.IGNORECASE)
+        input_re = re.compile(r"\s*Action Input:\s*(?=\{)", re.IGNORECASE)
+        while True:
+            action_match = action_re.search(response, pos)
+            if not action_match:
+                break
+            input_match = input_re.match(response, action_match.end())
+            if not input_match:
+                pos = action_match.end()
+                continue
+            start = input_match.end()
+            end = _json_object_end(response, start)
+            if complete_only and not end:
+                break
+            raw = response[start:end] if end else response[start:]
+            try:
+                params = json.loads(raw)
+            except json.JSONDecodeError:
+                params = self._parse_action_input_fallback(raw)
+            if isinstance(params, dict):
+                calls.append((action_match.group(1).strip(), params))
+            pos = last_end = end or len(response)
+        return calls, last_end
+
     def _parse_action_input_fallback(self, action_input_str: str) -> Dict[str, Any]:
         """Fallback parser; logs a warning and surfaces raw input on total failure (issue #7)."""
         params = {}
@@ -398,36 +773,70 @@ Final Answer: The COO of [Org X] is [Name]. Source: [URL]
 
         return params
 
-    def _format_action_input(self, action_input: Optional[Dict]) -> str:
+    def _format_action_input(self, action_input: Optional[Dict], indent: Optional[int] = 2) -> str:
         """Format action input for display in the prompt."""
         if not action_input:
             return "{}"
         try:
-            return json.dumps(action_input, indent=2)
+            return json.dumps(action_input, indent=indent)
         except (TypeError, ValueError):  # Fixed: no bare except (issue #2)
             return str(action_input)
 
-    def _execute_action(self, action: str, action_input: Dict[str, Any]) -> str:
-        """Execute a tool action, returning a cached result for duplicate calls (issue #8)."""
+    @staticmethod
+    def _cache_key(action: str, action_input: Dict[str, Any]) -> str:
         try:
-            cache_key = f"{action}:{hash(json.dumps(action_input, sort_keys=True))}"
+            return f"{action}:{hash(json.dumps(action_input, sort_keys=True))}"
         except (TypeError, ValueError):
-            cache_key = f"{action}:{hash(str(action_input))}"
+            return f"{action}:{hash(str(action_input))}"
+
+    def _execute_action(self, action: str, action_input: Dict[str, Any]) -> str:
+        """Execute a tool action, returning a cached result for duplicate calls (issue #8)."""
+        cache_key = self._cache_key(action, action_input)
 
         if cache_key in self._action_cache:
             logger.info(f"Cache hit for action '{action}' — returning cached result")
             return self._action_cache[cache_key]
 
+        started = self._inflight.pop(cache_key, None)
+        if started is not None:
+            return started.result()
+        return self._run_action(cache_key, action, action_input)
+
+    def _run_action(self, cache_key: str, action: str, action_input: Dict[str, Any]) -> str:
         try:
-            result = self.tool_manager.execute_tool(action, **action_input)
+            if self.observations is not None:
+                result = self.observations.run(
+                    cache_key, action, lambda: self.tool_manager.execute_tool(action, **action_input)
+                )
+            else:
+                result = self.tool_manager.execute_tool(action, **action_input)
             self._action_cache[cache_key] = result
             return result
         except Exception as e:
             logger.error(f"Error executing action {action}: {str(e)}")
             return f"Error executing action: {str(e)}"
 
+    def _execute_batch(self, batch: List[Dict[str, Any]]) -> List[str]:
+        """Run a step's independent tool calls concurrently; results keep batch order."""
+        pending = [i for i, call in enumerate(batch) if "observation" not in call]
+        results = [call.get("observation", "") for call in batch]
+        with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+            futures = {
+                i: pool.submit(self._execute_action, batch[i]["action"], batch[i]["action_input"])
+                for i in pending
+            }
+            for i, future in futures.items():
+                results[i] = future.result()
+        return results
+
     def _generate_best_effort_answer(self, task: str) -> str:
         """Generate a best-effort answer using a proportional observation budget (issue #5)."""
+        try:
+            return self.llm.generate(self._best_effort_prompt(task))
+        except Exception:
+            return self._best_effort_fallback()
+
+    def _best_effort_prompt(self, task: str) -> str:
         n_steps = max(1, len(self.steps))
         per_step_budget = max(200, self.max_tool_output_length // n_steps)
 
@@ -447,12 +856,11 @@ Based on the information gathered in these steps, provide the best possible answ
                 prompt += f"Observation: {obs}{'...' if len(step.observation) > per_step_budget else ''}\n"
 
         prompt += "\n\nProvide a final answer based on the information gathered:"
+        return prompt
 
-        try:
-            return self.llm.generate(prompt)
-        except Exception:
-            last_thought = self.steps[-1].thought if self.steps and self.steps[-1].thought else "N/A"
-            return f"Unable to complete the task within {self.max_iterations} iterations. Last thought: {last_thought}"
+    def _best_effort_fallback(self) -> str:
+        last_thought = self.steps[-1].thought if self.steps and self.steps[-1].thought else "N/A"
+        return f"Unable to complete the task within {self.max_iterations} iterations. Last thought: {last_thought}"
 
     def get_execution_trace(self) -> List[Dict[str, Any]]:
         """Get the execution trace of all steps, including timing metadata."""
@@ -468,6 +876,11 @@ Based on the information gathered in these steps, provide the best possible answ
             if step.action:
                 step_dict["action"] = step.action
                 step_dict["action_input"] = step.action_input
+            if step.batch:
+                step_dict["batch"] = [
+                    {"action": c["action"], "action_input": c["action_input"]}
+                    for c in step.batch
+                ]
             if step.observation:
                 step_dict["observation"] = (
                     step.observation[:500] + "..."
@@ -476,3 +889,105 @@ Based on the information gathered in these steps, provide the best possible answ
                 )
             trace.append(step_dict)
         return trace
+
+
+class AsyncReActAgent(ReActAgent):
+    """
+    Asyncio-native ReAct agent.
+
+    Runs the same Thought → Action → Observation loop as ReActAgent, but LLM
+    calls go through agenerate() and tools through aexecute(), so a single
+    event loop can drive many concurrent research sessions::
+
+        agents = [AsyncReActAgent(llm, tool_manager) for _ in tasks]
+        answers = await asyncio.gather(*(a.run(t) for a, t in zip(agents, tasks)))
+
+    Each concurrent session needs its own agent instance (steps and the action
+    cache are per-run state); the LLM and ToolManager can be shared.
+    """
+
+    async def run(self, task: str, step_callback: Optional[StepCallback] = None) -> str:
+        """
+        Run the agent on a given task without blocking the event loop.
+
+        Args:
+            task: The task description
+            step_callback: Optional callable(iteration, step) called after each step
+
+        Returns:
+            The final answer string, with the same "⚠" conventions as ReActAgent.run.
+        """
+        self._start_run(task)
+
+        try:
+            for iteration in range(self.max_iterations):
+                if self._cancelled():
+                    return self._cancelled_answer()
+                logger.info(f"Iteration {iteration + 1}/{self.max_iterations}")
+
+                prefix, suffix = self._build_prompt_parts(task)
+                t0 = time.time()
+                response = await agenerate_with_prefix(self.llm, prefix, suffix)
+
+                step, final_answer = self._interpret_response(response, iteration + 1)
+                if step.batch and step.observation is None:
+                    self._merge_batch(step, await self._aexecute_batch(step.batch))
+                elif step.action and step.observation is None:
+                    step.observation = await self._aexecute_action(step.action, step.action_input)
+                self._record_step(step, t0, step_callback)
+
+                if final_answer:
+                    return final_answer
+
+                early_prompt = self._early_answer_prompt(task, step)
+                if early_prompt is not None:
+                    t0 = time.time()
+                    try:
+                        early = self._accept_early_answer(
+                            await agenerate_with(self.llm, early_prompt), iteration + 1, t0, step_callback
+                        )
+                    except Exception as e:
+                        logger.warning(f"Early answer failed: {e}")
+                        early = None
+                    if early:
+                        return early
+
+            logger.warning("Max iterations reached without final answer")
+            try:
+                best_effort = await agenerate_with(self.llm, self._best_effort_prompt(task))
+            except Exception:
+                best_effort = self._best_effort_fallback()
+            return self._max_iterations_answer(best_effort)
+
+        except Exception as e:
+            return self._error_answer(e)
+
+    async def _aexecute_action(self, action: str, action_input: Dict[str, Any]) -> str:
+        """Async counterpart of _execute_action, sharing its per-run cache."""
+        cache_key = self._cache_key(action, action_input)
+
+        if cache_key in self._action_cache:
+            logger.info(f"Cache hit for action '{action}' — returning cached result")
+            return self._action_cache[cache_key]
+
+        try:
+            if self.observations is not None:
+                result = await self.observations.arun(
+                    cache_key, action, lambda: self.tool_manager.aexecute_tool(action, **action_input)
+                )
+            else:
+                result = await self.tool_manager.aexecute_tool(action, **action_input)
+            self._action_cache[cache_key] = result
+            return result
+        except Exception as e:
+            logger.error(f"Error executing action {action}: {str(e)}")
+            return f"Error executing action: {str(e)}"
+
+    async def _aexecute_batch(self, batch: List[Dict[str, Any]]) -> List[str]:
+        """Async counterpart of _execute_batch — the calls are gathered on the event loop."""
+        async def run(call: Dict[str, Any]) -> str:
+            if "observation" in call:
+                return call["observation"]
+            return await self._aexecute_action(call["action"], call["action_input"])
+
+        return list(await asyncio.gather(*(run(call) for call in batch)))
@@ -0,0 +1,290 @@
+"""
+Multi-process batch execution for task files.
+
+main.py and the CLI's task-file mode used to run every task through one
+ReActAgent, one after another.  run_batch() shards the tasks across a
+process pool instead: each worker process builds its own agent and tool
+stack once (via agent_factory) and then takes tasks from the pool's queue.
+
+All workers draw on one rate-limit budget per provider.  The parent starts
+a RateLimitManager holding a RateLimiter for each provider and every worker
+installs proxies to them with use_shared_limiters(), so requests/min,
+tokens/min and in-flight caps hold for the whole pool rather than for each
+process separately.
+
+Results are handed to on_result as each task finishes (in completion order),
+so callers can write them out incrementally.
+
+Passing a JobCheckpoint makes the run resumable: every finished task is
+appended to the job's JSONL file (~/.webresearch/jobs/<job id>.jsonl) as one
+record with its answer, trace and timings, and a later run with the same job
+id skips the tasks already recorded there.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .ratelimit import RateLimit, RateLimitManager, SharedRateLimiter, use_shared_limiters
+
+logger = logging.getLogger(__name__)
+
+ResultCallback = Callable[[int, Dict[str, Any]], None]
+
+# The agent built by _init_worker, reused for every task in this worker process
+_worker_agent = None
+
+# ReActAgent.run catches its own errors and returns them as an answer with
+# this prefix (see ReActAgent._error_answer)
+_ERROR_ANSWER_PREFIX = "⚠ Error:"
+
+
+def _jobs_dir() -> Path:
+    return Path.home() / ".webresearch" / "jobs"
+
+
+def _task_hash(task: str) -> str:
+    return hashlib.sha256(task.encode("utf-8")).hexdigest()[:16]
+
+
+def job_id_for(task_file: str, tasks: List[str]) -> str:
+    """Default job id: the task file's name plus a hash of its tasks, so an edited file starts a new job."""
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", Path(task_file).stem) or "tasks"
+    digest = hashlib.sha256("\x00".join(tasks).encode("utf-8")).hexdigest()[:8]
+    return f"{stem}-{digest}"
+
+
+class JobCheckpoint:
+    """
+    Append-only JSONL record of a batch job's finished tasks.
+
+    Each line is one task's result plus its index and a hash of its text, so
+    a resumed run only skips a task if the same text sits at the same index.
+    Failed tasks are recorded too but are not treated as done — a re-run
+    retries them.  A task failed if the agent raised or answered with
+    "⚠ Error:" (provider, quota or network failure).  A "⚠ Max iterations"
+    answer counts as done: the agent finished with its best-effort answer,
+    and a re-run would spend the same budget to reach the same limit.  Only
+    the parent process writes, one line per task, flushed and fsynced before
+    the next result is accepted.
+
+    Args:
+        job_id: Identifies the job across runs.
+        directory: Where the .jsonl file lives (defaults to ~/.webresearch/jobs).
+    """
+
+    def __init__(self, job_id: str, directory: Optional[Path] = None):
+        self.job_id = job_id
+        self.path = Path(directory or _jobs_dir()) / f"{job_id}.jsonl"
+
+    def completed(self, tasks: List[str]) -> Dict[int, Dict[str, Any]]:
+        """Successful records from earlier runs that still match tasks, keyed by index."""
+        done: Dict[int, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    index = record["index"]
+                except (ValueError, KeyError, TypeError):
+                    continue   # torn last line from a crash
+                if not (0 <= index < len(tasks)) or record.get("task_hash") != _task_hash(tasks[index]):
+                    continue
+                if record.get("error") or str(record.get("answer", "")).startswith(_ERROR_ANSWER_PREFIX):
+                    done.pop(index, None)
+                else:
+                    done[index] = record
+        return done
+
+    def append(self, index: int, result: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._repair_tail()
+        record = {"job_id": self.job_id, "index": index, "task_hash": _task_hash(result["task"]), **result}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        """Forget every recorded task (start the job over)."""
+        if self.path.exists():
+            self.path.unlink()
+
+    def _repair_tail(self) -> None:
+        # A crash mid-write leaves a line without its newline; cut it off so
+        # the next record starts on a line of its own.
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def run_task(agent, task: str) -> Dict[str, Any]:
+    """
+    Run one task and return its result record.
+
+    Errors are caught and recorded so one bad task doesn't stop the batch.
+    An error the agent returned as its answer ("⚠ Error: …") is recorded
+    under "error" as well, so a resumed job retries the task.
+    """
+    start_time = datetime.now()
+
+    def _timings() -> Dict[str, Any]:
+        end_time = datetime.now()
+        return {
+            "execution_time": (end_time - start_time).total_seconds(),
+            "started_at": start_time.isoformat(timespec="seconds"),
+            "finished_at": end_time.isoformat(timespec="seconds"),
+        }
+
+    try:
+        answer = agent.run(task)
+        trace = agent.get_execution_trace()
+        result = {
+            "task": task,
+            "answer": answer,
+            **_timings(),
+            "num_steps": len(trace),
+            "trace": trace,
+        }
+        if isinstance(answer, str) and answer.startswith(_ERROR_ANSWER_PREFIX):
+            result["error"] = answer[len(_ERROR_ANSWER_PREFIX):].strip()
+        return result
+    except Exception as e:
+        logger.error(f"Error processing task: {str(e)}", exc_info=True)
+        return {
+            "task": task,
+            "answer": "Error occurred during processing",
+            "error": str(e),
+            **_timings(),
+            "num_steps": 0,
+        }
+
+
+def _init_worker(agent_factory: Callable[[], Any], shared: Dict[str, Any], limits: Dict[str, RateLimit]) -> None:
+    global _worker_agent
+    if shared:
+        use_shared_limiters({
+            provider: SharedRateLimiter(proxy, limits.get(provider), name=provider)
+            for provider, proxy in shared.items()
+        })
+    _worker_agent = agent_factory()
+
+
+def _run_in_worker(task: str) -> Dict[str, Any]:
+    return run_task(_worker_agent, task)
+
+
+def run_batch(
+    tasks: List[str],
+    agent_factory: Callable[[], Any],
+    workers: int = 1,
+    on_result: Optional[ResultCallback] = None,
+    rate_limits: Optional[Dict[str, RateLimit]] = None,
+    checkpoint: Optional[JobCheckpoint] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run tasks across a pool of worker processes.
+
+    Args:
+        tasks: Task strings, e.g. from main.read_tasks().
+        agent_factory: Picklable zero-argument callable (a module-level
+                       function or functools.partial of one) that builds a
+                       fresh agent.  Called once per worker process.
+        workers: Number of worker processes.  1 runs the tasks in this
+                 process with a single agent, in order.
+        on_result: Optional callable(index, result) invoked in this process
+                   as each task finishes; index is the task's 0-based
+                   position in tasks.
+        rate_limits: Provider budgets to share across the pool, keyed by
+                     provider preset (see ratelimit.rate_limits_for).  None
+                     leaves each worker with its own limiters.
+        checkpoint: Record finished tasks here and skip those it already
+                    holds.  Skipped tasks are still passed to on_result
+                    first, in order, with result["resumed"] set.
+
+    Returns:
+        Result records in the same order as tasks.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+
+    def _finish(index: int, result: Dict[str, Any]) -> None:
+        if checkpoint is not None:
+            checkpoint.append(index, result)
+        results[index] = result
+        if on_result:
+            on_result(index, result)
+
+    pending = list(range(len(tasks)))
+    if checkpoint is not None:
+        done = checkpoint.completed(tasks)
+        if done:
+            logger.info(f"Resuming job {checkpoint.job_id}: {len(done)}/{len(tasks)} tasks already done")
+        for index in sorted(done):
+            results[index] = {**done[index], "resumed": True}
+            if on_result:
+                on_result(index, results[index])
+        pending = [i for i in pending if i not in done]
+    if not pending:
+        return results
+
+    if workers <= 1 or len(pending) <= 1:
+        agent = agent_factory()
+        for index in pending:
+            _finish(index, run_task(agent, tasks[index]))
+        return results
+
+    workers = min(workers, len(pending))
+    manager = None
+    shared: Dict[str, Any] = {}
+    if rate_limits:
+        manager = RateLimitManager()
+        manager.start()
+        shared = {provider: manager.RateLimiter(limit, provider) for provider, limit in rate_limits.items()}
+
+    logger.info(f"Running {len(pending)} tasks across {workers} worker processes")
+    try:
+        # spawn, not fork: the parent may already hold threads (HTTP pools, the manager's)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(agent_factory, shared, rate_limits or {}),
+        ) as pool:
+            futures = {pool.submit(_run_in_worker, tasks[index]): index for index in pending}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. agent_factory failed)
+                    result = {
+                        "task": tasks[index],
+                        "answer": "Error occurred during processing",
+                        "error": str(e),
+                        "execution_time": 0.0,
+                        "num_steps": 0,
+                    }
+                _finish(index, result)
+    finally:
+        if manager is not None:
+            manager.shutdown()
+
+    return results
@@ -20,6 +20,7 @@ import pyfiglet
 from rich.console import Console
 from rich.live import Live
 from rich.panel import Panel
+from rich.markup import escape
 from rich.prompt import Confirm, Prompt
 from rich.rule import Rule
 from rich.spinner import Spinner
@@ -243,7 +244,9 @@ class ResearchPanel:
         self.current_thought: Optional[str] = None
         self.current_action: Optional[str] = None
         self.current_action_input: Optional[Dict] = None
+        self.current_batch_size: int = 0
         self.current_obs_len: int = 0
+        self.answer_preview: str = ""
         self.done = False
         self._spinner = Spinner("arc", style=THEME)
 
@@ -252,8 +255,13 @@ class ResearchPanel:
         self.current_thought = step.thought
         self.current_action = step.action
         self.current_action_input = step.action_input
+        self.current_batch_size = len(getattr(step, "batch", None) or [])
         self.current_obs_len = len(step.observation or "")
 
+    def stream_answer(self, text: str) -> None:
+        """Show the Final Answer as the model writes it."""
+        self.answer_preview = text
+
     def _action_preview(self) -> str:
         if not self.current_action:
             return "—"
@@ -264,10 +272,14 @@ class ResearchPanel:
             inp.get("url") or inp.get("query") or inp.get("filename")
             or next(iter(inp.values()), None)
         )
+        more = (
+            f"  [dim]+{self.current_batch_size - 1} more in parallel[/dim]"
+            if self.current_batch_size > 1 else ""
+        )
         if preview and isinstance(preview, str):
             short = (preview[:50] + "…") if len(preview) > 50 else preview
-            return f"[bold yellow]{tool}[/bold yellow]  [dim]→[/dim]  {short}"
-        return f"[bold yellow]{tool}[/bold yellow]"
+            return f"[bold yellow]{tool}[/bold yellow]  [dim]→[/dim]  {short}{more}"
+        return f"[bold yellow]{tool}[/bold yellow]{more}"
 
     def __rich__(self) -> Panel:
         elapsed = time.time() - self.start_time
@@ -299,7 +311,12 @@ class ResearchPanel:
 
         grid.add_row("action", self._action_preview())
 
-        if self.current_obs_len:
+        if self.answer_preview and not self.done:
+            # Tail only — the full answer is printed once the run completes
+            tail = self.answer_preview.strip().replace("\n", " ")
+            tail = ("…" + tail[-120:]) if len(tail) > 120 else tail
+            grid.add_row("answer", f"[white]{escape(tail)}[/white]")
+        elif self.current_obs_len:
             grid.add_row("status", f"[dim]received {self.current_obs_len:,} chars[/dim]")
         elif self.iteration > 0 and not self.done:
             grid.add_row("status", f"[dim {THEME}]running…[/dim {THEME}]")
@@ -772,18 +789,28 @@ def _print_usage_banner():
 def _build_tool_manager(cfg) -> "ToolManager":
     """Build a ToolManager with all available tools."""
     from webresearch.tools import (
-        ToolManager, SearchTool, ScrapeTool, BrowserScrapeTool,
+        ToolManager, SearchTool, MultiSearchTool, ScrapeTool, BrowserScrapeTool,
         CodeExecutorTool, FileOpsTool, playwright_available,
-        PDFExtractTool, pdf_available, ThinkTool,
+        PDFExtractTool, pdf_available, ThinkTool, build_fetch_cache,
+        build_http_pool, build_parse_pool, build_pdf_cache, build_search_cache,
     )
-    tool_manager = ToolManager()
+    tool_manager = ToolManager(http_pool=build_http_pool(cfg), parse_pool=build_parse_pool(cfg))
     tool_manager.register_tool(ThinkTool())
-    tool_manager.register_tool(SearchTool(cfg.serper_api_key))
-    tool_manager.register_tool(ScrapeTool())
+    search = SearchTool(cfg.serper_api_key, cache=build_search_cache(cfg))
+    tool_manager.register_tool(search)
+    tool_manager.register_tool(MultiSearchTool(search))
+    tool_manager.register_tool(ScrapeTool(
+        cache=build_fetch_cache(cfg),
+        parser=cfg.html_parser,
+        max_bytes=cfg.scrape_max_mb * 1024 * 1024,
+    ))
     if playwright_available():
         tool_manager.register_tool(BrowserScrapeTool())
     if pdf_available():
-        tool_manager.register_tool(PDFExtractTool())
+        tool_manager.register_tool(PDFExtractTool(
+            max_bytes=cfg.pdf_max_mb * 1024 * 1024,
+            cache=build_pdf_cache(cfg),
+        ))
     tool_manager.register_tool(CodeExecutorTool())
     tool_manager.register_tool(FileOpsTool())
     return tool_manager
@@ -802,6 +829,7 @@ def _build_llm_chain(cfg) -> "ModelFallbackChain":
     from webresearch.llm import LLMInterface
     from webresearch.llm_compat import OpenAICompatibleLLMInterface, openai_available, PROVIDERS
     from webresearch.llm_chain import ModelFallbackChain
+    from webresearch.ratelimit import rate_limit_for
 
     interfaces = []
 
@@ -810,6 +838,9 @@ def _build_llm_chain(cfg) -> "ModelFallbackChain":
         api_key=cfg.gemini_api_key,
         model_name=cfg.model_name,
         temperature=cfg.temperature,
+        context_cache=cfg.context_cache_enabled,
+        context_cache_ttl=cfg.context_cache_ttl,
+        rate_limit=rate_limit_for(cfg, "gemini"),
     )
     gemini.provider_name = f"Gemini ({cfg.model_name})"
     interfaces.append(gemini)
@@ -833,6 +864,7 @@ def _build_llm_chain(cfg) -> "ModelFallbackChain":
                 base_url=base_url,
                 provider_name=f"Groq ({model})",
                 temperature=cfg.temperature,
+                rate_limit=rate_limit_for(cfg, "groq"),
             ))
 
         # OpenRouter fallback
@@ -844,6 +876,7 @@ def _build_llm_chain(cfg) -> "ModelFallbackChain":
                 base_url=base_url,
                 provider_name=f"OpenRouter ({model})",
                 temperature=cfg.temperature,
+                rate_limit=rate_limit_for(cfg, "openrouter"),
             ))
 
         # Ollama fallback
@@ -855,6 +888,7 @@ def _build_llm_chain(cfg) -> "ModelFallbackChain":
                 base_url=cfg.ollama_base_url,
                 provider_name=f"Ollama ({model})",
                 temperature=cfg.temperature,
+                rate_limit=rate_limit_for(cfg, "ollama"),
             ))
 
     def _on_switch(from_name: str, to_name: str):
@@ -864,7 +898,15 @@ def _build_llm_chain(cfg) -> "ModelFallbackChain":
                 f"Switching to {to_name}...[/bold yellow]\n"
             )
 
-    chain = ModelFallbackChain(interfaces=interfaces, switch_callback=_on_switch)
+    chain = ModelFallbackChain(
+        interfaces=interfaces,
+        switch_callback=_on_switch,
+        hedge=cfg.llm_hedging,
+        hedge_percentile=cfg.llm_hedge_percentile,
+        breaker_cooldown=cfg.circuit_cooldown,
+        breaker_max_cooldown=cfg.circuit_max_cooldown,
+        slow_call_seconds=cfg.circuit_slow_call or None,
+    )
 
     if len(interfaces) > 1:
         names = " -> ".join(
@@ -888,6 +930,8 @@ def initialize_agent():
         tool_manager=_build_tool_manager(cfg),
         max_iterations=cfg.max_iterations,
         max_tool_output_length=cfg.max_tool_output_length,
+        context_budget=cfg.context_token_budget,
+        early_stop=cfg.early_stop,
     )
 
 
@@ -902,12 +946,26 @@ def initialize_parallel_agent():
         llm=_build_llm_chain(cfg),
         tool_manager=_build_tool_manager(cfg),
         sub_iterations=cfg.sub_iterations,
+        context_budget=cfg.context_token_budget,
+        incremental=cfg.deep_incremental,
+        deadline=cfg.deep_deadline,
+        max_depth=cfg.deep_max_depth,
+        iteration_budget=cfg.deep_iteration_budget,
+        early_stop=cfg.early_stop,
     )
 
 
 # ─── Execution trace persistence ─────────────────────────────────────────────
 
-def _save_trace(query: str, answer: str, trace: list, duration: float, mode: str = "query") -> None:
+def _save_trace(
+    query: str,
+    answer: str,
+    trace: list,
+    duration: float,
+    mode: str = "query",
+    fan_out: Optional[dict] = None,
+    saved_iterations: int = 0,
+) -> None:
     """Write the full step-by-step execution trace to logs/ as a timestamped JSON file."""
     try:
         logs_dir = Path.home() / ".webresearch" / "logs"
@@ -922,6 +980,10 @@ def _save_trace(query: str, answer: str, trace: list, duration: float, mode: str
             "steps": len(trace),
             "trace": trace,
         }
+        if fan_out:
+            payload["fan_out"] = fan_out
+        if saved_iterations:
+            payload["saved_iterations"] = saved_iterations
         with open(path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2, default=str)
     except Exception:
@@ -940,15 +1002,18 @@ def _extract_sources(trace: list) -> list:
     seen: set = set()
 
     for step in trace:
-        action = step.get("action", "")
-        action_input = step.get("action_input") or {}
+        calls = step.get("batch") or [
+            {"action": step.get("action", ""), "action_input": step.get("action_input")}
+        ]
 
         # Direct scrape targets are the most reliable sources
-        if action in ("scrape", "browser_scrape") and "url" in action_input:
-            url = action_input["url"]
-            if url not in seen:
-                seen.add(url)
-                urls.append(url)
+        for call in calls:
+            action_input = call.get("action_input") or {}
+            if call.get("action") in ("scrape", "browser_scrape") and "url" in action_input:
+                url = action_input["url"]
+                if url not in seen:
+                    seen.add(url)
+                    urls.append(url)
 
         # Mine URLs embedded in search / scrape observations
         obs = step.get("observation", "")
@@ -967,6 +1032,7 @@ def _print_result_block(
     trace: list,
     duration: float,
     n_steps: int,
+    saved_iterations: int = 0,
 ) -> None:
     """Render the editorial pull-quote result panel.
 
@@ -1015,6 +1081,8 @@ def _print_result_block(
     # ── Footer stats ────────────────────────────────────────────────────────
     step_word = "step" if n_steps == 1 else "steps"
     stats = [f"{duration:.1f}s", f"{n_steps} {step_word}"]
+    if saved_iterations:
+        stats.append(f"answered early, {saved_iterations} iterations saved")
     try:
         from webresearch.tools.search import get_monthly_usage, _MONTHLY_LIMIT
         count = get_monthly_usage()
@@ -1057,7 +1125,11 @@ def _run_query(query: str):
             panel.update(iteration, step)
             live.update(panel)
 
-        answer = agent.run(task, step_callback=step_callback)
+        def answer_callback(text: str):
+            panel.stream_answer(text)
+            live.update(panel)
+
+        answer = agent.run(task, step_callback=step_callback, answer_callback=answer_callback)
         panel.done = True
         live.update(panel)
 
@@ -1066,14 +1138,14 @@ def _run_query(query: str):
     _session_queries += 1
     _session_steps += n_steps
 
-    _print_result_block(query, answer, agent.get_execution_trace(), duration, n_steps)
+    _print_result_block(query, answer, agent.get_execution_trace(), duration, n_steps, agent.saved_iterations)
 
     if not answer.startswith("⚠"):
         console.print(f"  [dim italic]{random.choice(_DONE_FALLBACK)}[/dim italic]")
         console.print()
 
     # Save execution trace to logs/ for post-run debugging
-    _save_trace(query, answer, agent.get_execution_trace(), duration)
+    _save_trace(query, answer, agent.get_execution_trace(), duration, saved_iterations=agent.saved_iterations)
 
     # Save to session memory and persistent history
     # Don't persist error or incomplete answers — they'd poison future queries
@@ -1121,8 +1193,10 @@ def _run_deep_research(query: str):
         for idx in sorted(sub_status):
             s = sub_status[idx]
             state = s["state"]
-            icons = {"pending": "○ pending", "running": "⟳ running", "done": "✓ done", "error": "✗ error"}
-            styles = {"pending": "dim", "running": "bold cyan", "done": "bold green", "error": "bold red"}
+            icons = {"pending": "○ pending", "running": "⟳ running", "done": "✓ done", "error": "✗ error",
+                     "cancelled": "⊘ cancelled"}
+            styles = {"pending": "dim", "running": "bold cyan", "done": "bold green", "error": "bold red",
+                      "cancelled": "yellow"}
             t.add_row(
                 str(idx + 1),
                 s.get("question", "…")[:70],
@@ -1147,9 +1221,12 @@ def _run_deep_research(query: str):
     duration = (datetime.now() - start_time).total_seconds()
     n_sub = len(sub_status)
 
-    _print_result_block(query, answer, agent.get_execution_trace(), duration, n_sub)
+    _print_result_block(
+        query, answer, agent.get_execution_trace(), duration, n_sub,
+        agent.get_fan_out().get("iterations_saved", 0),
+    )
 
-    _save_trace(query, answer, agent.get_execution_trace(), duration, mode="deep")
+    _save_trace(query, answer, agent.get_execution_trace(), duration, mode="deep", fan_out=agent.get_fan_out())
     if not answer.startswith("⚠"):
         _session.add(query, answer)
     save_to_history(query, answer, n_sub, duration)
@@ -1281,41 +1358,52 @@ def run_tasks_from_file():
         return tasks
 
     try:
+        from webresearch.batch import JobCheckpoint, job_id_for, run_batch
+        from webresearch.config import Config
+        from webresearch.main import write_result, write_results_header
+        from webresearch.ratelimit import rate_limits_for
+
+        cfg = Config()
+        cfg.validate()
         tasks = read_tasks(filepath)
-        agent = initialize_agent()
-        results = []
-
-        for i, task in enumerate(tasks, 1):
-            console.print(f"[{THEME}][Task {i}/{len(tasks)}][/{THEME}] {task[:60]}…")
-            start_time = datetime.now()
-            try:
-                answer = agent.run(task)
-                duration = (datetime.now() - start_time).total_seconds()
-                results.append({
-                    "task": task,
-                    "answer": answer,
-                    "execution_time": round(duration, 2),
-                    "num_steps": len(agent.get_execution_trace()),
-                })
-                console.print(f"[green]✓ Completed in {duration:.2f}s[/green]\n")
-            except Exception as e:
-                console.print(f"[red]✗ Error: {str(e)}[/red]\n")
-                results.append({"task": task, "answer": "Error during processing", "error": str(e)})
+        checkpoint = JobCheckpoint(job_id_for(filepath, tasks))
+        done = len(checkpoint.completed(tasks))
+        if done and not Confirm.ask(
+            f"[yellow]{done}/{len(tasks)} tasks already finished in an earlier run. Resume?[/yellow]",
+            default=True,
+        ):
+            checkpoint.clear()
+        if cfg.batch_workers > 1:
+            console.print(f"[dim]Running across {cfg.batch_workers} worker processes[/dim]\n")
 
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write("=" * 100 + "\nWEB RESEARCH AGENT RESULTS\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 100 + "\n\n")
-            for i, result in enumerate(results, 1):
-                f.write(f"\n{'=' * 100}\nTASK {i}\n{'=' * 100}\n\n")
-                f.write(f"TASK DESCRIPTION:\n{result['task']}\n\n{'-' * 100}\n\n")
-                f.write(f"ANSWER:\n{result['answer']}\n\n")
+            write_results_header(f)
+
+            def _on_result(index: int, result: dict) -> None:
+                i = index + 1
+                if result.get("resumed"):
+                    write_result(f, i, result)
+                    return
+                console.print(f"[{THEME}][Task {i}/{len(tasks)}][/{THEME}] {result['task'][:60]}…")
                 if result.get("error"):
-                    f.write(f"ERROR: {result['error']}\n\n")
-                f.write(f"Execution time: {result.get('execution_time', 'N/A')} seconds\n")
-                f.write(f"Number of steps: {result.get('num_steps', 'N/A')}\n")
+                    console.print(f"[red]✗ Error: {result['error']}[/red]\n")
+                else:
+                    console.print(f"[green]✓ Completed in {result['execution_time']:.2f}s[/green]\n")
+                result["execution_time"] = round(result["execution_time"], 2)
+                write_result(f, i, result)
+                f.flush()
+
+            run_batch(
+                tasks,
+                initialize_agent,
+                workers=cfg.batch_workers,
+                on_result=_on_result,
+                rate_limits=rate_limits_for(cfg),
+                checkpoint=checkpoint,
+            )
 
-        console.print(f"[green]✓ All tasks completed! Results saved to {output_file}[/green]\n")
+        console.print(f"[green]✓ All tasks completed! Results saved to {output_file}[/green]")
+        console.print(f"[dim]JSONL checkpoint: {checkpoint.path}[/dim]\n")
         _print_usage_banner()
 
     except Exception as e:
@@ -24,12 +24,33 @@ class Config:
         # Agent settings (env var or package default — never persisted to keyring)
         self.max_iterations: int = int(os.getenv("MAX_ITERATIONS", "15"))
         self.sub_iterations: int = int(os.getenv("SUB_ITERATIONS", "8"))
+        # Deep research: fold sub-results into the answer as they arrive, and
+        # cancel sub-agents still running after DEEP_RESEARCH_DEADLINE seconds (0 = none)
+        self.deep_incremental: bool = (
+            os.getenv("DEEP_RESEARCH_INCREMENTAL", "false").lower() == "true"
+        )
+        self.deep_deadline: float = float(os.getenv("DEEP_RESEARCH_DEADLINE", "0"))
+        # Recursive decomposition depth (1 = flat) and ReAct iterations for the
+        # whole tree (0 = 4 sub-questions × SUB_ITERATIONS)
+        self.deep_max_depth: int = int(os.getenv("DEEP_RESEARCH_MAX_DEPTH", "1"))
+        self.deep_iteration_budget: int = int(os.getenv("DEEP_RESEARCH_ITERATION_BUDGET", "0"))
         self.max_tool_output_length: int = int(
             os.getenv("MAX_TOOL_OUTPUT_LENGTH", "3000")
         )
+        # Answer as soon as a search's answer box settles a simple question
+        self.early_stop: bool = os.getenv("EARLY_STOP", "true").lower() == "true"
+        # Estimated-token budget for each ReAct prompt (capped by the model's window)
+        self.context_token_budget: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "32000"))
         self.temperature: float = float(os.getenv("TEMPERATURE", "0.1"))
         self.model_name: str = os.getenv("MODEL_NAME", "gemini-2.5-flash")
 
+        # Provider-side caching of the stable prompt prefix (Gemini cached content).
+        # Off by default: Gemini bills cached-content storage for as long as it lives
+        self.context_cache_enabled: bool = (
+            os.getenv("CONTEXT_CACHE_ENABLED", "false").lower() == "true"
+        )
+        self.context_cache_ttl: int = int(os.getenv("CONTEXT_CACHE_TTL", "600"))
+
         # Logging / verbosity
         self.log_level: str = os.getenv("LOG_LEVEL", "WARNING").upper()
         self.quiet_fallback: bool = os.getenv("QUIET_FALLBACK", "false").lower() == "true"
@@ -40,6 +61,62 @@ class Config:
             os.getenv("CODE_EXECUTION_TIMEOUT", "60")
         )
 
+        # Persistent fetch cache for the scrape tool (~/.webresearch/cache/fetch)
+        self.fetch_cache_enabled: bool = (
+            os.getenv("FETCH_CACHE_ENABLED", "true").lower() == "true"
+        )
+        self.fetch_cache_ttl: int = int(os.getenv("FETCH_CACHE_TTL", "86400"))
+        self.fetch_cache_max_mb: int = int(os.getenv("FETCH_CACHE_MAX_MB", "256"))
+
+        # Download ceilings: scraped pages are cut off at SCRAPE_MAX_MB, larger
+        # PDFs are refused (0 = unlimited)
+        self.scrape_max_mb: int = int(os.getenv("SCRAPE_MAX_MB", "10"))
+        self.pdf_max_mb: int = int(os.getenv("PDF_MAX_MB", "50"))
+
+        # Per-page PDF text cache (~/.webresearch/cache/pdf); shares the fetch
+        # cache's enabled flag and TTL
+        self.pdf_cache_max_mb: int = int(os.getenv("PDF_CACHE_MAX_MB", "64"))
+
+        # Persistent search-result cache (~/.webresearch/cache/search), keyed by
+        # normalised query — hits don't count against the Serper monthly quota
+        self.search_cache_enabled: bool = (
+            os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+        )
+        self.search_cache_ttl: int = int(os.getenv("SEARCH_CACHE_TTL", "21600"))
+        self.search_cache_max_mb: int = int(os.getenv("SEARCH_CACHE_MAX_MB", "32"))
+
+        # Shared keep-alive HTTP session used by search / scrape / pdf_extract
+        self.http_pool_connections: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "20"))
+        self.http_pool_size: int = int(os.getenv("HTTP_POOL_SIZE", "10"))
+        self.http_max_retries: int = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+
+        # Per-provider LLM rate limits, e.g. "gemini=rpm:1000,inflight:8;groq=tpm:6000"
+        # (see webresearch/ratelimit.py for defaults)
+        self.rate_limits: str = os.getenv("RATE_LIMITS", "")
+
+        # Hedged LLM requests: race the next provider when the active one is slower
+        # than its own hedge-percentile latency.  Streamed calls (the ReAct loop
+        # streams by default) race on time to first chunk
+        self.llm_hedging: bool = os.getenv("LLM_HEDGING", "false").lower() == "true"
+        self.llm_hedge_percentile: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+
+        # Per-provider circuit breakers: seconds a tripped provider is skipped
+        # (doubling per failed probe, capped), and the latency that counts as a failure
+        self.circuit_cooldown: float = float(os.getenv("CIRCUIT_COOLDOWN", "30"))
+        self.circuit_max_cooldown: float = float(os.getenv("CIRCUIT_MAX_COOLDOWN", "600"))
+        self.circuit_slow_call: float = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "90"))
+
+        # Worker processes for task-file batches (main.py -j, CLI task-file mode)
+        self.batch_workers: int = int(os.getenv("BATCH_WORKERS", "1"))
+
+        # Worker processes for CPU-bound parsing in scrape / pdf_extract
+        # (0 = parse inline on the calling thread)
+        self.parse_workers: int = int(os.getenv("PARSE_WORKERS", "0"))
+        self.parse_max_pending: int = int(os.getenv("PARSE_MAX_PENDING", "0"))
+
+        # HTML extraction backend for scrape: auto | selectolax | lxml | bs4
+        self.html_parser: str = os.getenv("HTML_PARSER", "auto")
+
         # Fallback provider keys (all optional — chain degrades gracefully)
         self.groq_api_key: Optional[str] = get_credential("GROQ_API_KEY")
         self.openrouter_api_key: Optional[str] = get_credential("OPENROUTER_API_KEY")
@@ -0,0 +1,128 @@
+"""
+Token-budget context management for the ReAct prompt.
+
+The history section of the prompt used to be trimmed by a fixed step count,
+which neither bounds the real prompt size (one long scrape can dominate it)
+nor uses the room a large-context model offers.  ContextBudget instead
+estimates the token cost of every segment and fits as much history as the
+budget allows:
+
+  1. The fixed part — instructions, tool descriptions, task — is always kept.
+  2. Steps are taken newest-first in full detail while they fit.
+  3. Older steps fall back to one-line summaries while those fit.
+  4. Anything older is dropped and counted.
+
+If even the newest step does not fit, it is clipped rather than omitted,
+so the model always sees the result of its last action.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+# Conservative characters-per-token for mixed English prose, JSON and URLs.
+# Under-estimating is the failure that matters (context overflow), so this
+# sits below the ~4 chars/token typical of plain English.
+_CHARS_PER_TOKEN = 3.5
+
+# Allowance for the section headers the agent inserts between segments
+_HEADER_TOKENS = 32
+
+# Default prompt budget when neither the caller nor the model sets one
+DEFAULT_CONTEXT_TOKENS = 32000
+
+# Smallest slice the newest step is clipped to when the budget is exhausted
+_MIN_CLIP_TOKENS = 256
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, tokenizer-free upper-bound estimate of text's token count."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN) if text else 0
+
+
+def clip_to_tokens(text: str, tokens: int) -> str:
+    """Cut text to roughly `tokens` tokens, marking the cut."""
+    limit = int(tokens * _CHARS_PER_TOKEN)
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "\n[... clipped to fit the context budget]"
+
+
+@dataclass
+class Segment:
+    """One history step rendered two ways, with its estimated token costs."""
+
+    summary: str
+    full: str
+    summary_tokens: int = field(init=False)
+    full_tokens: int = field(init=False)
+
+    def __post_init__(self):
+        self.summary_tokens = estimate_tokens(self.summary)
+        self.full_tokens = estimate_tokens(self.full)
+
+
+@dataclass
+class ContextPlan:
+    """How many of the oldest steps to drop / summarise / keep in full."""
+
+    dropped: int = 0
+    summarised: int = 0
+    full: int = 0
+    clip_tokens: Optional[int] = None  # newest step must be clipped to this size
+
+
+class ContextBudget:
+    """
+    Allocates a prompt token budget across fixed text and history segments.
+
+    Args:
+        max_tokens: Total prompt budget in estimated tokens.
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_CONTEXT_TOKENS):
+        self.max_tokens = max_tokens
+
+    @classmethod
+    def for_llm(cls, llm, max_tokens: Optional[int] = None) -> "ContextBudget":
+        """
+        Budget for llm: max_tokens (or the default), capped by the model's own
+        input window when the interface advertises one via `context_window`.
+        """
+        budget = max_tokens or DEFAULT_CONTEXT_TOKENS
+        window = getattr(llm, "context_window", None)
+        if isinstance(window, int) and window > 0:
+            budget = min(budget, window)
+        return cls(budget)
+
+    def plan(self, fixed_tokens: int, segments: Sequence[Segment]) -> ContextPlan:
+        """
+        Decide how much of segments (oldest first) fits beside fixed_tokens.
+
+        Walks newest → oldest, so the cost is proportional to what is kept,
+        not to the full history.
+        """
+        available = self.max_tokens - fixed_tokens - _HEADER_TOKENS
+        n = len(segments)
+        plan = ContextPlan()
+        i = n - 1
+
+        while i >= 0 and segments[i].full_tokens <= available:
+            available -= segments[i].full_tokens
+            plan.full += 1
+            i -= 1
+
+        if plan.full == 0 and n:
+            # The newest observation alone overflows — keep a clipped copy
+            plan.full = 1
+            plan.clip_tokens = max(_MIN_CLIP_TOKENS, available)
+            available -= plan.clip_tokens
+            i -= 1
+
+        while i >= 0 and segments[i].summary_tokens <= available:
+            available -= segments[i].summary_tokens
+            plan.summarised += 1
+            i -= 1
+
+        plan.dropped = i + 1
+        return plan
@@ -0,0 +1,147 @@
+"""
+Adaptive fan-out for ParallelResearchAgent.
+
+How many sub-questions a deep-research run fans out to, and how many
+sub-agents run at once, used to be fixed constructor arguments
+(max_sub_queries=4, max_workers=3) whatever the question or the quota.
+A FanOutController now treats both as upper bounds and decides from what
+the run can observe:
+
+  width    the planner is asked for *up to* max_sub_queries sub-questions
+           and returns fewer for a narrow question; the count is halved when
+           the active provider is already answering with 429s
+  workers  starts at max_workers, capped by what the provider's quota can
+           keep busy (its in-flight cap and requests/min at the measured
+           median latency).  After each finished sub-question the pool
+           shrinks by one when the throttled-call rate or median latency has
+           risen, and grows by one again once both are back to normal
+
+Signals come from ModelFallbackChain.current_health(); with any other LLM
+the controller has nothing to go on and keeps the configured bounds.  Every
+decision and the signals behind it are kept in `decisions`, which
+ParallelResearchAgent saves with its execution trace.
+"""
+
+import logging
+import math
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from .llm_chain import ModelFallbackChain
+from .ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Sub-agents spend part of each iteration in tools, so about two of them
+# keep one LLM slot busy
+_AGENTS_PER_LLM_SLOT = 2
+
+
+@dataclass
+class FanOutSignals:
+    """What the active provider looks like right now.  None means unknown."""
+
+    p50: Optional[float] = None             # median LLM latency, seconds
+    throttle_rate: Optional[float] = None   # share of recent calls answered 429
+    rpm: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+    @classmethod
+    def from_llm(cls, llm) -> "FanOutSignals":
+        if isinstance(llm, ModelFallbackChain):
+            h = llm.current_health()
+            return cls(h["p50"], h["throttle_rate"], h["rpm"], h["max_in_flight"])
+        limiter = getattr(llm, "rate_limiter", None)
+        if isinstance(limiter, RateLimiter):
+            return cls(rpm=limiter.limit.rpm, max_in_flight=limiter.limit.max_in_flight)
+        return cls()
+
+
+class FanOutController:
+    """
+    Chooses a run's fan-out width and resizes its worker pool as it goes.
+
+    Args:
+        llm: The run's LLM; signals are read from it on every decision.
+        max_sub_queries: Upper bound on the width.
+        max_workers: Upper bound on concurrent sub-agents.
+        min_workers: Lower bound on concurrent sub-agents.
+    """
+
+    THROTTLED = 0.2     # throttled-call rate that halves the width / shrinks the pool
+    CALM = 0.05         # rate at or below which the pool may grow again
+    SLOWDOWN = 1.5      # median latency over the run's starting median that counts as saturation
+
+    def __init__(self, llm, max_sub_queries: int = 4, max_workers: int = 3, min_workers: int = 1):
+        self.llm = llm
+        self.max_sub_queries = max(1, max_sub_queries)
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.decisions: List[Dict] = []
+        self._baseline_p50: Optional[float] = None
+
+    def width(self, planned: int) -> int:
+        """Number of the planner's sub-questions to research."""
+        s = self._signals()
+        width = max(1, min(planned, self.max_sub_queries))
+        reason = f"planner returned {planned}"
+        if planned > self.max_sub_queries:
+            reason += f", capped at {self.max_sub_queries}"
+        if s.throttle_rate is not None and s.throttle_rate >= self.THROTTLED and width > 2:
+            width = max(2, (width + 1) // 2)
+            reason += f"; halved, {s.throttle_rate:.0%} of recent LLM calls throttled"
+        self._decide("width", width, reason, s)
+        return width
+
+    def initial_workers(self, width: int) -> int:
+        """Pool size to start the run with."""
+        s = self._signals()
+        self._baseline_p50 = s.p50
+        cap = self._cap(s)
+        workers = max(self.min_workers, min(cap, width))
+        reason = f"min(quota cap {cap}, width {width})"
+        if s.throttle_rate is not None and s.throttle_rate >= self.THROTTLED:
+            workers = self.min_workers
+            reason = f"{s.throttle_rate:.0%} of recent LLM calls throttled"
+        self._decide("workers", workers, reason, s)
+        return workers
+
+    def adjust(self, workers: int) -> int:
+        """Pool size after a sub-question finished: shrink under pressure, grow with headroom."""
+        s = self._signals()
+        if self._baseline_p50 is None:
+            self._baseline_p50 = s.p50
+        target, reason = workers, ""
+        if s.throttle_rate is not None and s.throttle_rate >= self.THROTTLED:
+            target = workers - 1
+            reason = f"{s.throttle_rate:.0%} of recent LLM calls throttled"
+        elif s.p50 and self._baseline_p50 and s.p50 > self._baseline_p50 * self.SLOWDOWN:
+            target = workers - 1
+            reason = f"median LLM latency up from {self._baseline_p50:.1f}s to {s.p50:.1f}s"
+        elif s.throttle_rate is None or s.throttle_rate <= self.CALM:
+            target = workers + 1
+            reason = "no throttling"
+        target = max(self.min_workers, min(self._cap(s), target))
+        if target != workers:
+            self._decide("workers", target, reason, s)
+        return target
+
+    def _cap(self, s: FanOutSignals) -> int:
+        cap = self.max_workers
+        if s.max_in_flight:
+            cap = min(cap, s.max_in_flight * _AGENTS_PER_LLM_SLOT)
+        if s.rpm and s.p50:
+            # A busy sub-agent asks for about 60 / p50 calls a minute
+            cap = min(cap, math.floor(s.rpm * s.p50 / 60 * _AGENTS_PER_LLM_SLOT))
+        return max(self.min_workers, cap)
+
+    def _signals(self) -> FanOutSignals:
+        try:
+            return FanOutSignals.from_llm(self.llm)
+        except Exception as e:
+            logger.debug(f"Fan-out signals unavailable: {e}")
+            return FanOutSignals()
+
+    def _decide(self, kind: str, value: int, reason: str, s: FanOutSignals) -> None:
+        logger.info(f"Fan-out {kind} = {value} ({reason})")
+        self.decisions.append({"decision": kind, "value": value, "reason": reason, "signals": asdict(s)})
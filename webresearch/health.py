@@ -0,0 +1,313 @@
+"""
+Provider health metrics for ModelFallbackChain.
+
+LatencyHistogram keeps a bounded, log-bucketed record of how long each
+provider takes to answer, so the chain can ask "what is this provider's
+p95 right now?" in O(buckets) without storing every sample.
+
+RollingRate tracks what fraction of a provider's recent calls were
+throttled (429 / quota errors); ParallelResearchAgent sizes its fan-out
+from it.
+
+CircuitBreaker tracks each provider's recent outcomes and stops sending it
+traffic while it is unhealthy:
+
+  closed     normal operation; outcomes go into a rolling time window
+  open       error (or slow-call) rate crossed the threshold, or a quota
+             error tripped it — calls are refused until the cool-down ends
+  half-open  cool-down over; exactly one probe call is let through.
+             Success closes the circuit, failure re-opens it with the
+             cool-down doubled (up to max_cooldown)
+
+allow() hands each admitted call a Permit, which the caller passes back
+with the call's outcome.  Only the probe's permit can close or re-open a
+circuit that is not closed; results of calls admitted before the circuit
+last changed state (e.g. the rest of a parallel 429 burst arriving after
+the first one tripped it) are ignored.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Bucket upper bounds in seconds: 0.1s … ~10 min, each 25% wider than the last
+_BUCKET_BOUNDS: List[float] = []
+_b = 0.1
+while _b < 600:
+    _BUCKET_BOUNDS.append(round(_b, 3))
+    _b *= 1.25
+del _b
+
+
+class LatencyHistogram:
+    """
+    Thread-safe latency histogram with exponential forgetting.
+
+    Once max_samples have been recorded every bucket is halved, so the
+    distribution tracks the provider's recent behaviour rather than its
+    lifetime average.
+
+    Args:
+        max_samples: Sample count that triggers halving.
+    """
+
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self._counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    def record(self, seconds: float) -> None:
+        idx = bisect.bisect_left(_BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self._counts[idx] += 1
+            self._total += 1
+            if self._total >= self.max_samples:
+                self._counts = [c // 2 for c in self._counts]
+                self._total = sum(self._counts)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound (seconds) of the bucket holding the p-th quantile, 0 < p <= 1."""
+        with self._lock:
+            if not self._total:
+                return None
+            rank = p * self._total
+            seen = 0
+            for idx, c in enumerate(self._counts):
+                seen += c
+                if seen >= rank:
+                    return _BUCKET_BOUNDS[idx] if idx < len(_BUCKET_BOUNDS) else float("inf")
+        return float("inf")
+
+
+class RollingRate:
+    """
+    Fraction of recent calls that hit some condition (e.g. were throttled),
+    over a sliding time window.
+
+    Args:
+        window_seconds: Only calls this recent count toward the rate.
+    """
+
+    def __init__(self, window_seconds: float = 120.0):
+        self.window_seconds = window_seconds
+        self._events: Deque[Tuple[float, bool]] = deque()   # (timestamp, hit)
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._events.append((now, hit))
+            self._prune(now)
+
+    def rate(self) -> Optional[float]:
+        """Hit fraction (0–1) in the window, or None when no calls were recorded."""
+        with self._lock:
+            self._prune(time.monotonic())
+            if not self._events:
+                return None
+            return sum(hit for _, hit in self._events) / len(self._events)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+
+
+@dataclass(frozen=True)
+class Permit:
+    """One call admitted by CircuitBreaker.allow(); hand it back with the call's outcome."""
+
+    epoch: int              # the breaker's state change the call was admitted under
+    probe: bool = False     # the half-open probe
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker with a rolling error-rate and latency window.
+
+    Args:
+        name: Provider name, for logging.
+        window_seconds: Only outcomes this recent count toward the rates.
+        min_calls: Outcomes required in the window before the rate can trip it.
+        error_threshold: Failure fraction (0–1) that opens the circuit.
+        slow_call_seconds: Successful calls slower than this count as failures
+                           for the rate (None disables latency-based tripping).
+        cooldown: First open period in seconds.
+        max_cooldown: Cap for the exponentially growing open period.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        window_seconds: float = 120.0,
+        min_calls: int = 4,
+        error_threshold: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        cooldown: float = 30.0,
+        max_cooldown: float = 600.0,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()   # (timestamp, failed)
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._epoch = 0     # bumped whenever the circuit opens or closes
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._open_until:
+                return HALF_OPEN
+            return self._state
+
+    @property
+    def retry_at(self) -> float:
+        """Monotonic time at which an open circuit will accept a probe."""
+        return self._open_until if self._state != CLOSED else 0.0
+
+    def allow(self, force: bool = False) -> Optional[Permit]:
+        """
+        Return a Permit if a call may go to this provider now, else None.
+        In half-open state this claims the single probe slot, so every
+        probe permit must be followed by record_success / record_failure /
+        trip / release.
+
+        force admits a call to an open circuit before its cool-down ends
+        (every provider is open); it becomes the probe if none is in flight.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return Permit(self._epoch)
+            if self._state == OPEN:
+                if time.monotonic() < self._open_until and not force:
+                    return None
+                self._state = HALF_OPEN
+                logger.info(f"[{self.name}] circuit half-open — sending probe")
+            if self._probe_in_flight:
+                # A forced extra call runs, but its outcome is not the probe's
+                return Permit(self._epoch) if force else None
+            self._probe_in_flight = True
+            return Permit(self._epoch, probe=True)
+
+    def record_success(self, latency: Optional[float] = None, permit: Optional[Permit] = None) -> None:
+        slow = (
+            self.slow_call_seconds is not None
+            and latency is not None
+            and latency > self.slow_call_seconds
+        )
+        with self._lock:
+            if self._state != CLOSED:
+                if not self._is_probe(permit):
+                    return
+                if slow:
+                    self._open(min(self._cooldown * 2, self.max_cooldown))
+                else:
+                    logger.info(f"[{self.name}] probe succeeded — circuit closed")
+                    self._close()
+                return
+            if self._is_current(permit):
+                self._add(slow)
+
+    def record_failure(self, permit: Optional[Permit] = None) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                if self._is_probe(permit):
+                    # Probe failed — back off harder
+                    self._open(min(self._cooldown * 2, self.max_cooldown))
+                return
+            if self._is_current(permit):
+                self._add(True)
+
+    def trip(self, permit: Optional[Permit] = None) -> None:
+        """Open immediately — for definitive errors such as an exhausted quota."""
+        with self._lock:
+            if self._state != CLOSED:
+                if self._is_probe(permit):
+                    self._open(min(self._cooldown * 2, self.max_cooldown))
+                return
+            if self._is_current(permit):
+                self._open(self._cooldown)
+
+    def release(self, permit: Optional[Permit] = None) -> None:
+        """Give back a claimed probe whose call never completed (e.g. cancelled)."""
+        with self._lock:
+            if permit is None or self._is_probe(permit):
+                self._probe_in_flight = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._close()
+            self._open_until = 0.0
+
+    def health(self) -> float:
+        """0 (open) … 1 (no recent failures or slow calls)."""
+        with self._lock:
+            if self._state != CLOSED:
+                return 0.0
+            self._prune(time.monotonic())
+            if not self._outcomes:
+                return 1.0
+            return 1.0 - sum(failed for _, failed in self._outcomes) / len(self._outcomes)
+
+    # Callers below hold _lock
+
+    def _is_probe(self, permit: Optional[Permit]) -> bool:
+        return permit is not None and permit.probe and permit.epoch == self._epoch
+
+    def _is_current(self, permit: Optional[Permit]) -> bool:
+        # Calls without a permit are counted as admitted under the current state
+        return permit is None or permit.epoch == self._epoch
+
+    def _add(self, failed: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        self._prune(now)
+        if len(self._outcomes) >= self.min_calls:
+            rate = sum(f for _, f in self._outcomes) / len(self._outcomes)
+            if rate >= self.error_threshold:
+                self._open(self._cooldown)
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._epoch += 1
+        self._cooldown = self.base_cooldown
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def _open(self, cooldown: float) -> None:
+        self._state = OPEN
+        self._epoch += 1
+        self._cooldown = cooldown
+        self._open_until = time.monotonic() + cooldown
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        logger.warning(f"[{self.name}] circuit open for {cooldown:.0f}s")
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
@@ -3,14 +3,26 @@ LLM interface for interacting with Google Gemini models.
 Handles all communication with the Gemini API.
 """
 
+import asyncio
+import hashlib
 import re
+import threading
 import google.generativeai as genai
-from typing import Optional
+from datetime import timedelta
+from typing import Iterator, Optional, Union
 import time
 import logging
 
+from .ratelimit import RateLimit, RateLimiter
+
 logger = logging.getLogger(__name__)
 
+# CachedContent.create errors that will not go away by retrying
+_CONTEXT_UNSUPPORTED = ("not supported", "unsupported", "does not support", "permission denied", "403")
+_CONTEXT_TOO_SMALL = ("too small", "minimum", "min_total_token_count")
+# First back-off after a transient create failure (429, timeout, 5xx); doubles per failure
+_CONTEXT_RETRY_BASE = 30
+
 
 class LLMInterface:
     """Interface for interacting with Google Gemini models."""
@@ -20,6 +32,9 @@ class LLMInterface:
         api_key: str,
         model_name: str = "gemini-2.0-flash-exp",
         temperature: float = 0.1,
+        context_cache: bool = False,
+        context_cache_ttl: int = 600,
+        rate_limit: Optional[Union[RateLimit, RateLimiter]] = None,
     ):
         """
         Initialize the LLM interface.
@@ -28,6 +43,12 @@ class LLMInterface:
             api_key: Google Gemini API key
             model_name: Name of the Gemini model to use
             temperature: Temperature for response generation (0.0-1.0)
+            context_cache: Store the stable prompt prefix as Gemini cached
+                           content in generate_with_prefix().  Off by default:
+                           Gemini bills cached-content storage per hour
+            context_cache_ttl: Lifetime of each cached prefix in seconds
+            rate_limit: Request/token/concurrency budget used by ModelFallbackChain,
+                        or an existing RateLimiter to share
         """
         genai.configure(api_key=api_key)
         self.model_name = model_name
@@ -69,6 +90,25 @@ class LLMInterface:
             safety_settings=self.safety_settings,
         )
 
+        # Shared with ModelFallbackChain; 429 retry hints pause all callers via defer()
+        if isinstance(rate_limit, RateLimiter):
+            self.rate_limiter: Optional[RateLimiter] = rate_limit
+        else:
+            self.rate_limiter = RateLimiter(rate_limit, name=model_name) if rate_limit else None
+
+        # Input-token limit of the Gemini 2.x family; read by ContextBudget.for_llm
+        self.context_window = 1_048_576
+
+        # Cached-content models keyed by prefix hash: {key: (model, expires_at)}
+        self.context_cache = context_cache
+        self.context_cache_ttl = context_cache_ttl
+        self._context_models: dict = {}
+        self._context_lock = threading.Lock()
+        # Single-flight creation and per-prefix back-off after transient failures
+        self._context_pending: dict = {}
+        self._context_failures: dict = {}
+        self._context_retry_at: dict = {}
+
         logger.info(f"Initialized LLM interface with model: {model_name}")
 
     @staticmethod
@@ -122,29 +162,225 @@ class LLMInterface:
         for attempt in range(retry_count):
             try:
                 response = self.model.generate_content(prompt)
+                return self._response_text(response)
+            except Exception as e:
+                time.sleep(self._retry_delay(e, attempt, retry_count))
+
+    async def agenerate(self, prompt: str, retry_count: int = 3) -> str:
+        """
+        Async variant of generate() for AsyncReActAgent.
+
+        Uses the SDK's native coroutine so the event loop is never blocked
+        while waiting on the model; retries sleep with asyncio.sleep.
+        """
+        for attempt in range(retry_count):
+            try:
+                response = await self.model.generate_content_async(prompt)
+                return self._response_text(response)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, attempt, retry_count))
 
-                # Check if response was blocked
-                if not response.text:
-                    if hasattr(response, "prompt_feedback"):
-                        logger.warning(f"Response blocked: {response.prompt_feedback}")
-                    raise ValueError("Empty response from model")
+    def generate_with_prefix(self, prefix: str, suffix: str, retry_count: int = 3) -> str:
+        """
+        Generate a response for prefix + suffix, where prefix is identical across calls.
 
-                return response.text
+        The prefix is uploaded once as Gemini cached content (system instruction)
+        and only the suffix is sent per call, so the instruction block is neither
+        re-billed at the full rate nor re-processed before the first token.  Falls
+        back to generate(prefix + suffix) when caching is disabled or unsupported
+        (free tier, prefix below the model's minimum cacheable size, …).
+        """
+        model = self._context_model(prefix)
+        if model is None:
+            return self.generate(prefix + suffix, retry_count)
+        for attempt in range(retry_count):
+            try:
+                response = model.generate_content(suffix)
+                return self._response_text(response)
+            except Exception as e:
+                if self._is_context_cache_miss(e):
+                    self._drop_context_model(prefix)
+                    return self.generate(prefix + suffix, retry_count)
+                time.sleep(self._retry_delay(e, attempt, retry_count))
 
+    async def agenerate_with_prefix(self, prefix: str, suffix: str, retry_count: int = 3) -> str:
+        """Async variant of generate_with_prefix()."""
+        loop = asyncio.get_running_loop()
+        # Cache creation is a one-off blocking RPC; keep it off the event loop
+        model = await loop.run_in_executor(None, self._context_model, prefix)
+        if model is None:
+            return await self.agenerate(prefix + suffix, retry_count)
+        for attempt in range(retry_count):
+            try:
+                response = await model.generate_content_async(suffix)
+                return self._response_text(response)
             except Exception as e:
-                if self._is_daily_quota(e):
-                    # Daily quota cannot be resolved by waiting — fail immediately
-                    raise Exception(self._friendly_quota_message(e))
-
-                logger.warning(f"Attempt {attempt + 1}/{retry_count} failed: {str(e)}")
-                if attempt < retry_count - 1:
-                    delay = self._parse_retry_delay(e)
-                    if delay is None:
-                        delay = 2 ** (attempt + 1)
-                    logger.info(self._friendly_quota_message(e))
-                    time.sleep(delay)
-                else:
-                    raise Exception(
-                        f"Failed to generate response after {retry_count} attempts: {str(e)}"
-                    )
+                if self._is_context_cache_miss(e):
+                    self._drop_context_model(prefix)
+                    return await self.agenerate(prefix + suffix, retry_count)
+                await asyncio.sleep(self._retry_delay(e, attempt, retry_count))
+
+    def generate_stream(self, prompt: str, retry_count: int = 3) -> Iterator[str]:
+        """
+        Yield the response text chunk by chunk as Gemini produces it.
+
+        Retries only cover opening the stream.  Closing the generator early
+        (e.g. once a complete Action has arrived) stops reading and drops the
+        remainder of the generation.
+        """
+        return self._stream(self.model, prompt, retry_count)
+
+    def generate_stream_with_prefix(self, prefix: str, suffix: str, retry_count: int = 3) -> Iterator[str]:
+        """Streaming variant of generate_with_prefix()."""
+        model = self._context_model(prefix)
+        if model is not None:
+            try:
+                yield from self._stream(model, suffix, retry_count)
+                return
+            except Exception as e:
+                if not self._is_context_cache_miss(e):
+                    raise
+                self._drop_context_model(prefix)
+        yield from self._stream(self.model, prefix + suffix, retry_count)
+
+    def _stream(self, model, text: str, retry_count: int) -> Iterator[str]:
+        for attempt in range(retry_count):
+            try:
+                response = model.generate_content(text, stream=True)
+                chunks = iter(response)
+                first = next(chunks, None)
+                break
+            except Exception as e:
+                if self._is_context_cache_miss(e):
+                    raise
+                time.sleep(self._retry_delay(e, attempt, retry_count))
+        if first is None:
+            raise ValueError("Empty response from model")
+        yield self._chunk_text(first)
+        for chunk in chunks:
+            yield self._chunk_text(chunk)
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        # .text raises ValueError on chunks that carry no text part (safety / finish metadata)
+        try:
+            return chunk.text or ""
+        except ValueError:
+            return ""
+
+    @staticmethod
+    def _context_key(prefix: str) -> str:
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+    def _context_model(self, prefix: str):
+        """Return a GenerativeModel bound to cached content for prefix, or None to send it inline."""
+        if not self.context_cache:
+            return None
+        key = self._context_key(prefix)
+        now = time.time()
+        with self._context_lock:
+            entry = self._context_models.get(key)
+            # Renew a little before expiry so an in-flight call never hits a dead cache
+            if entry and entry[1] - now > 30:
+                return entry[0]
+            if now < self._context_retry_at.get(key, 0):
+                return None
+            pending = self._context_pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._context_pending[key] = threading.Event()
+            elif entry and entry[1] > now:
+                # Another thread is renewing; the old cache is still alive
+                return entry[0]
+        if not owner:
+            # Single-flight: wait for the thread creating this prefix's cache
+            pending.wait(timeout=60)
+            with self._context_lock:
+                entry = self._context_models.get(key)
+            return entry[0] if entry and entry[1] > time.time() else None
+        model = None
+        try:
+            # The create RPC runs outside the lock so other prefixes and
+            # cached-model lookups are not held up behind it
+            cached = genai.caching.CachedContent.create(
+                model=self.model_name,
+                display_name=f"webresearch-{key[:12]}",
+                system_instruction=prefix,
+                ttl=timedelta(seconds=self.context_cache_ttl),
+            )
+            model = genai.GenerativeModel.from_cached_content(
+                cached,
+                generation_config=self.generation_config,
+                safety_settings=self.safety_settings,
+            )
+        except Exception as e:
+            self._context_create_failed(key, e)
+        with self._context_lock:
+            if model is not None:
+                self._context_models[key] = (model, time.time() + self.context_cache_ttl)
+                self._context_failures.pop(key, None)
+                self._context_retry_at.pop(key, None)
+            self._context_pending.pop(key, None)
+        pending.set()
+        if model is not None:
+            logger.info(f"Cached {len(prefix)}-char prompt prefix for {self.model_name}")
+        return model
+
+    def _context_create_failed(self, key: str, error: Exception) -> None:
+        """Stop caching on a definitive refusal; back off and retry later on anything else."""
+        err = str(error).lower()
+        if any(s in err for s in _CONTEXT_UNSUPPORTED):
+            # Unsupported for this model/tier — don't pay a failed RPC every iteration
+            logger.info(f"Context caching unavailable for {self.model_name}, sending full prompts: {error}")
+            self.context_cache = False
+            return
+        with self._context_lock:
+            if any(s in err for s in _CONTEXT_TOO_SMALL):
+                # The prefix never changes, so it will never be large enough
+                logger.info(f"Prompt prefix too small to cache for {self.model_name}, sending it inline")
+                self._context_retry_at[key] = float("inf")
+                return
+            failures = self._context_failures.get(key, 0) + 1
+            self._context_failures[key] = failures
+            delay = min(self.context_cache_ttl, _CONTEXT_RETRY_BASE * 2 ** (failures - 1))
+            self._context_retry_at[key] = time.time() + delay
+        logger.warning(f"Context cache creation failed for {self.model_name}, retrying in {delay:.0f}s: {error}")
+
+    def _drop_context_model(self, prefix: str) -> None:
+        with self._context_lock:
+            self._context_models.pop(self._context_key(prefix), None)
+
+    @staticmethod
+    def _is_context_cache_miss(error: Exception) -> bool:
+        """True when the cached content behind a model has expired or been deleted server-side."""
+        err = str(error).lower()
+        return "cachedcontent" in err.replace(" ", "") and ("not found" in err or "404" in err or "expired" in err)
+
+    @staticmethod
+    def _response_text(response) -> str:
+        # Check if response was blocked
+        if not response.text:
+            if hasattr(response, "prompt_feedback"):
+                logger.warning(f"Response blocked: {response.prompt_feedback}")
+            raise ValueError("Empty response from model")
+        return response.text
+
+    def _retry_delay(self, e: Exception, attempt: int, retry_count: int) -> float:
+        """Return how long to wait before the next attempt, or raise if none remain."""
+        if self._is_daily_quota(e):
+            # Daily quota cannot be resolved by waiting — fail immediately
+            raise Exception(self._friendly_quota_message(e))
+
+        logger.warning(f"Attempt {attempt + 1}/{retry_count} failed: {str(e)}")
+        if attempt >= retry_count - 1:
+            raise Exception(
+                f"Failed to generate response after {retry_count} attempts: {str(e)}"
+            )
+        delay = self._parse_retry_delay(e)
+        if delay is None:
+            delay = 2 ** (attempt + 1)
+        elif self.rate_limiter:
+            self.rate_limiter.defer(delay)
+        logger.info(self._friendly_quota_message(e))
+        return delay
 
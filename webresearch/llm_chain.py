@@ -4,6 +4,14 @@ Model fallback chain.
 Wraps an ordered list of LLM interfaces (Gemini, Groq, OpenRouter, Ollama, …)
 and tries each in turn when the active provider hits a quota or rate-limit error.
 
+Each provider has a CircuitBreaker (see health.py).  A quota error opens the
+provider's circuit at once; transient errors and slow calls open it once they
+make up too much of its recent traffic.  An open provider is skipped until its
+cool-down ends, then a single probe call decides whether traffic returns to it
+or the cool-down doubles.  Calls always go to the first provider in the chain
+whose circuit admits them, so the primary is used again as soon as it is
+healthy rather than after a fixed delay.
+
 Usage::
 
     from webresearch.llm_chain import ModelFallbackChain
@@ -17,21 +25,32 @@ Usage::
     answer = chain.generate(prompt)
 
 The chain exposes the same .generate() signature as the individual interfaces,
-so it can be passed directly to ReActAgent or ParallelResearchAgent.
+so it can be passed directly to ReActAgent or ParallelResearchAgent, plus an
+async .agenerate() for AsyncReActAgent.
 """
 
+import asyncio
 import logging
 import threading
 import time
-from typing import Callable, List, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import ExitStack
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple, Union
 
+from .context import estimate_tokens
+from .health import CLOSED, CircuitBreaker, LatencyHistogram, Permit, RollingRate
 from .llm import LLMInterface
 from .llm_compat import OpenAICompatibleLLMInterface
+from .ratelimit import RateLimit, RateLimiter
 
 logger = logging.getLogger(__name__)
 
 AnyLLM = Union[LLMInterface, OpenAICompatibleLLMInterface]
 
+# (first chunk, rest of the stream, rate-limit slot) of an opened stream
+_OpenStream = Tuple[Optional[str], Iterator[str], ExitStack]
+
 # Substrings that indicate the error is a quota/rate-limit rather than a
 # genuine model or network failure.  On these errors we try the next provider.
 _QUOTA_SIGNALS = (
@@ -71,6 +90,74 @@ def _is_transient_error(exc: Exception) -> bool:
     return any(signal in low for signal in _TRANSIENT_SIGNALS)
 
 
+def _provider_name(llm) -> str:
+    return getattr(llm, "provider_name", None) or getattr(llm, "model_name", "unknown")
+
+
+def supports(llm, method: str) -> bool:
+    """
+    Return True if llm's class defines method.
+
+    Checked on the type rather than the instance so optional capabilities
+    (agenerate, …) are not falsely detected on duck-typed stand-ins whose
+    __getattr__ fabricates attributes.
+    """
+    return callable(getattr(type(llm), method, None))
+
+
+async def agenerate_with(llm, prompt: str) -> str:
+    """Await llm.agenerate if it has one, otherwise run its blocking generate() in a worker thread."""
+    if supports(llm, "agenerate"):
+        return await llm.agenerate(prompt)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, llm.generate, prompt)
+
+
+def generate_with_prefix(llm, prefix: str, suffix: str) -> str:
+    """
+    Call llm.generate_with_prefix if it has one, otherwise llm.generate(prefix + suffix).
+
+    prefix must be byte-identical across calls (instructions, tool list) so the
+    provider can serve it from its context cache; suffix carries everything
+    that changes per call.
+    """
+    if supports(llm, "generate_with_prefix"):
+        return llm.generate_with_prefix(prefix, suffix)
+    return llm.generate(prefix + suffix)
+
+
+def stream_with_prefix(llm, prefix: str, suffix: str) -> Iterator[str]:
+    """
+    Yield llm's response to prefix + suffix as text chunks.
+
+    Interfaces without generate_stream_with_prefix produce a single chunk with
+    the complete response, so callers can treat every LLM as streaming.
+    """
+    if supports(llm, "generate_stream_with_prefix"):
+        yield from llm.generate_stream_with_prefix(prefix, suffix)
+    else:
+        yield generate_with_prefix(llm, prefix, suffix)
+
+
+async def agenerate_with_prefix(llm, prefix: str, suffix: str) -> str:
+    """Async counterpart of generate_with_prefix(), falling back to agenerate_with()."""
+    if supports(llm, "agenerate_with_prefix"):
+        return await llm.agenerate_with_prefix(prefix, suffix)
+    if supports(llm, "generate_with_prefix"):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, llm.generate_with_prefix, prefix, suffix)
+    return await agenerate_with(llm, prefix + suffix)
+
+
+def _close_stream(future) -> None:
+    """Done-callback for the losing side of a hedged stream: drop it and free its slot."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    _, stream, slot = future.result()
+    stream.close()
+    slot.close()
+
+
 class ModelFallbackChain:
     """
     Ordered chain of LLM interfaces with automatic fallback on quota errors.
@@ -81,89 +168,506 @@ class ModelFallbackChain:
         switch_callback: Optional callable(from_name: str, to_name: str) invoked
                          whenever the chain switches to a new provider.  Use this
                          to surface a notification in the CLI.
+        hedge: When True, a call the active provider has not answered within
+               its hedge_percentile latency is also sent to the next provider,
+               and whichever answers first wins.  Streamed calls race to the
+               first chunk instead.  Trades extra quota for tail latency; off
+               by default.
+        hedge_percentile: Latency quantile (0–1) of the active provider used as
+                          the hedge deadline.
+        hedge_min_samples: Successful calls a provider needs before its
+                           histogram is trusted; until then calls are not hedged.
+        breaker_cooldown: Seconds a provider's circuit stays open after it
+                          trips; doubled after each failed probe.
+        breaker_max_cooldown: Upper bound for the doubled cool-down.
+        slow_call_seconds: Calls slower than this count as failures toward
+                           opening the circuit (None: latency is not counted).
     """
 
     def __init__(
         self,
         interfaces: List[AnyLLM],
         switch_callback: Optional[Callable[[str, str], None]] = None,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 5,
+        breaker_cooldown: float = 30.0,
+        breaker_max_cooldown: float = 600.0,
+        slow_call_seconds: Optional[float] = None,
     ):
         if not interfaces:
             raise ValueError("ModelFallbackChain requires at least one interface.")
         self.interfaces = interfaces
         self.switch_callback = switch_callback
         self._current_index = 0
-        self._lock = threading.Lock()   # guards _current_index and _last_switch_time
-        self._last_switch_time: float = 0.0
-        # One semaphore per provider index — limits concurrent calls to 1 per
-        # provider so parallel sub-agents don't simultaneously hammer the same
-        # rate-limited free-tier endpoint.
-        self._provider_semaphores = [threading.Semaphore(1) for _ in interfaces]
+        self._lock = threading.Lock()   # guards _current_index and _hedge_pool
+        # One rate limiter per provider index — admits calls within the
+        # provider's requests/min, tokens/min and in-flight budgets so parallel
+        # sub-agents use the real quota without blowing through it.
+        self._limiters = [self._limiter_for(llm) for llm in interfaces]
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = [LatencyHistogram() for _ in interfaces]
+        # Time to first chunk of streamed calls — the hedge deadline for streams
+        self.first_chunk = [LatencyHistogram() for _ in interfaces]
+        # Share of recent calls each provider answered with a quota error (429)
+        self.throttled = [RollingRate() for _ in interfaces]
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self.breakers = [
+            CircuitBreaker(
+                name=_provider_name(llm),
+                cooldown=breaker_cooldown,
+                max_cooldown=breaker_max_cooldown,
+                slow_call_seconds=slow_call_seconds,
+            )
+            for llm in interfaces
+        ]
 
     @property
     def current(self) -> AnyLLM:
         return self.interfaces[self._current_index]
 
+    @property
+    def context_window(self) -> Optional[int]:
+        """Smallest known input window across providers — a run may fall back mid-way."""
+        windows = [
+            w for w in (getattr(llm, "context_window", None) for llm in self.interfaces)
+            if isinstance(w, int) and w > 0
+        ]
+        return min(windows) if windows else None
+
     @property
     def current_name(self) -> str:
         llm = self.current
         return getattr(llm, "provider_name", None) or getattr(llm, "model_name", str(llm))
 
+    def health(self) -> List[dict]:
+        """
+        Per-provider circuit state, health score (0–1), p50/p95 latency,
+        throttled-call rate and rate limits, in chain order.
+        """
+        return [self._health(i) for i in range(len(self.interfaces))]
+
+    def current_health(self) -> dict:
+        """The health() entry of the active provider."""
+        return self._health(self._current_index)
+
+    def _health(self, i: int) -> dict:
+        breaker = self.breakers[i]
+        limit = self._limiters[i].limit
+        return {
+            "provider": _provider_name(self.interfaces[i]),
+            "state": breaker.state,
+            "health": round(breaker.health(), 3),
+            "p50": self.latency[i].percentile(0.5),
+            "p95": self.latency[i].percentile(0.95),
+            "throttle_rate": self.throttled[i].rate(),
+            "rpm": limit.rpm,
+            "max_in_flight": limit.max_in_flight,
+        }
+
     def generate(self, prompt: str) -> str:
         """
         Generate a response, falling back through the chain on quota errors.
-        Thread-safe: concurrent callers serialise per provider via semaphores,
-        and _current_index mutations are protected by a lock.
-        Raises the last exception if all providers are exhausted.
+        Thread-safe: concurrent callers are admitted per provider by its
+        RateLimiter and CircuitBreaker, and _current_index mutations are
+        protected by a lock.  Raises the last provider error if every
+        admitted provider fails.
         """
-        # Auto-reset to primary if we fell back previously and enough time has
-        # elapsed — a per-minute Gemini quota recovers in ~60s, so the chain
-        # would otherwise stay on the fallback provider for the entire session.
-        with self._lock:
-            if self._current_index > 0 and (time.time() - self._last_switch_time) > 60.0:
-                logger.info("Auto-resetting to primary provider after cooldown.")
-                self._current_index = 0
-
-        for i in range(len(self.interfaces)):
-            # Re-read current index each iteration so we skip providers that
-            # another thread has already marked as failed (avoids stale start_index
-            # race where thread A cached index=0 but thread B has since advanced to 1).
+        return self._call(lambda llm: llm.generate(prompt), estimate_tokens(prompt))
+
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        """generate() for a stable prefix + dynamic suffix; each provider caches the prefix its own way."""
+        return self._call(
+            lambda llm: generate_with_prefix(llm, prefix, suffix),
+            estimate_tokens(prefix) + estimate_tokens(suffix),
+        )
+
+    def generate_stream_with_prefix(self, prefix: str, suffix: str) -> Iterator[str]:
+        """
+        Streaming generate_with_prefix() with the same fallback semantics.
+
+        A provider can only be abandoned before its first chunk is yielded;
+        errors after that propagate, since the caller has already consumed
+        part of the answer.  The provider's rate-limit slot is held until the
+        stream is exhausted or closed.  With hedging on, the race is over the
+        first chunk: see _hedged_open().
+        """
+        tokens = estimate_tokens(prefix) + estimate_tokens(suffix)
+        last_error: Optional[Exception] = None
+
+        for i, permit in self._candidates():
+            self._activate(i)
+            try:
+                hedge = self._hedge_plan(i, self.first_chunk)
+                if hedge is not None:
+                    first, stream, slot = self._hedged_open(prefix, suffix, tokens, i, permit, *hedge)
+                else:
+                    first, stream, slot = self._open_stream(prefix, suffix, tokens, i, permit)
+            except Exception as e:
+                if self._should_fall_through(e, i):
+                    last_error = e
+                    continue
+                raise
+            try:
+                if first is not None:
+                    yield first
+                yield from stream
+            finally:
+                stream.close()
+                slot.close()
+            return
+
+        self._exhausted(last_error)
+
+    def _open_stream(
+        self, prefix: str, suffix: str, tokens: int, i: int, permit: Optional[Permit]
+    ) -> _OpenStream:
+        """
+        Take provider i's rate-limit slot, open its stream and read the first
+        chunk.  Returns (first chunk, rest of the stream, slot); the slot is
+        held until the returned ExitStack is closed.
+        """
+        slot = ExitStack()
+        slot.enter_context(self._limiters[i].slot(tokens))
+        stream = stream_with_prefix(self.interfaces[i], prefix, suffix)
+        t0 = time.monotonic()
+        try:
+            first = next(stream, None)
+        except Exception as e:
+            slot.close()
+            self._record_error(e, i, permit)
+            raise
+        except BaseException:
+            slot.close()
+            self.breakers[i].release(permit)
+            raise
+        elapsed = time.monotonic() - t0
+        self.first_chunk[i].record(elapsed)
+        self.breakers[i].record_success(elapsed, permit)
+        self.throttled[i].record(False)
+        return first, stream, slot
+
+    def _hedged_open(
+        self,
+        prefix: str,
+        suffix: str,
+        tokens: int,
+        i: int,
+        permit: Optional[Permit],
+        deadline: float,
+        j: int,
+    ) -> _OpenStream:
+        """
+        _hedged() for streams: open provider i's stream; if its first chunk
+        has not arrived after deadline seconds, open provider j's as well and
+        keep whichever yields first.  The losing stream is closed (releasing
+        its slot) as soon as its own first chunk arrives.
+        """
+        pool = self._pool()
+        primary = pool.submit(self._open_stream, prefix, suffix, tokens, i, permit)
+        try:
+            return primary.result(timeout=deadline)
+        except FuturesTimeout:
+            pass
+        backup_permit = self._backup_permit(j)
+        if backup_permit is None:
+            return primary.result()
+
+        logger.info(
+            f"[{_provider_name(self.interfaces[i])}] no first chunk after {deadline:.1f}s — "
+            f"hedging to {_provider_name(self.interfaces[j])}"
+        )
+        backup = pool.submit(self._open_stream, prefix, suffix, tokens, j, backup_permit)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.add_done_callback(_close_stream)
+                    return future.result()
+        return primary.result()   # both failed — re-raise the primary's error
+
+    def _call(self, fn: Callable[[AnyLLM], str], tokens: int) -> str:
+        last_error: Optional[Exception] = None
+
+        for i, permit in self._candidates():
+            self._activate(i)
+            try:
+                hedge = self._hedge_plan(i)
+                if hedge is not None:
+                    return self._hedged(fn, tokens, i, permit, *hedge)
+                return self._attempt(fn, tokens, i, permit)
+            except Exception as e:
+                if self._should_fall_through(e, i):
+                    last_error = e
+                    continue
+                raise
+
+        self._exhausted(last_error)
+
+    def _attempt(self, fn: Callable[[AnyLLM], str], tokens: int, i: int, permit: Optional[Permit]) -> str:
+        # Wait for this provider's budget — free-tier APIs (Groq,
+        # OpenRouter) have per-minute limits that parallel threads blow
+        # through instantly when sharing one endpoint.
+        try:
+            with self._limiters[i].slot(tokens):
+                t0 = time.monotonic()
+                result = fn(self.interfaces[i])
+        except Exception as e:
+            self._record_error(e, i, permit)
+            raise
+        except BaseException:
+            self.breakers[i].release(permit)
+            raise
+        self._record_success(i, time.monotonic() - t0, permit)
+        return result
+
+    def _hedged(
+        self,
+        fn: Callable[[AnyLLM], str],
+        tokens: int,
+        i: int,
+        permit: Optional[Permit],
+        deadline: float,
+        j: int,
+    ) -> str:
+        """
+        Run fn on provider i; if it is still pending after deadline seconds,
+        race it against provider j and return the first success.  The
+        losing thread cannot be interrupted — its result is discarded.
+        If both fail, provider i's error is raised for the fallback logic.
+        """
+        primary = self._pool().submit(self._attempt, fn, tokens, i, permit)
+        try:
+            return primary.result(timeout=deadline)
+        except FuturesTimeout:
+            pass
+        backup_permit = self._backup_permit(j)
+        if backup_permit is None:
+            return primary.result()
+
+        logger.info(
+            f"[{_provider_name(self.interfaces[i])}] no answer after {deadline:.1f}s — "
+            f"hedging to {_provider_name(self.interfaces[j])}"
+        )
+        backup = self._pool().submit(self._attempt, fn, tokens, j, backup_permit)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+        return primary.result()   # both failed — re-raise the primary's error
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._hedge_pool is None:
             with self._lock:
-                if i < self._current_index:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(thread_name_prefix="llm-hedge")
+        return self._hedge_pool
+
+    def _backup_permit(self, j: int) -> Optional[Permit]:
+        """Admit a hedge to provider j, unless that would make it a recovering provider's probe."""
+        permit = self.breakers[j].allow()
+        if permit is not None and permit.probe:
+            self.breakers[j].release(permit)
+            return None
+        return permit
+
+    def _hedge_plan(
+        self, i: int, latency: Optional[List[LatencyHistogram]] = None
+    ) -> Optional[Tuple[float, int]]:
+        """
+        (seconds to wait on provider i, provider to hedge to), or None to not
+        hedge.  Only a later provider with a closed circuit is used as the
+        backup — a hedge must never be the probe of a recovering provider.
+
+        latency selects the histograms the deadline comes from: full-call
+        latency by default, time to first chunk for streams.
+        """
+        hist = (latency or self.latency)[i]
+        if not self.hedge or hist.count < self.hedge_min_samples:
+            return None
+        backup = next(
+            (j for j in range(i + 1, len(self.interfaces)) if self.breakers[j].state == CLOSED),
+            None,
+        )
+        if backup is None:
+            return None
+        return hist.percentile(self.hedge_percentile), backup
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async variant of generate() with the same fallback semantics.
+
+        Providers without a native agenerate() run in a worker thread.  The
+        rate limiter is awaited with asyncio.sleep rather than blocked on so a
+        busy provider never stalls the event loop.
+        """
+        return await self._acall(lambda llm: agenerate_with(llm, prompt), estimate_tokens(prompt))
+
+    async def agenerate_with_prefix(self, prefix: str, suffix: str) -> str:
+        """Async variant of generate_with_prefix()."""
+        return await self._acall(
+            lambda llm: agenerate_with_prefix(llm, prefix, suffix),
+            estimate_tokens(prefix) + estimate_tokens(suffix),
+        )
+
+    async def _acall(self, fn: Callable[[AnyLLM], Awaitable[str]], tokens: int) -> str:
+        last_error: Optional[Exception] = None
+
+        for i, permit in self._candidates():
+            self._activate(i)
+            try:
+                hedge = self._hedge_plan(i)
+                if hedge is not None:
+                    return await self._ahedged(fn, tokens, i, permit, *hedge)
+                return await self._aattempt(fn, tokens, i, permit)
+            except Exception as e:
+                if self._should_fall_through(e, i):
+                    last_error = e
                     continue
+                raise
+
+        self._exhausted(last_error)
+
+    async def _aattempt(
+        self, fn: Callable[[AnyLLM], Awaitable[str]], tokens: int, i: int, permit: Optional[Permit]
+    ) -> str:
+        try:
+            async with self._limiters[i].aslot(tokens):
+                t0 = time.monotonic()
+                result = await fn(self.interfaces[i])
+        except Exception as e:
+            self._record_error(e, i, permit)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the losing side of a hedge) — says nothing about health
+            self.breakers[i].release(permit)
+            raise
+        self._record_success(i, time.monotonic() - t0, permit)
+        return result
+
+    async def _ahedged(
+        self,
+        fn: Callable[[AnyLLM], Awaitable[str]],
+        tokens: int,
+        i: int,
+        permit: Optional[Permit],
+        deadline: float,
+        j: int,
+    ) -> str:
+        """Async _hedged(); the losing request is cancelled."""
+        primary = asyncio.ensure_future(self._aattempt(fn, tokens, i, permit))
+        done, _ = await asyncio.wait({primary}, timeout=deadline)
+        if done:
+            return primary.result()
+        backup_permit = self._backup_permit(j)
+        if backup_permit is None:
+            return await primary
+
+        logger.info(
+            f"[{_provider_name(self.interfaces[i])}] no answer after {deadline:.1f}s — "
+            f"hedging to {_provider_name(self.interfaces[j])}"
+        )
+        backup = asyncio.ensure_future(self._aattempt(fn, tokens, j, backup_permit))
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
 
-            llm = self.interfaces[i]
-            name = getattr(llm, "provider_name", None) or getattr(llm, "model_name", "unknown")
-
-            if i > 0:
-                prev_name = (
-                    getattr(self.interfaces[i - 1], "provider_name", None)
-                    or getattr(self.interfaces[i - 1], "model_name", "unknown")
-                )
-                with self._lock:
-                    if self._current_index < i:   # only advance once across threads
-                        logger.warning(f"Falling back from {prev_name} to {name}")
-                        if self.switch_callback:
-                            self.switch_callback(prev_name, name)
-                        self._current_index = i
-                        self._last_switch_time = time.time()
-
-            # Serialise concurrent calls to this provider — free-tier APIs
-            # (Groq, OpenRouter) have per-minute limits that parallel threads
-            # blow through instantly when sharing one endpoint.
-            with self._provider_semaphores[i]:
-                try:
-                    return llm.generate(prompt)
-                except Exception as e:
-                    is_fallback = _is_quota_error(e) or _is_transient_error(e)
-                    if is_fallback and i < len(self.interfaces) - 1:
-                        reason = "quota error" if _is_quota_error(e) else "transient error"
-                        logger.warning(f"[{name}] {reason}, trying next provider: {str(e)[:100]}")
-                        continue
-                    raise
+    @staticmethod
+    def _limiter_for(llm) -> RateLimiter:
+        """The interface's own RateLimiter, or a one-call-at-a-time default."""
+        limiter = getattr(llm, "rate_limiter", None)
+        if isinstance(limiter, RateLimiter):
+            return limiter
+        limiter = RateLimiter(RateLimit(), name=_provider_name(llm))
+        if isinstance(llm, (LLMInterface, OpenAICompatibleLLMInterface)):
+            llm.rate_limiter = limiter   # so its retry hints reach the shared limiter
+        return limiter
 
+    def _candidates(self) -> Iterator[Tuple[int, Permit]]:
+        """
+        Yield, in chain order, each provider whose circuit admits a call,
+        with the permit to report the call's outcome under.
+
+        If every circuit is open the provider that reopens soonest is tried
+        anyway — failing the call outright would be worse than one early probe.
+        """
+        admitted = False
+        for i, breaker in enumerate(self.breakers):
+            permit = breaker.allow()
+            if permit is not None:
+                admitted = True
+                yield i, permit
+        if not admitted:
+            i = min(range(len(self.breakers)), key=lambda k: self.breakers[k].retry_at)
+            logger.warning(f"All provider circuits are open — trying {_provider_name(self.interfaces[i])} anyway")
+            yield i, self.breakers[i].allow(force=True)
+
+    def _activate(self, i: int) -> None:
+        """Make provider i current, notifying switch_callback when the chain falls back."""
+        with self._lock:
+            prev = self._current_index
+            if prev == i:
+                return
+            self._current_index = i
+            name = _provider_name(self.interfaces[i])
+            prev_name = _provider_name(self.interfaces[prev])
+            if i > prev:
+                logger.warning(f"Falling back from {prev_name} to {name}")
+                if self.switch_callback:
+                    self.switch_callback(prev_name, name)
+            else:
+                logger.info(f"{name} is healthy again — switching back from {prev_name}")
+
+    def _record_success(self, i: int, latency: float, permit: Optional[Permit] = None) -> None:
+        self.latency[i].record(latency)
+        self.throttled[i].record(False)
+        self.breakers[i].record_success(latency, permit)
+
+    def _record_error(self, e: Exception, i: int, permit: Optional[Permit] = None) -> None:
+        """Feed error e from provider i, admitted under permit, into its circuit breaker."""
+        self.throttled[i].record(_is_quota_error(e))
+        if _is_quota_error(e):
+            self.breakers[i].trip(permit)
+        elif _is_transient_error(e):
+            self.breakers[i].record_failure(permit)
+        else:
+            # The provider answered; the request itself was bad
+            self.breakers[i].record_success(permit=permit)
+
+    def _should_fall_through(self, e: Exception, i: int) -> bool:
+        """Return True if error e from provider i should move the call to the next provider."""
+        if _is_quota_error(e) or _is_transient_error(e):
+            reason = "quota error" if _is_quota_error(e) else "transient error"
+            name = _provider_name(self.interfaces[i])
+            logger.warning(f"[{name}] {reason}, trying next provider: {str(e)[:100]}")
+            return True
+        return False
+
+    @staticmethod
+    def _exhausted(last_error: Optional[Exception]):
+        if last_error is not None:
+            raise last_error
         raise RuntimeError("ModelFallbackChain exhausted all providers.")
 
     def reset(self) -> None:
-        """Reset to the primary provider (call between independent queries if desired)."""
-        self._current_index = 0
+        """Reset to the primary provider and close every circuit (call between independent queries if desired)."""
+        with self._lock:
+            self._current_index = 0
+        for breaker in self.breakers:
+            breaker.reset()
@@ -10,19 +10,26 @@ Covers any provider that exposes the OpenAI chat-completions API shape:
 Requires the `openai` package:  pip install openai
 """
 
+import asyncio
 import logging
 import time
-from typing import Optional
+from typing import Iterator, Optional, Union
+
+from .ratelimit import RateLimit, RateLimiter
 
 logger = logging.getLogger(__name__)
 
 try:
-    from openai import OpenAI, RateLimitError, APIStatusError
+    from openai import AsyncOpenAI, OpenAI, RateLimitError, APIStatusError
     _OPENAI_AVAILABLE = True
 except ImportError:
     _OPENAI_AVAILABLE = False
 
 
+# 2048 truncated complex ReAct reasoning on fallback providers
+_MAX_COMPLETION_TOKENS = 4096
+
+
 def openai_available() -> bool:
     return _OPENAI_AVAILABLE
 
@@ -66,6 +73,8 @@ class OpenAICompatibleLLMInterface:
         base_url: str,
         provider_name: str = "",
         temperature: float = 0.1,
+        context_window: Optional[int] = None,
+        rate_limit: Optional[Union[RateLimit, RateLimiter]] = None,
     ):
         if not _OPENAI_AVAILABLE:
             raise ImportError(
@@ -76,6 +85,19 @@ class OpenAICompatibleLLMInterface:
         self.provider_name = provider_name or base_url
         self.temperature = temperature
         self._client = OpenAI(api_key=api_key, base_url=base_url)
+        self._api_key = api_key
+        self._base_url = base_url
+        self._async_client = None  # created on first agenerate(), inside the running loop
+        # Shared with ModelFallbackChain; 429 retry hints pause all callers via defer()
+        if isinstance(rate_limit, RateLimiter):
+            self.rate_limiter: Optional[RateLimiter] = rate_limit
+        else:
+            self.rate_limiter = RateLimiter(rate_limit, name=self.provider_name) if rate_limit else None
+        # Prompt tokens available once the completion's max_tokens is reserved.
+        # None = unknown; small local models (Ollama) should set it explicitly.
+        self.context_window = (
+            max(1024, context_window - _MAX_COMPLETION_TOKENS) if context_window else None
+        )
         logger.info(f"Initialised {self.provider_name} interface ({model_name})")
 
     @staticmethod
@@ -92,41 +114,120 @@ class OpenAICompatibleLLMInterface:
             return float(m.group(1)) + 1.0
         return None
 
+    def _completion_kwargs(self, messages: list) -> dict:
+        return dict(
+            model=self.model_name,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=_MAX_COMPLETION_TOKENS,
+        )
+
+    @staticmethod
+    def _prefix_messages(prefix: str, suffix: str) -> list:
+        # Providers with automatic prefix caching (OpenAI, DeepSeek, Groq) and
+        # Ollama's KV cache reuse work only on a byte-identical leading segment,
+        # so the stable prefix always goes first, in its own system message.
+        return [
+            {"role": "system", "content": prefix},
+            {"role": "user", "content": suffix},
+        ]
+
     def generate(self, prompt: str, retry_count: int = 3) -> str:
+        return self._complete([{"role": "user", "content": prompt}], retry_count)
+
+    async def agenerate(self, prompt: str, retry_count: int = 3) -> str:
+        """Async variant of generate() backed by the AsyncOpenAI client."""
+        return await self._acomplete([{"role": "user", "content": prompt}], retry_count)
+
+    def generate_with_prefix(self, prefix: str, suffix: str, retry_count: int = 3) -> str:
+        """Generate for prefix + suffix, keeping prefix cacheable by the provider."""
+        return self._complete(self._prefix_messages(prefix, suffix), retry_count)
+
+    async def agenerate_with_prefix(self, prefix: str, suffix: str, retry_count: int = 3) -> str:
+        return await self._acomplete(self._prefix_messages(prefix, suffix), retry_count)
+
+    def generate_stream(self, prompt: str, retry_count: int = 3) -> Iterator[str]:
+        """Yield response text chunks as they arrive (stream=True)."""
+        return self._stream([{"role": "user", "content": prompt}], retry_count)
+
+    def generate_stream_with_prefix(self, prefix: str, suffix: str, retry_count: int = 3) -> Iterator[str]:
+        return self._stream(self._prefix_messages(prefix, suffix), retry_count)
+
+    def _stream(self, messages: list, retry_count: int) -> Iterator[str]:
+        for attempt in range(retry_count):
+            try:
+                stream = self._client.chat.completions.create(
+                    **self._completion_kwargs(messages), stream=True
+                )
+                break
+            except Exception as e:
+                time.sleep(self._retry_delay(e, attempt, retry_count))
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Closing the HTTP response is what stops the server generating
+            # when the caller abandons the stream early.
+            stream.close()
+
+    def _complete(self, messages: list, retry_count: int) -> str:
         for attempt in range(retry_count):
             try:
                 response = self._client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.temperature,
-                    max_tokens=4096,  # 2048 truncated complex ReAct reasoning on fallback providers
+                    **self._completion_kwargs(messages)
                 )
-                return response.choices[0].message.content or ""
+                return self._response_text(response)
+            except Exception as e:
+                time.sleep(self._retry_delay(e, attempt, retry_count))
 
+    async def _acomplete(self, messages: list, retry_count: int) -> str:
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+        for attempt in range(retry_count):
+            try:
+                response = await self._async_client.chat.completions.create(
+                    **self._completion_kwargs(messages)
+                )
+                return self._response_text(response)
             except Exception as e:
-                err = str(e).lower()
-                is_quota = "quota" in err or "rate" in err or "429" in err
-                is_timeout = "timed out" in err or "timeout" in err
-
-                if not is_quota and not is_timeout:
-                    raise
-
-                logger.warning(f"[{self.provider_name}] attempt {attempt + 1}/{retry_count} failed: {str(e)[:120]}")
-
-                if attempt < retry_count - 1:
-                    if is_timeout:
-                        # Short fixed delay for timeouts — these are infra hiccups,
-                        # not per-minute bucket exhaustion.
-                        delay = 5.0
-                    else:
-                        # Honour the server's retry-after hint; fall back to
-                        # exponential backoff but floor at 10s for per-minute limits.
-                        hint = self._parse_retry_after(str(e))
-                        delay = hint if hint else max(10.0, 2 ** (attempt + 2))
-                    logger.warning(f"[{self.provider_name}] waiting {delay:.0f}s before retry (attempt {attempt+1}/{retry_count})")
-                    time.sleep(delay)
-                else:
-                    label = "timed out" if is_timeout else "rate-limited"
-                    raise Exception(
-                        f"[{self.provider_name}] {label} after {retry_count} attempts."
-                    )
+                await asyncio.sleep(self._retry_delay(e, attempt, retry_count))
+
+    def _response_text(self, response) -> str:
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached:
+            logger.debug(f"[{self.provider_name}] {cached}/{usage.prompt_tokens} prompt tokens served from cache")
+        return response.choices[0].message.content or ""
+
+    def _retry_delay(self, e: Exception, attempt: int, retry_count: int) -> float:
+        """Return how long to wait before the next attempt, or raise if none remain."""
+        err = str(e).lower()
+        is_quota = "quota" in err or "rate" in err or "429" in err
+        is_timeout = "timed out" in err or "timeout" in err
+
+        if not is_quota and not is_timeout:
+            raise e
+
+        logger.warning(f"[{self.provider_name}] attempt {attempt + 1}/{retry_count} failed: {str(e)[:120]}")
+
+        if attempt >= retry_count - 1:
+            label = "timed out" if is_timeout else "rate-limited"
+            raise Exception(
+                f"[{self.provider_name}] {label} after {retry_count} attempts."
+            )
+
+        if is_timeout:
+            # Short fixed delay for timeouts — these are infra hiccups,
+            # not per-minute bucket exhaustion.
+            delay = 5.0
+        else:
+            # Honour the server's retry-after hint; fall back to
+            # exponential backoff but floor at 10s for per-minute limits.
+            hint = self._parse_retry_after(str(e))
+            delay = hint if hint else max(10.0, 2 ** (attempt + 2))
+            if hint and self.rate_limiter:
+                self.rate_limiter.defer(hint)
+        logger.warning(f"[{self.provider_name}] waiting {delay:.0f}s before retry (attempt {attempt+1}/{retry_count})")
+        return delay
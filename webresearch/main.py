@@ -4,22 +4,31 @@ Processes tasks from a file and runs the ReAct agent on each task.
 """
 
 import argparse
+import functools
 import logging
 import sys
 import os
 from datetime import datetime
-from typing import List
+from typing import IO, List
 
 from webresearch.config import config
 from webresearch.llm import LLMInterface
 from webresearch.tools import (
     ToolManager,
     SearchTool,
+    MultiSearchTool,
     ScrapeTool,
     CodeExecutorTool,
     FileOpsTool,
+    build_fetch_cache,
+    build_http_pool,
+    build_parse_pool,
+    build_search_cache,
 )
 from webresearch.agent import ReActAgent
+from webresearch.batch import JobCheckpoint, job_id_for, run_batch
+from webresearch.llm_chain import ModelFallbackChain
+from webresearch.ratelimit import rate_limit_for, rate_limits_for
 
 
 # Configure logging
@@ -122,24 +131,34 @@ def initialize_agent(verbose: bool = False) -> ReActAgent:
         api_key=config.gemini_api_key,
         model_name=config.model_name,
         temperature=config.temperature,
+        context_cache=config.context_cache_enabled,
+        context_cache_ttl=config.context_cache_ttl,
+        rate_limit=rate_limit_for(config, "gemini"),
     )
 
     # Initialize tool manager and register tools
     logger.info("Registering tools...")
-    tool_manager = ToolManager()
+    tool_manager = ToolManager(
+        http_pool=build_http_pool(config),
+        parse_pool=build_parse_pool(config),
+    )
 
     # Register all available tools
-    tool_manager.register_tool(
-        SearchTool(
-            api_key=config.serper_api_key,
-            timeout=config.web_request_timeout,
-        )
+    search = SearchTool(
+        api_key=config.serper_api_key,
+        timeout=config.web_request_timeout,
+        cache=build_search_cache(config),
     )
+    tool_manager.register_tool(search)
+    tool_manager.register_tool(MultiSearchTool(search))
 
     tool_manager.register_tool(
         ScrapeTool(
             timeout=config.web_request_timeout,
             max_length=config.max_tool_output_length,
+            cache=build_fetch_cache(config),
+            parser=config.html_parser,
+            max_bytes=config.scrape_max_mb * 1024 * 1024,
         )
     )
 
@@ -157,55 +176,52 @@ def initialize_agent(verbose: bool = False) -> ReActAgent:
     logger.info(f"Registered {len(tool_manager.get_all_tools())} tools")
 
     # Initialize agent
+    # A one-provider chain, so calls are admitted by the (possibly shared) rate limiter
     agent = ReActAgent(
-        llm=llm,
+        llm=ModelFallbackChain([llm]),
         tool_manager=tool_manager,
         max_iterations=config.max_iterations,
         max_tool_output_length=config.max_tool_output_length,
+        context_budget=config.context_token_budget,
+        early_stop=config.early_stop,
     )
 
     return agent
 
 
-def write_results(output_file: str, results: List[dict]) -> None:
+def write_results_header(f: IO[str]) -> None:
+    """Write the banner at the top of a results file."""
+    f.write("=" * 100 + "\n")
+    f.write("WEB RESEARCH AGENT RESULTS\n")
+    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    f.write("=" * 100 + "\n\n")
+
+
+def write_result(f: IO[str], i: int, result: dict) -> None:
     """
-    Write results to an output file.
+    Append one task's result to an open results file.
 
     Args:
-        output_file: Path to the output file
-        results: List of result dictionaries
+        f: File opened for writing
+        i: 1-based task number
+        result: Result dictionary
     """
-    logger = logging.getLogger(__name__)
-
-    try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("=" * 100 + "\n")
-            f.write("WEB RESEARCH AGENT RESULTS\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 100 + "\n\n")
-
-            for i, result in enumerate(results, 1):
-                f.write(f"\n{'=' * 100}\n")
-                f.write(f"TASK {i}\n")
-                f.write(f"{'=' * 100}\n\n")
-
-                f.write(f"TASK DESCRIPTION:\n{result['task']}\n\n")
-                f.write(f"{'-' * 100}\n\n")
+    f.write(f"\n{'=' * 100}\n")
+    f.write(f"TASK {i}\n")
+    f.write(f"{'=' * 100}\n\n")
 
-                f.write(f"ANSWER:\n{result['answer']}\n\n")
+    f.write(f"TASK DESCRIPTION:\n{result['task']}\n\n")
+    f.write(f"{'-' * 100}\n\n")
 
-                if result.get("error"):
-                    f.write(f"ERROR: {result['error']}\n\n")
+    f.write(f"ANSWER:\n{result['answer']}\n\n")
 
-                f.write(
-                    f"Execution time: {result.get('execution_time', 'N/A')} seconds\n"
-                )
-                f.write(f"Number of steps: {result.get('num_steps', 'N/A')}\n")
+    if result.get("error"):
+        f.write(f"ERROR: {result['error']}\n\n")
 
-        logger.info(f"Results written to: {output_file}")
-
-    except Exception as e:
-        logger.error(f"Error writing results: {str(e)}")
+    f.write(
+        f"Execution time: {result.get('execution_time', 'N/A')} seconds\n"
+    )
+    f.write(f"Number of steps: {result.get('num_steps', 'N/A')}\n")
 
 
 def main():
@@ -226,6 +242,28 @@ def main():
         help="Output file for results (default: results.txt)",
     )
 
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=config.batch_workers,
+        help="Worker processes to spread tasks across (default: BATCH_WORKERS or 1)",
+    )
+
+    parser.add_argument(
+        "--job",
+        default=None,
+        help="Job id for the JSONL checkpoint under ~/.webresearch/jobs "
+        "(default: task file name + hash of its tasks). Re-running with the same "
+        "job id skips tasks that already finished.",
+    )
+
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard the job's checkpoint and run every task again",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -250,70 +288,63 @@ def main():
         logger.error("No tasks found in task file")
         sys.exit(1)
 
-    # Initialize agent
-    agent = initialize_agent(verbose=args.verbose)
-
-    # Process each task
-    results = []
-
-    for i, task in enumerate(tasks, 1):
-        logger.info("")
-        logger.info("=" * 80)
-        logger.info(f"PROCESSING TASK {i}/{len(tasks)}")
-        logger.info("=" * 80)
-        logger.info(f"Task: {task[:100]}...")
-
-        start_time = datetime.now()
-
-        try:
-            # Run the agent on the task
-            answer = agent.run(task)
-
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
-
-            # Get execution trace
-            trace = agent.get_execution_trace()
-
-            result = {
-                "task": task,
-                "answer": answer,
-                "execution_time": execution_time,
-                "num_steps": len(trace),
-                "trace": trace,
-            }
-
-            logger.info(f"Task completed in {execution_time:.2f} seconds")
-            logger.info(f"Number of steps: {len(trace)}")
-
-        except Exception as e:
-            logger.error(f"Error processing task: {str(e)}", exc_info=True)
-
-            result = {
-                "task": task,
-                "answer": "Error occurred during processing",
-                "error": str(e),
-                "execution_time": (datetime.now() - start_time).total_seconds(),
-                "num_steps": 0,
-            }
+    # Validate up front rather than in every worker process
+    try:
+        config.validate()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
 
-        results.append(result)
+    checkpoint = JobCheckpoint(args.job or job_id_for(args.task_file, tasks))
+    if args.fresh:
+        checkpoint.clear()
+    logger.info(f"Job {checkpoint.job_id} — checkpoint: {checkpoint.path}")
+    logger.info(f"Processing {len(tasks)} tasks with {max(1, args.workers)} worker(s)")
+
+    # Each result is appended to the output file as soon as its task finishes,
+    # so an interrupted run keeps everything completed so far
+    out = open(args.output, "w", encoding="utf-8")
+    write_results_header(out)
+
+    def _on_result(index: int, result: dict) -> None:
+        i = index + 1
+        if result.get("resumed"):
+            write_result(out, i, result)
+            return
+        if result.get("error"):
+            logger.error(f"Task {i} failed: {result['error']}")
+        else:
+            logger.info(f"Task {i} completed in {result['execution_time']:.2f} seconds")
+            logger.info(f"Number of steps: {result['num_steps']}")
+
+        write_result(out, i, result)
+        out.flush()
 
         # Print answer to console
         print("\n" + "=" * 80)
         print(f"TASK {i} ANSWER:")
         print("=" * 80)
-        print(answer)
+        print(result["answer"])
         print("=" * 80 + "\n")
 
-    # Write results to file
-    write_results(args.output, results)
+    try:
+        run_batch(
+            tasks,
+            functools.partial(initialize_agent, verbose=args.verbose),
+            workers=args.workers,
+            on_result=_on_result,
+            rate_limits=rate_limits_for(config),
+            checkpoint=checkpoint,
+        )
+    finally:
+        out.close()
 
     logger.info("")
     logger.info("=" * 80)
     logger.info(f"COMPLETED ALL TASKS")
     logger.info(f"Total tasks: {len(tasks)}")
     logger.info(f"Results saved to: {args.output}")
+    logger.info(f"JSONL checkpoint: {checkpoint.path}")
     logger.info("=" * 80)
 
 
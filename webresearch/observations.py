@@ -0,0 +1,122 @@
+"""
+Run-scoped observation store shared by concurrent agents.
+
+Each ReActAgent keeps its own per-run action cache, which is empty for every
+sub-agent that ParallelResearchAgent starts.  Sub-agents researching facets
+of one question tend to open with the same search and scrape the same
+top-ranked pages, often at the same moment, so the cache never hits.
+
+An ObservationStore is shared by every sub-agent of one deep-research run:
+
+- a completed observation is returned to any agent that makes the same call;
+- single-flight: while a call is in flight, identical calls from other
+  agents wait for that one result instead of fetching again.
+
+Only read-only research tools are shared.  think, file_ops and
+code_executor results depend on the calling agent's own state and always
+run.  Error observations are handed to the callers already waiting on them
+but are not kept, so a later call retries.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Tools whose output depends only on their arguments
+SHARED_TOOLS = frozenset({"search", "search_many", "scrape", "scrape_js", "pdf_extract"})
+
+
+class ObservationStore:
+    """
+    Thread-safe, single-flight cache of tool observations for one run.
+
+    Args:
+        tools: Tool names whose observations are shared.
+    """
+
+    def __init__(self, tools: Iterable[str] = SHARED_TOOLS):
+        self.tools: FrozenSet[str] = frozenset(tools)
+        self._results: Dict[str, str] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0      # tool calls actually executed
+        self.hits = 0       # served from a completed observation
+        self.joined = 0     # waited on another agent's in-flight call
+
+    def _claim(self, key: str):
+        """Return (result, future, owner) for key under the lock."""
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key], None, False
+            future = self._inflight.get(key)
+            if future is not None:
+                self.joined += 1
+                return None, future, False
+            future = self._inflight[key] = Future()
+            self.calls += 1
+            return None, future, True
+
+    def _settle(self, key: str, future: Future, result: str) -> None:
+        with self._lock:
+            if not result.startswith("Error"):
+                self._results[key] = result
+            self._inflight.pop(key, None)
+        future.set_result(result)
+
+    def _fail(self, key: str, future: Future, error: BaseException) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_exception(error)
+
+    def run(self, key: str, action: str, call: Callable[[], str]) -> str:
+        """
+        Return the observation for key, running call() only if no agent
+        has produced (or is producing) it yet.
+
+        Args:
+            key: The call's cache key (tool name + arguments).
+            action: Tool name; tools outside self.tools always run.
+            call: Executes the tool and returns its observation.
+        """
+        if action not in self.tools:
+            return call()
+        result, future, owner = self._claim(key)
+        if result is not None:
+            logger.info(f"Shared observation hit for '{action}'")
+            return result
+        if not owner:
+            logger.info(f"Waiting on another agent's in-flight '{action}' call")
+            return future.result()
+        try:
+            result = call()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._settle(key, future, result)
+        return result
+
+    async def arun(self, key: str, action: str, call: Callable[[], Awaitable[str]]) -> str:
+        """Async counterpart of run(); waiters await the in-flight call without blocking the loop."""
+        if action not in self.tools:
+            return await call()
+        result, future, owner = self._claim(key)
+        if result is not None:
+            return result
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await call()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._settle(key, future, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "hits": self.hits, "joined": self.joined}
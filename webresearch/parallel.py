@@ -5,15 +5,75 @@ Inspired by gpt-researcher's parallel investigation architecture.
 
 import logging
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Dict, List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from .agent import ReActAgent
+from .fanout import FanOutController
 from .llm import LLMInterface
-from .tools import ToolManager
+from .observations import ObservationStore
+from .scheduler import WorkStealingScheduler
+from .tools import SearchTool, ToolManager
 
 logger = logging.getLogger(__name__)
 
+# A sub-question is only split if each part can get at least this many iterations
+_MIN_LEAF_ITERATIONS = 3
+
+
+class _IterationBudget:
+    """
+    ReAct iterations left for one run's whole decomposition tree.
+
+    Leaves reserve iterations just before they run and refund what their
+    sub-agent did not use (an early Final Answer or early stop), so a branch
+    that needs more can use them.  A reservation is capped at an even share
+    of what is left among the nodes still waiting to start, but never below
+    _MIN_LEAF_ITERATIONS while iterations remain, so early leaves cannot
+    starve the later ones.
+    """
+
+    def __init__(self, total: int, waiting: int):
+        self.total = total
+        self._left = total
+        self._waiting = waiting     # nodes queued but not yet researched or split
+        self._lock = threading.Lock()
+
+    @property
+    def used(self) -> int:
+        with self._lock:
+            return self.total - self._left
+
+    def share(self) -> int:
+        """Even share of the remaining iterations for one waiting node."""
+        with self._lock:
+            return self._left // max(1, self._waiting)
+
+    def split(self, parts: int) -> None:
+        """A waiting node was split into parts, which now wait in its place."""
+        with self._lock:
+            self._waiting += parts - 1
+
+    def drop(self) -> None:
+        """A waiting node will not run (cancelled)."""
+        self.split(0)
+
+    def reserve(self, want: int) -> int:
+        """Take up to want iterations for a waiting leaf that is starting; may be 0."""
+        with self._lock:
+            share = self._left // max(1, self._waiting)
+            granted = min(want, self._left, max(share, _MIN_LEAF_ITERATIONS))
+            self._waiting = max(0, self._waiting - 1)
+            self._left -= granted
+            return granted
+
+    def refund(self, unused: int) -> None:
+        with self._lock:
+            self._left += max(0, unused)
+
 
 class ParallelResearchAgent:
     """
@@ -21,11 +81,37 @@ class ParallelResearchAgent:
     then synthesizes all results into a comprehensive answer.
 
     Flow:
-      1. Decompose  — LLM breaks the query into max_sub_queries focused sub-questions
+      1. Decompose  — LLM breaks the query into up to max_sub_queries focused sub-questions
       2. Research   — Each sub-question is run by a lightweight mini-ReActAgent
                       concurrently via ThreadPoolExecutor (I/O-bound Gemini calls
                       release the GIL, so true concurrency is achieved)
       3. Synthesize — LLM merges all sub-results into one coherent answer
+
+    max_sub_queries and max_workers are upper bounds: a FanOutController
+    (fanout.py) picks the width from the planner's output and the provider's
+    throttling, and resizes the running pool from measured LLM latency and
+    429 rate.  get_fan_out() returns its decisions.
+
+    With max_depth > 1 decomposition is recursive: before researching a
+    sub-question, the planner may split it again (e.g. one lookup per item
+    of a "list 10 …" task), and the parts are merged into its answer.  All
+    nodes run on one WorkStealingScheduler, so idle workers pick up parts of
+    other branches until the whole tree resolves.  iteration_budget caps the
+    ReAct iterations of the whole tree: leaves draw up to sub_iterations
+    from one shared counter as they start and return what they leave unused
+    (see _IterationBudget).
+
+    Sub-agents of one run share an ObservationStore, so a search or page one
+    of them has fetched (or is fetching) is not fetched again by another.
+
+    With incremental=True, step 3 happens during step 2: each sub-result is
+    folded into a running draft as soon as it arrives, so the answer is ready
+    when the last sub-agent finishes.  With a deadline, sub-agents still
+    running when it passes are cancelled and the answer is built from the
+    sub-results collected so far.  Folds and the final synthesis run on a
+    separate thread and are held to the same deadline: once it passes, the
+    answer is the draft plus the sub-results not yet folded in, with no
+    further LLM call.
     """
 
     def __init__(
@@ -35,6 +121,12 @@ class ParallelResearchAgent:
         max_sub_queries: int = 4,
         sub_iterations: int = 8,
         max_workers: int = 3,
+        context_budget: Optional[int] = None,
+        incremental: bool = False,
+        deadline: Optional[float] = None,
+        max_depth: int = 1,
+        iteration_budget: Optional[int] = None,
+        early_stop: bool = True,
     ):
         self.llm = llm
         # tool_manager is shared across concurrent sub-agent threads.
@@ -45,7 +137,25 @@ class ParallelResearchAgent:
         self.max_sub_queries = max_sub_queries
         self.sub_iterations = sub_iterations
         self.max_workers = max_workers
+        self.context_budget = context_budget
+        self.incremental = incremental
+        # Seconds from the start of run() after which stragglers are cancelled
+        self.deadline = deadline or None
+        self.max_depth = max(1, max_depth)
+        # ReAct iterations for the whole tree (default: a flat run's worst case)
+        self.iteration_budget = iteration_budget or max_sub_queries * sub_iterations
+        self.early_stop = early_stop
         self._sub_results: List[Tuple[str, str]] = []
+        self._observations: Optional[ObservationStore] = None
+        self._cancel: Optional[threading.Event] = None
+        self._fan_out: Optional[FanOutController] = None
+        self._planned = 0
+        self._pool_size: Dict[int, int] = {}   # sub-question → pool size when it started
+        self._scheduler: Optional[WorkStealingScheduler] = None
+        self._tree: Dict[int, Dict] = {}        # sub-question → its node (parts, iterations)
+        self._budget = _IterationBudget(self.iteration_budget, 0)
+        self._iterations_saved = 0   # left unused by sub-agents that answered early
+        self._lock = threading.Lock()
 
     def run(
         self,
@@ -59,7 +169,7 @@ class ParallelResearchAgent:
         Args:
             task: The research question.
             sub_status_callback: Optional callable(idx, state, question=None, error=None).
-                state is one of: 'pending' | 'running' | 'done' | 'error'.
+                state is one of: 'pending' | 'running' | 'done' | 'error' | 'cancelled'.
                 error is set (str) when state == 'error'.
             context: Optional prior session context string. Passed only to
                 synthesis — decomposition always sees the raw task so prior
@@ -69,52 +179,141 @@ class ParallelResearchAgent:
             Synthesized final answer.
         """
         logger.info(f"ParallelResearchAgent starting: {task[:80]}")
+        started = time.monotonic()
 
         # ── 1. Decompose — raw task only, no session context ──────────────────
+        self._fan_out = FanOutController(self.llm, self.max_sub_queries, self.max_workers)
         sub_questions = self._decompose(task)
+        self._planned = len(sub_questions)
+        sub_questions = sub_questions[: self._fan_out.width(len(sub_questions))]
         logger.info(f"Decomposed into {len(sub_questions)} sub-questions")
 
         if sub_status_callback:
             for i, q in enumerate(sub_questions):
                 sub_status_callback(i, "pending", q)
 
-        # ── 2. Research in parallel ───────────────────────────────────────────
+        self._prefetch(sub_questions)
+
+        # ── 2. Research in parallel (folding into a draft if incremental) ─────
         results: Dict[int, Tuple[str, str]] = {}
+        self._observations = ObservationStore()
+        self._cancel = threading.Event()
+        draft = ""
+        in_draft: Set[int] = set()    # sub-results the draft already covers
+        failed: Set[int] = set()
+        to_fold: List[int] = []       # successful sub-results waiting to be folded, in completion order
+        folding = None                # (idx, future) of the fold in flight
+        stragglers: List[int] = []
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            future_to_idx = {
-                pool.submit(self._research_sub_question, q, i, sub_status_callback): i
-                for i, q in enumerate(sub_questions)
-            }
+        # Folds and the final synthesis run on their own thread so the
+        # coordinator can stop waiting on them when the deadline passes
+        synth = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deep-research-synth")
+
+        # The scheduler starts max_workers threads; how many run at once is
+        # the controller's `workers`, re-decided after each sub-question
+        workers = self._fan_out.initial_workers(len(sub_questions))
+        self._pool_size = {}
+        self._tree = {i: {"question": q} for i, q in enumerate(sub_questions)}
+        self._budget = _IterationBudget(self.iteration_budget, len(sub_questions))
+        self._iterations_saved = 0
 
-            for future in as_completed(future_to_idx):
-                idx = future_to_idx[future]
-                q = sub_questions[idx]
+        self._scheduler = WorkStealingScheduler(self.max_workers, limit=workers)
+        try:
+            try:
+                futures = {
+                    self._scheduler.submit(self._run_root, q, i, sub_status_callback): i
+                    for i, q in enumerate(sub_questions)
+                }
+                pending = set(futures)
+                while pending or folding is not None:
+                    time_left = self._time_left(started)
+                    if time_left == 0.0:
+                        break
+                    waiting = pending | ({folding[1]} if folding else set())
+                    done, _ = wait(waiting, timeout=time_left, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if folding is not None and future is folding[1]:
+                            folded = future.result()
+                            if folded is not None:
+                                draft = folded
+                                in_draft.add(folding[0])
+                            folding = None
+                            continue
+                        pending.discard(future)
+                        idx = futures[future]
+                        q = sub_questions[idx]
+                        try:
+                            answer = future.result()
+                            results[idx] = (q, answer)
+                            if sub_status_callback:
+                                sub_status_callback(idx, "done")
+                        except Exception as e:
+                            logger.error(f"Sub-query {idx} failed: {e}")
+                            results[idx] = (q, f"Research failed: {e}")
+                            failed.add(idx)
+                            if sub_status_callback:
+                                sub_status_callback(idx, "error", error=str(e))
+                            continue
+                        if self.incremental:
+                            to_fold.append(idx)
+
+                    if folding is None and to_fold:
+                        idx = to_fold.pop(0)
+                        q, answer = results[idx]
+                        folding = (idx, synth.submit(
+                            self._fold, task, draft, idx, len(sub_questions), q, answer, context
+                        ))
+
+                if folding is not None:
+                    logger.warning(f"Deadline passed while folding sub-result {folding[0] + 1} — dropping the fold")
+                stragglers = [i for i in range(len(sub_questions)) if i not in results]
+                if stragglers:
+                    logger.warning(
+                        f"Deadline of {self.deadline:g}s passed — cancelling {len(stragglers)} sub-agent(s)"
+                    )
+                    self._cancel.set()
+                    for i in stragglers:
+                        results[i] = (sub_questions[i], "Not finished before the deadline.")
+                        if sub_status_callback:
+                            sub_status_callback(i, "cancelled")
+            finally:
+                # Queued work is dropped; cancelled sub-agents stop at their next
+                # step, so don't wait for them
+                self._scheduler.shutdown(wait=not stragglers)
+
+            logger.info(f"Shared observations: {self._observations.stats()}")
+
+            # ── 3. Synthesize — sub-results + optional prior context ──────────
+            ordered = [results[i] for i in range(len(sub_questions))]
+            self._sub_results = ordered
+            # Finished sub-results the draft is missing: folds that failed or
+            # were dropped at the deadline (every one, without incremental)
+            unfolded = [i for i in range(len(sub_questions)) if i not in in_draft | failed and i not in stragglers]
+            if draft and not unfolded:
+                return draft + self._missing_note(sub_questions, stragglers)
+            time_left = self._time_left(started)
+            if time_left is None:
+                logger.info("Synthesizing sub-results")
+                return self._synthesize(task, ordered, context=context)
+            if time_left > 0:
+                logger.info(f"Synthesizing sub-results ({time_left:.1f}s left)")
                 try:
-                    answer = future.result()
-                    results[idx] = (q, answer)
-                    if sub_status_callback:
-                        sub_status_callback(idx, "done")
-                except Exception as e:
-                    logger.error(f"Sub-query {idx} failed: {e}")
-                    results[idx] = (q, f"Research failed: {e}")
-                    if sub_status_callback:
-                        sub_status_callback(idx, "error", error=str(e))
-
-        # ── 3. Synthesize — sub-results + optional prior context ──────────────
-        ordered = [results[i] for i in range(len(sub_questions))]
-        self._sub_results = ordered
-        logger.info("Synthesizing sub-results")
-        return self._synthesize(task, ordered, context=context)
+                    return synth.submit(self._synthesize, task, ordered, context).result(timeout=time_left)
+                except FuturesTimeout:
+                    logger.warning("Synthesis did not finish before the deadline — returning partial answer")
+            return self._partial_answer(draft, ordered, unfolded) + self._missing_note(sub_questions, stragglers)
+        finally:
+            synth.shutdown(wait=False, cancel_futures=True)
 
     # ── Internal helpers ──────────────────────────────────────────────────────
 
     def _decompose(self, task: str) -> List[str]:
-        """Ask the LLM to break the task into N focused sub-questions."""
+        """Ask the LLM to break the task into up to N focused sub-questions."""
         prompt = (
             f"You are a research planner. Break the following question into "
-            f"{self.max_sub_queries} focused sub-questions that together would "
-            f"answer the original question comprehensively.\n\n"
+            f"at most {self.max_sub_queries} focused sub-questions that together would "
+            f"answer the original question comprehensively. Use fewer for a narrow "
+            f"question — two are enough for a simple fact-finding task.\n\n"
             f"RESEARCH QUESTION: {task}\n\n"
             f"Each sub-question will be answered by an independent researcher who sees "
             f"only that sub-question — they cannot see the other sub-questions or their "
@@ -124,34 +323,143 @@ class ParallelResearchAgent:
             f"SUB-QUESTIONS:"
         )
         try:
-            response = self.llm.generate(prompt)
-            sub_questions = []
-            for line in response.strip().splitlines():
-                m = re.match(r"^\d+[.)]\s*(.+)", line.strip())
-                if m:
-                    sub_questions.append(m.group(1).strip())
+            sub_questions = self._parse_numbered(self.llm.generate(prompt))
             if len(sub_questions) >= 2:
                 return sub_questions[: self.max_sub_queries]
         except Exception as e:
             logger.warning(f"Decomposition failed: {e}, using original query")
         return [task]
 
+    def _split(self, question: str, depth: int, share: int) -> List[str]:
+        """
+        Ask the planner whether a sub-question needs several separate lookups.
+
+        Returns its parts, or [] to research it directly — always at
+        max_depth, or when its share of the remaining budget can't cover
+        two parts.
+        """
+        if depth >= self.max_depth or share < 2 * _MIN_LEAF_ITERATIONS:
+            return []
+        prompt = (
+            f"You are a research planner. A researcher is about to investigate the "
+            f"question below with a handful of web searches.\n\n"
+            f"QUESTION: {question}\n\n"
+            f"If answering it needs several separate lookups — e.g. one per item, "
+            f"occasion, source or time period it asks about — break it into at most "
+            f"{self.max_sub_queries} self-contained sub-questions, one per lookup. "
+            f"If one focused investigation can answer it, reply with the single word LEAF.\n\n"
+            f"Output ONLY a numbered list or LEAF. No preamble.\n"
+        )
+        try:
+            response = self.llm.generate(prompt)
+        except Exception as e:
+            logger.warning(f"Splitting failed at depth {depth}: {e}")
+            return []
+        if response.strip().upper().startswith("LEAF"):
+            return []
+        parts = self._parse_numbered(response)
+        parts = parts[: min(self.max_sub_queries, share // _MIN_LEAF_ITERATIONS)]
+        return parts if len(parts) >= 2 else []
+
+    @staticmethod
+    def _parse_numbered(response: str) -> List[str]:
+        items = []
+        for line in response.strip().splitlines():
+            m = re.match(r"^\d+[.)]\s*(.+)", line.strip())
+            if m:
+                items.append(m.group(1).strip())
+        return items
+
+    def _prefetch(self, sub_questions: List[str]) -> None:
+        """
+        Search every sub-question in one batch request to warm the search cache.
+
+        Sub-agents usually open with a search for their own sub-question; with
+        the results already cached that first search costs no round-trip.
+        Skipped when the search tool has no cache to warm.
+        """
+        search = self.tool_manager.get_tool("search")
+        if len(sub_questions) < 2 or not isinstance(search, SearchTool) or search.cache is None:
+            return
+        try:
+            search.search_many(sub_questions)
+        except Exception as e:
+            logger.warning(f"Search prefetch failed: {e}")
+
+    def _time_left(self, started: float) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() - started))
+
+    def _run_root(self, question: str, idx: int, sub_status_callback: Optional[Callable] = None) -> str:
+        """Scheduler task for a top-level sub-question; resizes the pool when it ends."""
+        self._pool_size[idx] = self._scheduler.limit
+        try:
+            return self._research_sub_question(question, idx, sub_status_callback)
+        finally:
+            if self._scheduler.pending():
+                self._scheduler.resize(self._fan_out.adjust(self._scheduler.limit))
+
     def _research_sub_question(
         self,
         question: str,
         idx: int,
         sub_status_callback: Optional[Callable] = None,
     ) -> str:
-        """Run a mini ReAct loop for a single sub-question."""
+        """Research a single top-level sub-question (splitting it further if max_depth allows)."""
         if sub_status_callback:
             sub_status_callback(idx, "running")
+        return self._research_node(question, 1, self._tree[idx])
+
+    def _research_node(self, question: str, depth: int, node: Dict) -> str:
+        """Answer one node of the decomposition tree, forking its parts onto the scheduler."""
+        if self._cancel.is_set():
+            self._budget.drop()
+            return "Not finished before the deadline."
+        parts = self._split(question, depth, self._budget.share())
+        if not parts:
+            return self._research_leaf(question, node)
+
+        logger.info(f"Split at depth {depth} into {len(parts)} parts: {question[:60]}")
+        self._budget.split(len(parts))
+        node["parts"] = [{"question": p} for p in parts]
+        futures = [
+            self._scheduler.fork(self._research_node, p, depth + 1, child)
+            for p, child in zip(parts, node["parts"])
+        ]
+        results = []
+        for p, future in zip(parts, futures):
+            try:
+                results.append((p, self._scheduler.join(future)))
+            except Exception as e:
+                results.append((p, f"Research failed: {e}"))
+        return self._synthesize(question, results)
+
+    def _research_leaf(self, question: str, node: Dict) -> str:
+        """Run a mini ReAct loop for a single (sub-)question on iterations reserved from the budget."""
+        iterations = self._budget.reserve(self.sub_iterations)
+        if iterations <= 0:
+            return "Not researched — the run's iteration budget is used up."
 
         mini_agent = ReActAgent(
             llm=self.llm,
             tool_manager=self.tool_manager,
-            max_iterations=self.sub_iterations,
+            max_iterations=iterations,
+            context_budget=self.context_budget,
+            observations=self._observations,
+            cancel=self._cancel,
+            early_stop=self.early_stop,
         )
-        return mini_agent.run(question)
+        try:
+            answer = mini_agent.run(question)
+        finally:
+            # Iterations, not steps: an early answer adds a step to its iteration
+            used = mini_agent.steps[-1].iteration if mini_agent.steps else 0
+            self._budget.refund(iterations - used)
+        node["iterations"] = used
+        with self._lock:
+            self._iterations_saved += mini_agent.saved_iterations
+        return answer
 
     def _synthesize(
         self,
@@ -192,12 +500,95 @@ class ParallelResearchAgent:
                 fallback.append(f"\n## {i}. {q}\n{a[:800]}")
             return "\n".join(fallback)
 
+    def _fold(
+        self,
+        task: str,
+        draft: str,
+        idx: int,
+        total: int,
+        question: str,
+        answer: str,
+        context: str = "",
+    ) -> Optional[str]:
+        """
+        Fold one sub-result into the running draft.
+
+        Returns the updated draft, or None if the LLM call failed (the caller
+        then falls back to a full synthesis at the end).
+        """
+        parts = [
+            "You are a research synthesizer building an answer incrementally, "
+            "one parallel investigation at a time.\n",
+            f"ORIGINAL QUESTION: {task}\n",
+        ]
+        if context:
+            parts.append(
+                f"SESSION CONTEXT (prior research in this session — reference "
+                f"only if directly relevant to the question above):\n{context}\n"
+            )
+        parts.append(f"CURRENT DRAFT:\n{draft or '(none yet — these are the first findings)'}\n")
+        preview = answer[:1500] + ("…" if len(answer) > 1500 else "")
+        parts.append(f"NEW FINDINGS — sub-query {idx + 1} of {total}: {question}\n{preview}")
+        parts.append(
+            f"\n\nRewrite the draft into a comprehensive, well-structured answer to: {task}\n"
+            f"Keep everything in the current draft that is still accurate and integrate "
+            f"the new findings. Note any conflicting information. Cite sources where "
+            f"mentioned above. Output only the updated answer."
+        )
+        try:
+            return self.llm.generate("\n".join(parts))
+        except Exception as e:
+            logger.warning(f"Folding sub-result {idx + 1} failed: {e}")
+            return None
+
+    @staticmethod
+    def _missing_note(sub_questions: List[str], stragglers: List[int]) -> str:
+        if not stragglers:
+            return ""
+        lines = "\n".join(f"- {sub_questions[i]}" for i in stragglers)
+        return f"\n\n_Not covered — these sub-questions did not finish before the deadline:_\n{lines}"
+
+    @staticmethod
+    def _partial_answer(draft: str, sub_results: List[Tuple[str, str]], unfolded: List[int]) -> str:
+        """The draft plus the raw sub-results it is missing — no LLM call, for when time is up."""
+        parts = [draft] if draft else ["Research findings (not synthesized before the deadline):\n"]
+        for i in unfolded:
+            q, a = sub_results[i]
+            parts.append(f"\n## {i + 1}. {q}\n{a[:800]}")
+        return "\n".join(parts)
+
+    def get_observation_stats(self) -> Dict[str, int]:
+        """Tool calls executed vs. served from the shared store in the last run."""
+        if self._observations is None:
+            return {"calls": 0, "hits": 0, "joined": 0}
+        return self._observations.stats()
+
+    def get_fan_out(self) -> Dict:
+        """Width and pool-size decisions of the last run, with the signals behind each."""
+        if self._fan_out is None:
+            return {}
+        return {
+            "planned": self._planned,
+            "width": len(self._sub_results),
+            "decisions": list(self._fan_out.decisions),
+            "max_depth": self.max_depth,
+            "iteration_budget": self.iteration_budget,
+            "iterations_used": self._budget.used,
+            "iterations_saved": self._iterations_saved,
+            "scheduler": self._scheduler.stats() if self._scheduler else {},
+        }
+
     def get_execution_trace(self) -> List[Dict]:
-        return [
-            {
+        trace = []
+        for i, (q, a) in enumerate(self._sub_results):
+            entry = {
                 "sub_query": i + 1,
                 "question": q,
                 "answer_preview": a[:200],
+                "workers": self._pool_size.get(i),
             }
-            for i, (q, a) in enumerate(self._sub_results)
-        ]
+            node = self._tree.get(i, {})
+            if "parts" in node:
+                entry["parts"] = node["parts"]
+            trace.append(entry)
+        return trace
@@ -0,0 +1,283 @@
+"""
+Per-provider rate-limit scheduling for LLM calls.
+
+ModelFallbackChain used to serialise every call to a provider behind a
+Semaphore(1), so parallel sub-agents ran their LLM calls one at a time even
+when the account's quota allowed far more.  A RateLimiter instead admits a
+call when all of the provider's budgets allow it:
+
+  - requests per minute   (token bucket, burst = one minute's worth)
+  - tokens per minute     (token bucket charged with the prompt's estimate)
+  - max in-flight calls   (concurrency cap)
+
+When a provider answers 429 with a retry hint (`retry_delay { seconds: N }`,
+"try again in 6.2s"), the interface calls defer() so every caller waiting on
+that provider pauses for the hinted time instead of each discovering the
+limit with its own failed request.
+
+Limits come from DEFAULT_RATE_LIMITS (free-tier figures) and can be
+overridden with the RATE_LIMITS env var, e.g.::
+
+    RATE_LIMITS="gemini=rpm:1000,tpm:1000000,inflight:8;groq=inflight:2"
+
+A RateLimiter only coordinates threads of one process.  Batch runs that use
+several processes (see batch.py) start a RateLimitManager holding one
+limiter per provider and install SharedRateLimiter proxies in each worker
+with use_shared_limiters(), so the whole pool stays within a single budget.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, replace
+from multiprocessing.managers import BaseManager
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Budgets for one provider.  None means unlimited."""
+
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+    max_in_flight: int = 1
+
+
+# Free-tier limits of the default model for each preset in cli._build_llm_chain
+DEFAULT_RATE_LIMITS: Dict[str, RateLimit] = {
+    "gemini": RateLimit(rpm=10, tpm=250_000, max_in_flight=4),
+    "groq": RateLimit(rpm=30, tpm=12_000, max_in_flight=2),
+    "openrouter": RateLimit(rpm=20, max_in_flight=2),
+    "ollama": RateLimit(max_in_flight=1),   # one local GPU — requests queue anyway
+}
+
+_SPEC_KEYS = {"rpm": "rpm", "tpm": "tpm", "inflight": "max_in_flight"}
+
+
+class TokenBucket:
+    """Continuous-refill token bucket.  Not thread-safe on its own — RateLimiter locks it."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        self._refill(now)
+        # A single request larger than the bucket is admitted once it is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Thread- and asyncio-safe admission control for one provider.
+
+    Use `with limiter.slot(tokens):` around a blocking call, or
+    `async with limiter.aslot(tokens):` inside a coroutine.
+    """
+
+    def __init__(self, limit: Optional[RateLimit] = None, name: str = ""):
+        self.limit = limit or RateLimit()
+        self.name = name
+        self._requests = TokenBucket(self.limit.rpm) if self.limit.rpm else None
+        self._tokens = TokenBucket(self.limit.tpm) if self.limit.tpm else None
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _try_acquire(self, tokens: int) -> Optional[float]:
+        """
+        Take a slot if every budget allows it.  Returns 0.0 on success, the
+        seconds to wait for a budget to refill, or None when only the
+        in-flight cap is in the way (wait for a release).  Caller holds _cond.
+        """
+        now = time.monotonic()
+        wait = max(0.0, self._blocked_until - now)
+        if self._requests:
+            wait = max(wait, self._requests.wait_time(1, now))
+        if self._tokens and tokens:
+            wait = max(wait, self._tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        if self._in_flight >= self.limit.max_in_flight:
+            return None
+        if self._requests:
+            self._requests.take(1)
+        if self._tokens and tokens:
+            self._tokens.take(tokens)
+        self._in_flight += 1
+        return 0.0
+
+    def try_acquire(self, tokens: int = 0) -> Optional[float]:
+        """Non-blocking _try_acquire(); see there for the return values."""
+        with self._cond:
+            return self._try_acquire(tokens)
+
+    def acquire(self, tokens: int = 0) -> None:
+        with self._cond:
+            while True:
+                wait = self._try_acquire(tokens)
+                if wait == 0.0:
+                    return
+                self._cond.wait(timeout=wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return
+            # Releases happen on other threads too, so poll instead of awaiting a notify
+            await asyncio.sleep(min(wait, 1.0) if wait else 0.05)
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, tokens: int = 0):
+        self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        await self.aacquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def in_flight_count(self) -> int:
+        """in_flight as a method, for RateLimitManager proxies."""
+        return self._in_flight
+
+    def defer(self, seconds: float) -> None:
+        """Hold back new calls for `seconds` — fed by the provider's retry-after hint."""
+        with self._cond:
+            until = time.monotonic() + seconds
+            if until > self._blocked_until:
+                self._blocked_until = until
+                logger.info(f"[{self.name or 'provider'}] pausing new requests for {seconds:.1f}s")
+            self._cond.notify_all()
+
+
+class RateLimitManager(BaseManager):
+    """Manager process that owns RateLimiters shared by a pool of worker processes."""
+
+
+RateLimitManager.register(
+    "RateLimiter",
+    RateLimiter,
+    exposed=("try_acquire", "acquire", "release", "defer", "in_flight_count"),
+)
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    RateLimiter backed by a RateLimitManager proxy.
+
+    Every call is forwarded to the manager process, so the budgets are shared
+    with all other processes holding a proxy to the same limiter.  Blocking
+    acquire() waits in the manager; aacquire() polls try_acquire() as usual.
+    """
+
+    def __init__(self, proxy, limit: Optional[RateLimit] = None, name: str = ""):
+        super().__init__(limit, name)
+        self._proxy = proxy
+
+    @property
+    def in_flight(self) -> int:
+        return self._proxy.in_flight_count()
+
+    def try_acquire(self, tokens: int = 0) -> Optional[float]:
+        return self._proxy.try_acquire(tokens)
+
+    def acquire(self, tokens: int = 0) -> None:
+        self._proxy.acquire(tokens)
+
+    def release(self) -> None:
+        self._proxy.release()
+
+    def defer(self, seconds: float) -> None:
+        self._proxy.defer(seconds)
+
+
+# Limiters installed by use_shared_limiters(), returned by rate_limit_for()
+_shared_limiters: Dict[str, RateLimiter] = {}
+
+
+def use_shared_limiters(limiters: Dict[str, RateLimiter]) -> None:
+    """Make rate_limit_for() hand out these limiters (keyed by provider) in this process."""
+    _shared_limiters.clear()
+    _shared_limiters.update(limiters)
+
+
+def parse_rate_limits(spec: str) -> Dict[str, RateLimit]:
+    """
+    Parse "provider=key:value,...;provider=..." into RateLimit overrides.
+
+    Keys are rpm, tpm and inflight; a value of 0 means unlimited.  Entries
+    that don't parse are logged and skipped.
+    """
+    overrides: Dict[str, RateLimit] = {}
+    for entry in filter(None, (e.strip() for e in spec.split(";"))):
+        provider, _, settings = entry.partition("=")
+        provider = provider.strip().lower()
+        limit = DEFAULT_RATE_LIMITS.get(provider, RateLimit())
+        try:
+            for item in filter(None, (i.strip() for i in settings.split(","))):
+                key, _, value = item.partition(":")
+                field_name = _SPEC_KEYS[key.strip().lower()]
+                number = int(value)
+                if field_name == "max_in_flight":
+                    limit = replace(limit, max_in_flight=max(1, number))
+                else:
+                    limit = replace(limit, **{field_name: number or None})
+        except (KeyError, ValueError):
+            logger.warning(f"Ignoring malformed RATE_LIMITS entry: {entry!r}")
+            continue
+        overrides[provider] = limit
+    return overrides
+
+
+def rate_limits_for(cfg) -> Dict[str, RateLimit]:
+    """DEFAULT_RATE_LIMITS with the Config's RATE_LIMITS overrides applied."""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    if cfg.rate_limits:
+        limits.update(parse_rate_limits(cfg.rate_limits))
+    return limits
+
+
+def rate_limit_for(cfg, provider: str) -> Union[RateLimit, RateLimiter]:
+    """
+    RateLimit for a provider preset key, with RATE_LIMITS overrides from a Config applied.
+
+    Inside a batch worker the provider's shared limiter is returned instead,
+    so the interface draws on the pool-wide budget.
+    """
+    if provider in _shared_limiters:
+        return _shared_limiters[provider]
+    return rate_limits_for(cfg).get(provider, RateLimit())
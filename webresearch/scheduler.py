@@ -0,0 +1,193 @@
+"""
+Work-stealing task scheduler for recursive deep research.
+
+With recursive decomposition a sub-question can split into sub-sub-questions
+while it runs, so work appears unevenly: one branch of a survey question may
+fan out into ten lookups while its siblings finish after one search.  A
+plain ThreadPoolExecutor runs each submitted root on one thread, leaving the
+other threads idle while that branch grinds through its children serially.
+
+WorkStealingScheduler keeps every worker busy until the whole tree resolves:
+
+  submit()  queues a root task on the shared injection queue (FIFO)
+  fork()    called from inside a task, pushes a child task on the calling
+            worker's own deque
+  join()    waits for a forked task; while it is pending the waiting worker
+            runs tasks itself — its own newest first, then the oldest task
+            of another worker (stealing) — instead of blocking
+
+Idle workers take work from their own deque, then the injection queue, then
+steal.  `limit` caps how many workers run tasks at once and may be changed
+while running (see fanout.py); workers past the cap park between tasks.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_Task = Tuple[Future, Callable[..., Any], tuple]
+
+
+class _Worker:
+    def __init__(self, index: int):
+        self.index = index
+        self.tasks: Deque[_Task] = deque()
+
+
+class WorkStealingScheduler:
+    """
+    Fixed set of worker threads sharing tasks by work stealing.
+
+    Args:
+        workers: Worker threads to start.
+        limit: Workers allowed to run tasks at once (default: all of them).
+    """
+
+    def __init__(self, workers: int, limit: Optional[int] = None):
+        self.workers = max(1, workers)
+        self._limit = max(1, min(limit or self.workers, self.workers))
+        self._inject: Deque[_Task] = deque()
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._active = 0
+        self._stopped = False
+        self.steals = 0
+        self.executed = 0
+        self._workers = [_Worker(i) for i in range(self.workers)]
+        self._threads = [
+            threading.Thread(target=self._loop, args=(w,), name=f"research-worker-{w.index}", daemon=True)
+            for w in self._workers
+        ]
+        for t in self._threads:
+            t.start()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def resize(self, limit: int) -> None:
+        """Change how many workers may run tasks at once."""
+        with self._cond:
+            self._limit = max(1, min(limit, self.workers))
+            self._cond.notify_all()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a root task; returns its Future."""
+        return self._push(self._inject, fn, args)
+
+    def fork(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a child task on the calling worker (or as a root outside a worker)."""
+        worker = getattr(self._local, "worker", None)
+        return self._push(worker.tasks if worker else self._inject, fn, args)
+
+    def join(self, future: Future) -> Any:
+        """Wait for future, running other tasks on this worker meanwhile."""
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            return future.result()
+        future.add_done_callback(lambda _: self._notify())
+        while not future.done():
+            with self._cond:
+                task = self._take(worker, helping=True)
+                if task is None:
+                    if future.done():
+                        break
+                    self._cond.wait(timeout=0.5)
+                    continue
+            self._run(task)
+        return future.result()
+
+    def pending(self) -> int:
+        """Tasks queued and not yet started."""
+        with self._cond:
+            return len(self._inject) + sum(len(w.tasks) for w in self._workers)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop taking tasks; running tasks finish.  Queued tasks are cancelled."""
+        with self._cond:
+            self._stopped = True
+            queued = list(self._inject) + [t for w in self._workers for t in w.tasks]
+            self._inject.clear()
+            for w in self._workers:
+                w.tasks.clear()
+            self._cond.notify_all()
+        for future, _, _ in queued:
+            future.cancel()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _push(self, queue: Deque[_Task], fn: Callable[..., Any], args: tuple) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._stopped:
+                future.cancel()
+                return future
+            queue.append((future, fn, args))
+            self._cond.notify_all()
+        return future
+
+    def _notify(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def _take(self, worker: _Worker, helping: bool = False) -> Optional[_Task]:
+        """Next task for worker, or None.  Caller holds _cond."""
+        if self._stopped:
+            return None
+        if worker.tasks:
+            return worker.tasks.pop()
+        # A worker waiting in join() only helps with forked work: picking up
+        # a new root would hold its own parent back
+        if not helping and self._inject:
+            return self._inject.popleft()
+        n = self.workers
+        for k in range(1, n):
+            victim = self._workers[(worker.index + k) % n]
+            if victim.tasks:
+                self.steals += 1
+                return victim.tasks.popleft()
+        return None
+
+    def _loop(self, worker: _Worker) -> None:
+        self._local.worker = worker
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    task = self._take(worker) if self._active < self._limit else None
+                    if task is not None:
+                        self._active += 1
+                        break
+                    self._cond.wait()
+            try:
+                self._run(task)
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._cond.notify_all()
+
+    def _run(self, task: _Task) -> None:
+        future, fn, args = task
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        with self._cond:
+            self.executed += 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"workers": self.workers, "limit": self._limit, "executed": self.executed, "steals": self.steals}
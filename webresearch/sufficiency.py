@@ -0,0 +1,112 @@
+"""
+Cheap sufficiency check for the ReAct loop.
+
+ReActAgent.run used to stop only on a Final Answer or at max_iterations, so
+a factoid question whose first search came back with a direct answer still
+paid for several more full-history LLM steps before the model chose to
+answer.  After each observation the agent now asks sufficient_evidence()
+whether the step already holds a direct answer to the task.  This is plain
+string matching — no LLM call — and passes only when:
+
+  - the task is a single, simple question (not a list / comparison /
+    explanation, which a one-line answer can't cover);
+  - a search step returned an answer box with a direct answer; and
+  - the searched query plus that answer mention every entity of the task
+    (capitalised names, numbers) and most of its other key terms.
+
+On a hit the agent makes one short synthesis call from that evidence
+instead of continuing the loop; the model can still reply INSUFFICIENT, in
+which case the loop carries on as before.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .tools.cache import normalize_query
+
+# Tasks a single answer-box line cannot satisfy
+_COMPOUND_RE = re.compile(
+    r"\b(list|compare|comparison|versus|vs|explain|why|analy[sz]e|summari[sz]e|pros|cons|"
+    r"history|steps|each|all|statements|occasions|timeline|report|detailed|overview)\b",
+    re.IGNORECASE,
+)
+_MAX_TASK_CHARS = 200
+
+# "Answer: …" under a search observation's ANSWER BOX heading
+_ANSWER_BOX_RE = re.compile(r"ANSWER BOX:\s*\n=+\s*\nAnswer: *(\S.*)")
+# "query: answer" lines under search_many's ANSWER BOXES heading
+_ANSWER_BOXES_RE = re.compile(r"ANSWER BOXES:\s*\n=+\s*\n((?:.+\n?)+)")
+
+# Capitalised words after the first, and numbers
+_ENTITY_RE = re.compile(r"(?<!^)(?<![.?!]\s)\b[A-Z][\w'-]+|\b\d[\d.,]*\b")
+
+# Question words, prepositions and other glue that say nothing about what an
+# answer must mention — normalize_query keeps them, since they change a search
+_FUNCTION_WORDS = frozenset({
+    "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is",
+    "it", "of", "on", "or", "that", "this", "to", "was", "were", "what",
+    "when", "where", "which", "who", "with",
+})
+
+# Share of the task's non-entity key terms the query + answer must mention
+_MIN_TERM_COVERAGE = 0.6
+
+
+def is_simple_task(task: str) -> bool:
+    """True for a single, short question that one direct answer can settle."""
+    return (
+        len(task) <= _MAX_TASK_CHARS
+        and task.count("?") <= 1
+        and not _COMPOUND_RE.search(task)
+    )
+
+
+def answer_boxes(action: str, params: Dict[str, Any], observation: str) -> List[Tuple[str, str]]:
+    """(query, direct answer) pairs carried by one search / search_many observation."""
+    if action == "search":
+        m = _ANSWER_BOX_RE.search(observation)
+        return [(str(params.get("query", "")), m.group(1).strip())] if m else []
+    if action == "search_many":
+        m = _ANSWER_BOXES_RE.search(observation)
+        if not m:
+            return []
+        boxes = []
+        for line in m.group(1).splitlines():
+            query, sep, answer = line.partition(": ")
+            if sep and answer.strip():
+                boxes.append((query, answer.strip()))
+        return boxes
+    return []
+
+
+def covers_task(task: str, text: str) -> bool:
+    """True when text mentions every entity of the task and most of its key terms."""
+    low = text.lower()
+    entities = {e.lower().rstrip(".,") for e in _ENTITY_RE.findall(task.strip())}
+    if any(e not in low for e in entities):
+        return False
+    terms = [
+        t for t in normalize_query(task).split()
+        if t not in entities and t not in _FUNCTION_WORDS and len(t) > 2
+    ]
+    if not terms:
+        return bool(entities)
+    return sum(t in low for t in terms) / len(terms) >= _MIN_TERM_COVERAGE
+
+
+def sufficient_evidence(task: str, calls: Iterable[Tuple[str, Dict[str, Any], Optional[str]]]) -> Optional[str]:
+    """
+    Return the direct answer that settles the task, or None.
+
+    Args:
+        task: The agent's task.
+        calls: (action, action_input, observation) for each call of the
+               latest step.
+    """
+    if not is_simple_task(task):
+        return None
+    for action, params, observation in calls:
+        for query, answer in answer_boxes(action, params, observation or ""):
+            if covers_task(task, f"{query}\n{answer}"):
+                return f"Search: {query}\nAnswer box: {answer}\n\n{observation}"
+    return None
@@ -5,13 +5,16 @@ Provides a registry and manager for all available tools.
 
 from typing import Dict, List, Optional
 from .base import Tool
-from .search import SearchTool
+from .search import MultiSearchTool, SearchTool
 from .scrape import ScrapeTool
 from .browser import BrowserScrapeTool, playwright_available
 from .code_executor import CodeExecutorTool
 from .file_ops import FileOpsTool
 from .pdf import PDFExtractTool, pdf_available
 from .think import ThinkTool
+from .cache import DiskCache, build_fetch_cache, build_pdf_cache, build_search_cache, normalize_query, normalize_url
+from .http import HTTPClientMixin, HTTPSessionPool, build_http_pool
+from .parse_pool import ParsePool, ParsePoolMixin, build_parse_pool
 
 import logging
 
@@ -21,9 +24,23 @@ logger = logging.getLogger(__name__)
 class ToolManager:
     """Manages registration and access to tools."""
 
-    def __init__(self):
-        """Initialize the tool manager with an empty registry."""
+    def __init__(
+        self,
+        http_pool: Optional[HTTPSessionPool] = None,
+        parse_pool: Optional[ParsePool] = None,
+    ):
+        """
+        Initialize the tool manager with an empty registry.
+
+        Args:
+            http_pool: Optional shared keep-alive session pool.  When set, every
+                       network tool registered here reuses its connections.
+            parse_pool: Optional process pool that scrape and pdf_extract hand
+                        their CPU-bound parsing to.
+        """
         self.tools: Dict[str, Tool] = {}
+        self.http_pool = http_pool
+        self.parse_pool = parse_pool
 
     def register_tool(self, tool: Tool) -> None:
         """
@@ -38,6 +55,20 @@ class ToolManager:
         if tool.name in self.tools:
             raise ValueError(f"Tool with name '{tool.name}' is already registered")
 
+        if (
+            self.http_pool is not None
+            and isinstance(tool, HTTPClientMixin)
+            and tool.session is None
+        ):
+            tool.bind_session(self.http_pool.session)
+
+        if (
+            self.parse_pool is not None
+            and isinstance(tool, ParsePoolMixin)
+            and tool.parse_pool is None
+        ):
+            tool.bind_parse_pool(self.parse_pool)
+
         self.tools[tool.name] = tool
         logger.info(f"Registered tool: {tool.name}")
 
@@ -108,11 +139,35 @@ class ToolManager:
             logger.error(f"Tool execution failed: {str(e)}")
             return f"Error executing tool '{name}': {str(e)}"
 
+    async def aexecute_tool(self, name: str, **kwargs) -> str:
+        """
+        Async variant of execute_tool() — awaits the tool's aexecute().
+
+        Args:
+            name: The name of the tool to execute
+            **kwargs: Tool-specific parameters
+
+        Returns:
+            The result of the tool execution, or an error string
+        """
+        tool = self.get_tool(name)
+        if not tool:
+            available_tools = ", ".join(self.tools.keys())
+            return f"Error: Tool '{name}' not found. Available tools: {available_tools}"
+
+        try:
+            logger.info(f"Executing tool (async): {name} with params: {list(kwargs.keys())}")
+            return await tool.aexecute(**kwargs)
+        except Exception as e:
+            logger.error(f"Tool execution failed: {str(e)}")
+            return f"Error executing tool '{name}': {str(e)}"
+
 
 __all__ = [
     "Tool",
     "ToolManager",
     "SearchTool",
+    "MultiSearchTool",
     "ScrapeTool",
     "BrowserScrapeTool",
     "playwright_available",
@@ -121,4 +176,16 @@ __all__ = [
     "PDFExtractTool",
     "pdf_available",
     "ThinkTool",
+    "DiskCache",
+    "build_fetch_cache",
+    "build_pdf_cache",
+    "build_search_cache",
+    "normalize_query",
+    "normalize_url",
+    "HTTPClientMixin",
+    "HTTPSessionPool",
+    "build_http_pool",
+    "ParsePool",
+    "ParsePoolMixin",
+    "build_parse_pool",
 ]
@@ -3,6 +3,8 @@ Base tool class for the agent's tool system.
 This provides a simple, extensible interface for adding new tools.
 """
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 import logging
@@ -18,6 +20,7 @@ class Tool(ABC):
     - name: unique identifier for the tool
     - description: what the tool does (used by the LLM to decide when to use it)
     - execute: the actual tool logic
+    - aexecute: async variant; defaults to running execute in a worker thread
     """
 
     def __init__(self):
@@ -56,6 +59,17 @@ class Tool(ABC):
         """
         pass
 
+    async def aexecute(self, **kwargs) -> str:
+        """
+        Async variant of execute() used by AsyncReActAgent.
+
+        The default adapter runs the blocking execute() in the event loop's
+        default executor so existing tools work unchanged.  Tools with a native
+        non-blocking implementation (or no I/O at all) should override this.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.execute, **kwargs))
+
     def _validate(self) -> None:
         """Validate that the tool is properly configured."""
         if not self.name:
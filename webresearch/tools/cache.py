@@ -0,0 +1,307 @@
+"""
+Persistent on-disk cache shared across runs and processes.
+
+Entries live under ~/.webresearch/cache/<namespace>/, one file per key, named by
+the SHA-256 of the normalised key.  Each file holds a one-line JSON header
+(metadata + store time) followed by the raw body bytes.  Writes go through a
+temp file + os.replace so concurrent processes never observe a torn entry.
+
+Eviction is TTL-based on read and size-based LRU on write: every hit bumps the
+file's mtime, and when the namespace exceeds max_bytes the least recently used
+files are deleted until it is back under the low-water mark.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only identify the referrer and never change page content
+_TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref_src",
+})
+
+# Eviction trims down to this fraction of max_bytes so every write near the cap
+# doesn't trigger another directory scan.
+_LOW_WATER = 0.9
+
+# Articles and politeness filler, dropped when building search-cache keys.
+# Question words, prepositions, tense and conjunctions stay: "when/where did
+# X die" and "flights from A to B / to A from B" are different searches.
+_STOPWORDS = frozenset({"a", "an", "the", "please"})
+
+# A quoted phrase, or a run of non-space characters
+_QUERY_TOKEN_RE = re.compile(r'"[^"]*"|\S+')
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalise a URL for use as a cache key.
+
+    Lower-cases scheme and host, drops default ports, fragments and tracking
+    parameters (utm_*, fbclid, …), and sorts the remaining query string so
+    equivalent links share one entry.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    if parts.username:
+        host = f"{parts.username}@{host}"
+
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonicalise a search query for use as a cache key.
+
+    Lower-cases, collapses whitespace, strips trailing punctuation from bare
+    words and drops articles, so "What is the GDP of France?" and
+    "what is  GDP of france" share one entry.  Quoted phrases and operator terms (site:, -word) are
+    kept verbatim apart from case, since they change what Google returns.
+    """
+    terms = []
+    for token in _QUERY_TOKEN_RE.findall(query.lower()):
+        if token.startswith('"') or ":" in token or token.startswith("-"):
+            terms.append(" ".join(token.split()))
+            continue
+        word = token.strip(".,;!?()[]{}'")
+        if word and word not in _STOPWORDS:
+            terms.append(word)
+    # A query made only of stopwords ("The The") is kept whole
+    return " ".join(terms) or " ".join(query.lower().split())
+
+
+def default_cache_root() -> Path:
+    return Path.home() / ".webresearch" / "cache"
+
+
+@dataclass
+class CacheEntry:
+    """A cached body plus the metadata stored alongside it."""
+
+    body: bytes
+    meta: Dict[str, Any] = field(default_factory=dict)
+    stored_at: float = 0.0
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class DiskCache:
+    """
+    Content-addressed key/value store on disk with TTL and size-bounded LRU.
+
+    Args:
+        namespace: Sub-directory under the cache root (e.g. "fetch", "search").
+        ttl: Seconds an entry is considered fresh.  Stale entries are still
+             returned by get() so callers can revalidate them.
+        max_bytes: Soft cap on the namespace's total size.
+        max_entry_bytes: Bodies larger than this are never stored.
+        root: Override the cache root (defaults to ~/.webresearch/cache).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = 86400,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entry_bytes: int = 8 * 1024 * 1024,
+        root: Optional[Path] = None,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.path = Path(root or default_cache_root()) / namespace
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # guards _approx_bytes
+        self._approx_bytes: Optional[int] = None
+
+    def _file_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.path / f"{digest}.bin"
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age() < self.ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key (fresh or stale), or None on miss."""
+        path = self._file_for(key)
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+
+        header, sep, body = raw.partition(b"\n")
+        if not sep:
+            return None
+        try:
+            record = json.loads(header.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            logger.debug(f"Discarding corrupt cache entry {path.name}")
+            self._unlink(path)
+            return None
+
+        try:
+            os.utime(path)  # LRU bump
+        except OSError:
+            pass
+        return CacheEntry(
+            body=body,
+            meta=record.get("meta", {}),
+            stored_at=float(record.get("stored_at", 0.0)),
+        )
+
+    def set(self, key: str, body: bytes, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Store body under key.  Returns False if the body exceeds max_entry_bytes."""
+        if len(body) > self.max_entry_bytes:
+            return False
+        record = {"key": key, "stored_at": time.time(), "meta": meta or {}}
+        self._write(self._file_for(key), json.dumps(record).encode("utf-8") + b"\n" + body)
+        return True
+
+    def refresh(self, key: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Reset an entry's store time (e.g. after a 304), optionally merging new metadata."""
+        entry = self.get(key)
+        if entry is None:
+            return
+        merged = dict(entry.meta)
+        merged.update({k: v for k, v in (meta or {}).items() if v})
+        self.set(key, entry.body, merged)
+
+    def delete(self, key: str) -> None:
+        self._unlink(self._file_for(key))
+
+    def clear(self) -> None:
+        for path in self.path.glob("*.bin"):
+            self._unlink(path)
+        with self._lock:
+            self._approx_bytes = 0
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Cache write failed for {path.name}: {e}")
+            self._unlink(Path(tmp))
+            return
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_size()
+            else:
+                self._approx_bytes += len(data)
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self.path.glob("*.bin"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until the namespace is under the low-water mark."""
+        files = []
+        for path in self.path.glob("*.bin"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * _LOW_WATER)
+        files.sort()
+        evicted = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            self._unlink(path)
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._approx_bytes = total
+        if evicted:
+            logger.info(f"Evicted {evicted} entries from {self.path.name} cache")
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def build_fetch_cache(cfg) -> Optional[DiskCache]:
+    """Create the scrape tool's fetch cache from a Config, or None if disabled."""
+    if not cfg.fetch_cache_enabled:
+        return None
+    try:
+        return DiskCache(
+            "fetch",
+            ttl=cfg.fetch_cache_ttl,
+            max_bytes=cfg.fetch_cache_max_mb * 1024 * 1024,
+        )
+    except OSError as e:
+        logger.warning(f"Fetch cache disabled — could not create cache directory: {e}")
+        return None
+
+
+def build_search_cache(cfg) -> Optional[DiskCache]:
+    """Create the search tool's result cache from a Config, or None if disabled."""
+    if not cfg.search_cache_enabled:
+        return None
+    try:
+        return DiskCache(
+            "search",
+            ttl=cfg.search_cache_ttl,
+            max_bytes=cfg.search_cache_max_mb * 1024 * 1024,
+            max_entry_bytes=1024 * 1024,
+        )
+    except OSError as e:
+        logger.warning(f"Search cache disabled — could not create cache directory: {e}")
+        return None
+
+
+def build_pdf_cache(cfg) -> Optional[DiskCache]:
+    """Create the PDF tool's per-page text cache from a Config, or None if disabled."""
+    if not cfg.fetch_cache_enabled:
+        return None
+    try:
+        return DiskCache(
+            "pdf",
+            ttl=cfg.fetch_cache_ttl,
+            max_bytes=cfg.pdf_cache_max_mb * 1024 * 1024,
+            max_entry_bytes=1024 * 1024,
+        )
+    except OSError as e:
+        logger.warning(f"PDF page cache disabled — could not create cache directory: {e}")
+        return None
@@ -0,0 +1,527 @@
+"""
+Single-pass HTML-to-text extraction on lxml or selectolax.
+
+ScrapeTool's original pipeline builds a BeautifulSoup tree, runs one
+select_one() per content selector, serializes the chosen node back to HTML
+and hands that string to html2text, which parses it a second time.  The
+extractors here parse once with a C parser, find the main-content node in one
+walk over the tree, and render it (tables included) straight to the same
+markdown-like text — no serialize/reparse round-trip.
+
+Both backends are optional.  extract_text() produces the same text as the
+BeautifulSoup + html2text path up to markdown escaping and blank lines, and
+ScrapeTool falls back to that path when neither library is installed.
+
+    pip install "web-research-agent[fast-html]"
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+
+try:
+    import lxml.html
+    lxml_available = True
+except ImportError:
+    lxml_available = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    selectolax_available = True
+except ImportError:
+    selectolax_available = False
+
+# Elements dropped (with their contents) before extraction
+REMOVED_TAGS = ["script", "style", "nav", "footer", "header",
+                "aside", "noscript", "iframe", "svg"]
+
+# CSS selectors tried in priority order to isolate main content
+CONTENT_SELECTORS = [
+    # Semantic HTML5
+    "main",
+    "article",
+    '[role="main"]',
+    # Generic content IDs
+    "#content",
+    "#main-content",
+    "#main",
+    "#article",
+    "#story",
+    "#page-content",
+    # Common CMS / blog class names
+    ".content",
+    ".main-content",
+    ".article-body",
+    ".article-content",
+    ".article__body",
+    ".article__content",
+    ".post-content",
+    ".post-body",
+    ".entry-content",
+    ".entry-body",
+    ".story-body",
+    ".story-content",
+    ".body-content",
+    ".page-content",
+    ".text-content",
+    # News-site specific
+    '[data-component="article-body"]',
+    '[data-testid="article-body"]',
+    '[data-module="ArticleBody"]',
+    ".c-article-body",
+    ".l-article-body",
+    ".RichTextArticleBody",
+    ".paywall-article",
+    # Generic wrappers
+    ".container article",
+    ".wrapper article",
+]
+
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+_WS_RE = re.compile(r"\s+")
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+_COMPOUND_RE = re.compile(
+    r'^(?P<tag>[a-z][a-z0-9]*)?'
+    r'(?:#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)|\[(?P<attr>[\w-]+)="(?P<value>[^"]*)"\])?$'
+)
+
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "header", "footer", "nav", "aside",
+    "figure", "figcaption", "form", "fieldset", "address", "details", "summary",
+    "dl", "dt", "dd", "center", "caption", "tr", "td", "th", "thead", "tbody", "tfoot",
+}
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_EMPHASIS = {"b": "**", "strong": "**", "i": "_", "em": "_"}
+_CODE_TAGS = {"code", "tt", "kbd"}   # html2text wraps these in backticks outside <pre>
+_SKIPPED_TAGS = {"head"}
+
+
+def table_rows_to_markdown(rows: List[List[str]]) -> str:
+    """Format table rows (lists of cell texts) as an aligned markdown table."""
+    rows = [r for r in rows if any(r)]
+    if not rows:
+        return ""
+
+    # Normalise column count across all rows
+    n_cols = max(len(r) for r in rows)
+    rows = [r + [""] * (n_cols - len(r)) for r in rows]
+
+    # Column widths (minimum 3 for the separator dashes)
+    col_widths = [
+        max(max(len(rows[i][j]) for i in range(len(rows))), 3)
+        for j in range(n_cols)
+    ]
+
+    def fmt_row(row):
+        return "| " + " | ".join(
+            cell.ljust(col_widths[j]) for j, cell in enumerate(row)
+        ) + " |"
+
+    lines = [fmt_row(rows[0])]
+    lines.append("| " + " | ".join("-" * w for w in col_widths) + " |")
+    for row in rows[1:]:
+        lines.append(fmt_row(row))
+
+    return "\n".join(lines)
+
+
+# ── Selector matching ───────────────────────────────────────────────────────
+
+class _Compound(NamedTuple):
+    tag: Optional[str]
+    id: Optional[str]
+    cls: Optional[str]
+    attr: Optional[str]
+    value: Optional[str]
+
+
+def _compile(selector: str) -> List[_Compound]:
+    """Parse the small selector subset CONTENT_SELECTORS uses (tag, #id, .class, [a="v"], descendant)."""
+    compounds = []
+    for part in selector.split():
+        m = _COMPOUND_RE.match(part)
+        if not m or not any(m.groupdict().values()):
+            raise ValueError(f"Unsupported content selector: {selector!r}")
+        compounds.append(_Compound(m["tag"], m["id"], m["cls"], m["attr"], m["value"]))
+    return compounds
+
+
+_SELECTORS = [_compile(s) for s in CONTENT_SELECTORS]
+
+
+def _index_selectors():
+    # Bucket selectors by what their last compound keys on, so each element
+    # only checks the few selectors that could possibly match it.
+    by_tag: Dict[str, List[int]] = {}
+    by_id: Dict[str, List[int]] = {}
+    by_class: Dict[str, List[int]] = {}
+    by_attr: List[int] = []
+    for i, compounds in enumerate(_SELECTORS):
+        last = compounds[-1]
+        if last.id:
+            by_id.setdefault(last.id, []).append(i)
+        elif last.cls:
+            by_class.setdefault(last.cls, []).append(i)
+        elif last.attr:
+            by_attr.append(i)
+        else:
+            by_tag.setdefault(last.tag, []).append(i)
+    return by_tag, by_id, by_class, by_attr
+
+
+_BY_TAG, _BY_ID, _BY_CLASS, _BY_ATTR = _index_selectors()
+
+
+def _matches(compound: _Compound, tag: str, attrs: Dict[str, Any]) -> bool:
+    if compound.tag and compound.tag != tag:
+        return False
+    if compound.id and attrs.get("id") != compound.id:
+        return False
+    if compound.cls and compound.cls not in (attrs.get("class") or "").split():
+        return False
+    if compound.attr and attrs.get(compound.attr) != compound.value:
+        return False
+    return True
+
+
+# ── Backends ────────────────────────────────────────────────────────────────
+
+class _LxmlTree:
+    """Tree accessors over lxml.html elements."""
+
+    def __init__(self, html: str):
+        # lxml refuses str input that carries an XML encoding declaration (XHTML)
+        self.root = lxml.html.document_fromstring(_XML_DECL_RE.sub("", html, count=1))
+        for el in list(self.root.iter(*REMOVED_TAGS)):
+            el.drop_tree()
+
+    def body(self):
+        return self.root.find("body")
+
+    def elements(self) -> Iterator[Any]:
+        for el in self.root.iter():
+            if isinstance(el.tag, str):
+                yield el
+
+    @staticmethod
+    def tag(el) -> str:
+        return el.tag
+
+    @staticmethod
+    def attrs(el) -> Dict[str, Any]:
+        return el.attrib
+
+    @staticmethod
+    def parent(el):
+        return el.getparent()
+
+    @staticmethod
+    def children(el) -> Iterator[Union[str, Any]]:
+        if el.text:
+            yield el.text
+        for child in el:
+            if isinstance(child.tag, str):
+                yield child
+            if child.tail:
+                yield child.tail
+
+    @staticmethod
+    def descendants(el, *tags: str) -> Iterator[Any]:
+        return el.iterdescendants(*tags)
+
+    @staticmethod
+    def text(el) -> str:
+        return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+    @staticmethod
+    def raw_text(el) -> str:
+        return el.text_content()
+
+
+class _SelectolaxTree:
+    """Tree accessors over selectolax (lexbor) nodes."""
+
+    def __init__(self, html: str):
+        self.tree = LexborHTMLParser(html)
+        self.tree.strip_tags(REMOVED_TAGS)
+
+    def body(self):
+        return self.tree.body
+
+    def elements(self) -> Iterator[Any]:
+        root = self.tree.root
+        if root is None:
+            return iter(())
+        return (n for n in root.traverse() if not n.tag.startswith("-"))
+
+    @staticmethod
+    def tag(node) -> str:
+        return node.tag
+
+    @staticmethod
+    def attrs(node) -> Dict[str, Any]:
+        return node.attributes
+
+    @staticmethod
+    def parent(node):
+        parent = node.parent
+        return None if parent is None or parent.tag.startswith("-") else parent
+
+    @staticmethod
+    def children(node) -> Iterator[Union[str, Any]]:
+        for child in node.iter(include_text=True):
+            if child.tag == "-text":
+                yield child.text_content or ""
+            elif not child.tag.startswith("-"):
+                yield child
+
+    @staticmethod
+    def descendants(node, *tags: str) -> Iterator[Any]:
+        # traverse() starts at node itself; callers never ask for node's own tag
+        for child in node.traverse():
+            if child.tag in tags:
+                yield child
+
+    @staticmethod
+    def text(node) -> str:
+        return node.text(deep=True, separator=" ", strip=True)
+
+    @staticmethod
+    def raw_text(node) -> str:
+        return node.text(deep=True)
+
+
+_TREES = {"lxml": _LxmlTree, "selectolax": _SelectolaxTree}
+
+
+def backend_available(name: str) -> bool:
+    return {"lxml": lxml_available, "selectolax": selectolax_available, "bs4": True}.get(name, False)
+
+
+def resolve_backend(name: str = "auto") -> str:
+    """
+    Pick the extraction backend for a HTML_PARSER setting.
+
+    "auto" prefers selectolax, then lxml, then "bs4" (BeautifulSoup +
+    html2text).  An explicit backend that isn't installed also resolves to
+    "bs4".
+    """
+    name = (name or "auto").lower()
+    if name == "auto":
+        return next(b for b in BACKENDS if backend_available(b))
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser {name!r}; expected auto, {', '.join(BACKENDS)}")
+    return name if backend_available(name) else "bs4"
+
+
+# ── Extraction ──────────────────────────────────────────────────────────────
+
+def _find_main_content(tree):
+    """One walk over the document: the first match of the highest-priority selector, else <body>."""
+    best, chosen = len(_SELECTORS), None
+    for el in tree.elements():
+        tag, attrs = tree.tag(el), tree.attrs(el)
+        candidates = list(_BY_TAG.get(tag, ()))
+        el_id = attrs.get("id")
+        if el_id in _BY_ID:
+            candidates += _BY_ID[el_id]
+        for cls in (attrs.get("class") or "").split():
+            candidates += _BY_CLASS.get(cls, ())
+        candidates += _BY_ATTR
+        for i in candidates:
+            if i < best and _selector_matches(tree, _SELECTORS[i], el, tag, attrs):
+                best, chosen = i, el
+        if best == 0:
+            break
+    return chosen if chosen is not None else tree.body()
+
+
+def _selector_matches(tree, compounds: List[_Compound], el, tag: str, attrs: Dict[str, Any]) -> bool:
+    if not _matches(compounds[-1], tag, attrs):
+        return False
+    # Descendant combinators: match the remaining compounds right to left up the ancestors
+    pending = len(compounds) - 2
+    ancestor = tree.parent(el)
+    while pending >= 0 and ancestor is not None:
+        if _matches(compounds[pending], tree.tag(ancestor), tree.attrs(ancestor)):
+            pending -= 1
+        ancestor = tree.parent(ancestor)
+    return pending < 0
+
+
+class _Writer:
+    """Accumulates rendered text, collapsing inline whitespace like a browser would."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self._at_space = True
+        self._after_marker = False
+
+    def text(self, s: str) -> None:
+        s = _WS_RE.sub(" ", s)
+        if s.startswith(" ") and self._at_space:
+            s = s[1:]
+        if s:
+            self.parts.append(s)
+            self._at_space = s.endswith(" ")
+            self._after_marker = False
+
+    def raw(self, s: str) -> None:
+        self.parts.append(s)
+        self._at_space = s.endswith((" ", "\n"))
+        if s:
+            self._after_marker = False
+
+    def marker(self, s: str) -> None:
+        """Start a list item; its first block child continues on the marker's line."""
+        self.raw(s)
+        self._after_marker = True
+
+    def gap(self) -> None:
+        """Render nothing but keep the spaces on both sides, as html2text does for a dropped <img>."""
+        self._at_space = False
+
+    def newline(self) -> None:
+        if self._after_marker:
+            return
+        if self.parts and not self.parts[-1].endswith("\n"):
+            self.parts.append("\n")
+        self._at_space = True
+
+    def end_line(self) -> None:
+        """Newline that also ends an item with no content after its marker."""
+        self._after_marker = False
+        self.newline()
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+
+class _Renderer:
+    """Renders an element subtree to html2text-style markdown without reserializing it."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def render(self, el) -> str:
+        out = _Writer()
+        self._children(el, out)
+        return out.getvalue()
+
+    def _children(self, el, out: _Writer) -> None:
+        for child in self.tree.children(el):
+            if isinstance(child, str):
+                out.text(child)
+            else:
+                self._element(child, out)
+
+    def _inline(self, el) -> str:
+        sub = _Writer()
+        self._children(el, sub)
+        return sub.getvalue()
+
+    def _element(self, el, out: _Writer) -> None:
+        tag = self.tree.tag(el)
+        if tag in _SKIPPED_TAGS:
+            return
+        if tag == "br":
+            out.newline()
+        elif tag == "hr":
+            out.newline()
+            out.raw("* * *\n")
+        elif tag in _HEADINGS:
+            out.newline()
+            out.raw("#" * _HEADINGS[tag] + " ")
+            out.text(self._inline(el).strip())
+            out.newline()
+        elif tag in _EMPHASIS:
+            inner = self._inline(el)
+            if inner.strip():
+                if inner[0].isspace():
+                    out.text(" ")
+                mark = _EMPHASIS[tag]
+                out.raw(mark + inner.strip() + mark)
+                if inner[-1].isspace():
+                    out.text(" ")
+        elif tag in _CODE_TAGS:
+            out.raw("`")
+            self._children(el, out)
+            out.raw("`")
+        elif tag == "img":
+            out.gap()
+        elif tag in ("ul", "ol"):
+            self._list(el, tag, out)
+        elif tag == "li":
+            self._item(el, "* ", out)
+        elif tag == "table":
+            self._table(el, out)
+        elif tag == "pre":
+            out.newline()
+            out.raw(self.tree.raw_text(el).strip("\n") + "\n")
+        elif tag == "blockquote":
+            out.newline()
+            quoted = self.render(el)
+            out.raw("".join(f"> {line}\n" for line in quoted.split("\n") if line.strip()))
+        elif tag in _BLOCK_TAGS:
+            out.newline()
+            self._children(el, out)
+            out.newline()
+        else:
+            self._children(el, out)
+
+    def _list(self, el, tag: str, out: _Writer) -> None:
+        out.newline()
+        number = 0
+        for child in self.tree.children(el):
+            if isinstance(child, str):
+                out.text(child)
+            elif self.tree.tag(child) == "li":
+                number += 1
+                self._item(child, f"{number}. " if tag == "ol" else "* ", out)
+            else:
+                self._element(child, out)
+        out.newline()
+
+    def _item(self, el, marker: str, out: _Writer) -> None:
+        out.newline()
+        out.marker(marker)
+        self._children(el, out)
+        out.end_line()
+
+    def _table(self, el, out: _Writer) -> None:
+        rows = [
+            [_WS_RE.sub(" ", self.tree.text(cell)).strip() for cell in self.tree.descendants(tr, "td", "th")]
+            for tr in self.tree.descendants(el, "tr")
+        ]
+        md = table_rows_to_markdown(rows)
+        if not md:
+            # Empty / un-parseable table — render whatever text it has
+            out.newline()
+            self._children(el, out)
+            out.newline()
+            return
+        out.newline()
+        out.raw(md + "\n")
+
+
+def extract_text(html: str, backend: str) -> str:
+    """
+    Extract the main content of a page as markdown-like text in one pass.
+
+    Args:
+        html: The page's HTML.
+        backend: "lxml" or "selectolax" (see resolve_backend).
+
+    Returns:
+        Non-empty, stripped lines joined with newlines — the same shape as
+        ScrapeTool's BeautifulSoup + html2text output.
+    """
+    if not html or not html.strip():
+        return ""
+    tree = _TREES[backend](html)
+    main_content = _find_main_content(tree)
+    if main_content is None:
+        return ""
+    text = _Renderer(tree).render(main_content)
+    return "\n".join(l.strip() for l in text.split("\n") if l.strip())
+
@@ -0,0 +1,268 @@
+"""
+Shared HTTP session layer for network tools.
+
+A single requests.Session with a pooled HTTPAdapter keeps TCP+TLS connections
+alive between calls, so repeated searches against google.serper.dev and
+repeated scrapes of the same host skip the handshake.  urllib3 keeps one
+connection pool per host (up to pool_connections hosts, pool_maxsize sockets
+each) and its PoolManager is thread-safe, so the session can be shared by the
+concurrent sub-agents of ParallelResearchAgent.
+
+The pool is created once and injected into tools by ToolManager.  Tools used
+standalone fall back to the module-level requests functions.
+
+Tools fetch with stream=True and read bodies through read_body() /
+read_text(), which stop at a byte ceiling, so a runaway page or a 300 MB PDF
+never sits in a worker's memory when only the first few thousand characters
+are used.
+"""
+
+import codecs
+import logging
+import threading
+from typing import BinaryIO, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """A response body is larger than the caller's byte ceiling."""
+
+
+class HTTPSessionPool:
+    """
+    Lazily-created, thread-safe keep-alive session shared by all network tools.
+
+    Args:
+        pool_connections: Number of per-host connection pools to keep open.
+        pool_maxsize: Maximum sockets kept alive per host.  Should be at least
+                      the number of concurrent workers hitting one host.
+        max_retries: Adapter-level retries for connection failures only.
+                     HTTP status handling (401/403/429/5xx) stays in the tools,
+                     which turn those into actionable observations.
+        backoff_factor: urllib3 exponential backoff between connect retries.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 20,
+        pool_maxsize: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=0,
+            backoff_factor=self.backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        logger.info(
+            f"HTTP session pool created ({self.pool_connections} hosts × "
+            f"{self.pool_maxsize} connections, {self.max_retries} connect retries)"
+        )
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class HTTPClientMixin:
+    """
+    Gives a tool a `http` attribute that is either the injected shared session
+    or the requests module itself, which exposes the same get/post signature.
+    """
+
+    session: Optional[requests.Session] = None
+
+    def bind_session(self, session: requests.Session) -> None:
+        """Attach a shared session (called by ToolManager on registration)."""
+        self.session = session
+
+    @property
+    def http(self):
+        return self.session if self.session is not None else requests
+
+
+def build_http_pool(cfg) -> HTTPSessionPool:
+    """Create the shared session pool from a Config."""
+    return HTTPSessionPool(
+        pool_connections=cfg.http_pool_connections,
+        pool_maxsize=cfg.http_pool_size,
+        max_retries=cfg.http_max_retries,
+    )
+
+
+def content_length(response: requests.Response) -> Optional[int]:
+    """The declared Content-Length, or None if absent or malformed."""
+    try:
+        length = int(response.headers.get("Content-Length", ""))
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def release(response: requests.Response) -> None:
+    """Close a response's connection; a no-op for responses rebuilt in memory."""
+    if response.raw is not None:
+        response.close()
+
+
+def _is_loaded(response: requests.Response) -> bool:
+    # Bodies rebuilt from a cache (or fetched without stream=True) are already in memory
+    return response._content is not False
+
+
+def read_body(response: requests.Response, max_bytes: int, truncate: bool = True) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response body, holding at most max_bytes of it.
+
+    The body is also stored on the response, so .content / .text work
+    afterwards.  A cut-short download closes the connection rather than
+    draining it.
+
+    Args:
+        response: A response requested with stream=True.
+        max_bytes: Byte ceiling; 0 means unlimited.
+        truncate: Keep the first max_bytes of an oversized body.  When False
+                  an oversized body raises ResponseTooLarge instead — before
+                  any of it is downloaded if Content-Length already says so.
+
+    Returns:
+        (body, complete) — complete is False when the body was cut short.
+    """
+    if _is_loaded(response):
+        body = response.content or b""
+        if max_bytes <= 0 or len(body) <= max_bytes:
+            return body, True
+        if not truncate:
+            raise ResponseTooLarge(f"{len(body):,} bytes exceeds the {max_bytes:,}-byte limit")
+        return body[:max_bytes], False
+
+    length = content_length(response)
+    if not truncate and max_bytes > 0 and length is not None and length > max_bytes:
+        response.close()
+        raise ResponseTooLarge(f"Content-Length {length:,} exceeds the {max_bytes:,}-byte limit")
+
+    chunks = []
+    size = 0
+    complete = True
+    for chunk in response.iter_content(_CHUNK_SIZE):
+        if max_bytes > 0 and size + len(chunk) > max_bytes:
+            if not truncate:
+                response.close()
+                raise ResponseTooLarge(f"Body exceeds the {max_bytes:,}-byte limit")
+            chunks.append(chunk[: max_bytes - size])
+            complete = False
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    if not complete:
+        response.close()
+        logger.info(f"Stopped reading {response.url} at {max_bytes:,} bytes")
+
+    body = b"".join(chunks)
+    response._content = body
+    response._content_consumed = True
+    return body, complete
+
+
+def copy_body(response: requests.Response, dst: BinaryIO, max_bytes: int) -> int:
+    """
+    Stream a response body into a file, raising ResponseTooLarge past
+    max_bytes (0 = unlimited).  Only one chunk is in memory at a time.
+
+    Returns:
+        Number of bytes written.
+    """
+    length = content_length(response)
+    if max_bytes > 0 and length is not None and length > max_bytes:
+        release(response)
+        raise ResponseTooLarge(f"Content-Length {length:,} exceeds the {max_bytes:,}-byte limit")
+
+    chunks = [response.content or b""] if _is_loaded(response) else response.iter_content(_CHUNK_SIZE)
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if max_bytes > 0 and size > max_bytes:
+            release(response)
+            raise ResponseTooLarge(f"Body exceeds the {max_bytes:,}-byte limit")
+        dst.write(chunk)
+    return size
+
+
+def read_text(response: requests.Response, max_bytes: int, max_chars: int) -> Tuple[str, bool]:
+    """
+    Decode a streamed text body chunk by chunk, stopping once max_chars
+    characters (or max_bytes bytes) have been read.
+
+    Returns:
+        (text, complete) — text holds at most max_chars characters; complete
+        is False when the rest of the body was never downloaded.
+    """
+    if _is_loaded(response):
+        text = response.text
+        return text[:max_chars], len(text) <= max_chars
+
+    encoding = response.encoding or "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    parts = []
+    chars = 0
+    size = 0
+    complete = True
+    for chunk in response.iter_content(_CHUNK_SIZE):
+        if max_bytes > 0 and size + len(chunk) > max_bytes:
+            chunk = chunk[: max_bytes - size]
+            complete = False
+        size += len(chunk)
+        text = decoder.decode(chunk)
+        parts.append(text)
+        chars += len(text)
+        if chars > max_chars:
+            complete = False
+        if not complete:
+            break
+    if complete:
+        parts.append(decoder.decode(b"", final=True))
+    else:
+        response.close()
+
+    return "".join(parts)[:max_chars], complete
@@ -0,0 +1,123 @@
+"""
+Process pool for CPU-bound parsing.
+
+ParallelResearchAgent runs its sub-agents on threads, which is right for the
+network-bound part of a tool call but not for what follows: HTML parsing and
+html2text conversion in ScrapeTool and pdfplumber's layout analysis in
+PDFExtractTool are pure Python and hold the GIL, so three sub-agents
+scraping at once take turns on one core.
+
+A ParsePool hands that work to worker processes.  Tools submit a picklable
+module-level function plus the raw page (or a spooled PDF's path) and block
+for the result, so their control flow does not change.  At most max_pending
+jobs are queued or running at a time; further callers wait for a slot
+(backpressure) instead of piling pages into the pool's queue.
+
+Like HTTPSessionPool, the pool is created lazily, shared by all tools through
+ToolManager, and optional — tools without one parse inline.  If the pool's
+processes die, the job is re-run inline and a fresh pool is started on the
+next submission.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePool:
+    """
+    Bounded, lazily-started process pool shared by parsing tools.
+
+    Args:
+        workers: Number of worker processes.
+        max_pending: Jobs allowed in the pool (queued + running) at once.
+                     Callers past this block until a job finishes.
+                     Defaults to twice the worker count.
+        min_size: Inputs shorter than this (characters) are parsed inline —
+                  for small pages, pickling costs more than it saves.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None, min_size: int = 32 * 1024):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 2
+        self.min_size = min_size
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn, not fork: the parent holds threads (HTTP pools, LLM clients)
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    logger.info(f"Parse pool started ({self.workers} processes, {self.max_pending} pending max)")
+        return self._pool
+
+    def _reset(self, pool: Optional[ProcessPoolExecutor]) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) in a worker process and return its result.
+
+        fn must be a picklable module-level function.  Blocks while
+        max_pending jobs are already in the pool.  Exceptions raised by fn
+        propagate to the caller.
+        """
+        self._slots.acquire()
+        pool = None
+        try:
+            pool = self._executor()
+            future = pool.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._slots.release()
+            logger.warning(f"Parse pool unavailable ({e}); parsing inline")
+            self._reset(pool)
+            return fn(*args)
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse worker died ({e}); parsing inline")
+            self._reset(pool)
+            return fn(*args)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+class ParsePoolMixin:
+    """
+    Gives a tool a `parse_pool` attribute: the injected shared pool, or None
+    to parse inline.
+    """
+
+    parse_pool: Optional[ParsePool] = None
+
+    def bind_parse_pool(self, pool: ParsePool) -> None:
+        """Attach the shared parse pool (called by ToolManager on registration)."""
+        self.parse_pool = pool
+
+
+def build_parse_pool(cfg) -> Optional[ParsePool]:
+    """Create the shared parse pool from a Config, or None when PARSE_WORKERS is 0."""
+    if cfg.parse_workers <= 0:
+        return None
+    return ParsePool(workers=cfg.parse_workers, max_pending=cfg.parse_max_pending or None)
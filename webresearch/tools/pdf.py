@@ -2,15 +2,26 @@
 PDF extraction tool for fetching and parsing PDF documents.
 Extracts text and tables from PDFs — critical for sustainability reports,
 academic papers, and financial documents.
+
+Downloads are streamed into a temporary file instead of memory, pages are
+extracted one at a time until the character budget is full, and each page's
+extracted text is kept in an optional per-page cache.  A follow-up call with
+pages= on a document already seen is served from that cache without
+downloading the PDF again.  With a ParsePool bound, pdfplumber runs in a
+worker process that opens the spooled file by path.
 """
 
-import io
 import logging
+import os
 import re
+import tempfile
 import requests
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from .base import Tool
+from .cache import DiskCache, normalize_url
+from .http import HTTPClientMixin, ResponseTooLarge, copy_body, release
+from .parse_pool import ParsePoolMixin
 
 logger = logging.getLogger(__name__)
 
@@ -21,16 +32,33 @@ except ImportError:
     pdfplumber_available = False
 
 
+class _FetchSkipped(Exception):
+    """The URL can't be read as a PDF; the message is the tool's observation."""
+
+
 def pdf_available() -> bool:
     return pdfplumber_available
 
 
-class PDFExtractTool(Tool):
+class PDFExtractTool(HTTPClientMixin, ParsePoolMixin, Tool):
     """Tool for extracting text and tables from PDF documents."""
 
-    def __init__(self, timeout: int = 30, max_length: int = 12000):
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_length: int = 12000,
+        session: Optional[requests.Session] = None,
+        max_bytes: int = 50 * 1024 * 1024,
+        cache: Optional[DiskCache] = None,
+    ):
         self.timeout = timeout
         self.max_length = max_length
+        self.session = session
+        # Larger PDFs are refused (from Content-Length when the server sends
+        # it, otherwise once the stream passes the limit); 0 = unlimited.
+        self.max_bytes = max_bytes
+        # Optional per-page text cache; see _page_text
+        self.cache = cache
         super().__init__()
 
     @property
@@ -62,7 +90,8 @@ url: "https://www.volkswagenag.com/en/sustainability/report.pdf"
 url: "https://example.com/annual-report-2023.pdf", pages: "12-18"
 
 Note: For large PDFs, first call without pages to see the page count and
-table of contents, then call again with a targeted page range.
+table of contents, then call again with a targeted page range. Pages
+already read are cached, so follow-up calls on the same PDF are fast.
 """
 
     def execute(self, url: str, pages: str = "all") -> str:
@@ -75,41 +104,65 @@ table of contents, then call again with a targeted page range.
         if not url or not url.strip():
             return "Error: URL cannot be empty"
 
+        document = _LazyPDF(self, url)
+        try:
+            return self._extract(document, url, pages)
+        except _FetchSkipped as e:
+            return str(e)
+        except ResponseTooLarge as e:
+            return (
+                f"Skipped (PDF too large): {url}. {str(e)}. "
+                "Search for a smaller document or an HTML version of the same content."
+            )
+        except requests.exceptions.Timeout:
+            return f"Error: Request timed out after {self.timeout}s for: {url}"
+        except requests.exceptions.RequestException as e:
+            return f"Error: Failed to fetch PDF {url}: {str(e)}"
+        except Exception as e:
+            logger.error(f"Unexpected error extracting PDF {url}: {str(e)}")
+            return f"Error: Unexpected error reading PDF {url}: {str(e)}"
+        finally:
+            document.close()
+
+    def _download(self, url: str):
+        """Stream the PDF into a temp file (refusing it past max_bytes)."""
+        logger.info(f"Downloading PDF: {url}")
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept": "application/pdf,*/*",
+        }
+        response = self.http.get(url, headers=headers, timeout=self.timeout, stream=True)
         try:
-            logger.info(f"Downloading PDF: {url}")
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Accept": "application/pdf,*/*",
-            }
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-
             if response.status_code in (401, 403):
-                return (
+                raise _FetchSkipped(
                     f"Skipped (requires login): {url} returned {response.status_code}. "
                     "This PDF is behind a paywall or requires authentication."
                 )
             if response.status_code == 429:
-                return f"Skipped (rate limited): {url} returned 429. Try a different source."
+                raise _FetchSkipped(f"Skipped (rate limited): {url} returned 429. Try a different source.")
 
             response.raise_for_status()
 
             content_type = response.headers.get("Content-Type", "").lower()
             if "text/html" in content_type:
-                return (
+                raise _FetchSkipped(
                     f"URL returned HTML instead of PDF: {url}. "
                     "The PDF may be behind a login page. Use the scrape tool instead."
                 )
 
-            pdf_bytes = io.BytesIO(response.content)
-            return self._extract(pdf_bytes, url, pages)
-
-        except requests.exceptions.Timeout:
-            return f"Error: Request timed out after {self.timeout}s for: {url}"
-        except requests.exceptions.RequestException as e:
-            return f"Error: Failed to fetch PDF {url}: {str(e)}"
-        except Exception as e:
-            logger.error(f"Unexpected error extracting PDF {url}: {str(e)}")
-            return f"Error: Unexpected error reading PDF {url}: {str(e)}"
+            # A truncated PDF can't be parsed, so oversize files are refused outright
+            # Named, so parse-pool workers can open it by path
+            spool = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+            try:
+                copy_body(response, spool, self.max_bytes)
+                spool.flush()
+            except BaseException:
+                _discard(spool)
+                raise
+            spool.seek(0)
+            return spool
+        finally:
+            release(response)
 
     def _parse_page_range(self, pages_str: str, total_pages: int):
         """Parse pages string into a list of 0-based page indices."""
@@ -176,61 +229,186 @@ table of contents, then call again with a targeted page range.
         lines.append(sep)
         return "\n".join(lines)
 
-    def _extract(self, pdf_bytes: io.BytesIO, url: str, pages_str: str) -> str:
-        with pdfplumber.open(pdf_bytes) as pdf:
-            total = len(pdf.pages)
-            page_indices = self._parse_page_range(pages_str, total)
-
-            sections = [
-                f"PDF: {url}",
-                f"Total pages: {total}  |  Extracting pages: {page_indices[0]+1}–{page_indices[-1]+1} of {total}",
-                "=" * 80,
-            ]
-
-            for idx in page_indices:
-                page = pdf.pages[idx]
-                sections.append(f"\n--- Page {idx + 1} ---")
-
-                # Extract tables first (structural data is most valuable)
-                tables = page.extract_tables()
-                if tables:
-                    for t_idx, table in enumerate(tables):
-                        if table and any(any(cell for cell in row) for row in table):
-                            sections.append(f"\n[Table {t_idx + 1}]")
-                            sections.append(self._format_table(table))
-
-                # Extract remaining text (exclude table bounding boxes to avoid duplication)
-                try:
-                    table_bboxes = [t.bbox for t in page.find_tables()]
-                    if table_bboxes:
-                        # Crop out table regions and extract text from the rest
-                        remaining_text = page.filter(
-                            lambda obj: not any(
-                                obj["x0"] >= bbox[0] and obj["top"] >= bbox[1]
-                                and obj["x1"] <= bbox[2] and obj["bottom"] <= bbox[3]
-                                for bbox in table_bboxes
-                            )
-                        ).extract_text()
-                    else:
-                        remaining_text = page.extract_text()
-                except Exception:
-                    remaining_text = page.extract_text()
-
-                if remaining_text and remaining_text.strip():
-                    cleaned = _clean_text(remaining_text)
-                    if cleaned:
-                        sections.append(cleaned)
-
-            result = "\n".join(sections)
-
-            if len(result) > self.max_length:
-                result = result[: self.max_length]
-                result += (
-                    f"\n\n... [Truncated. Total extracted: {len(result)} chars. "
-                    f"Use pages= parameter to target specific pages, e.g. pages=\"{page_indices[0]+1}-{min(page_indices[0]+5, total)}\"]"
-                )
+    def _extract(self, document: "_LazyPDF", url: str, pages_str: str) -> str:
+        total = self._page_count(document, url)
+        page_indices = self._parse_page_range(pages_str, total)
+        if not page_indices:
+            return f"PDF: {url}\nTotal pages: 0"
+
+        sections = [
+            f"PDF: {url}",
+            f"Total pages: {total}  |  Extracting pages: {page_indices[0]+1}–{page_indices[-1]+1} of {total}",
+            "=" * 80,
+        ]
+        length = sum(len(s) + 1 for s in sections)
+
+        # Pages are extracted lazily; stop as soon as the budget is spent
+        cut_at = None
+        texts: Dict[int, str] = {}
+        for pos, idx in enumerate(page_indices):
+            if idx not in texts:
+                texts.update(self._page_texts(document, url, page_indices[pos:], self.max_length - length))
+            text = texts[idx]
+            for part in (f"\n--- Page {idx + 1} ---", text):
+                if part:
+                    sections.append(part)
+                    length += len(part) + 1
+            if length > self.max_length:
+                cut_at = idx
+                break
+
+        result = "\n".join(sections)
+        if cut_at is not None:
+            result = result[: self.max_length]
+            result += (
+                f"\n\n... [Truncated at page {cut_at + 1}. "
+                f"Use pages= parameter to target specific pages, e.g. pages=\"{cut_at + 1}-{min(cut_at + 5, total)}\"]"
+            )
+        return result
+
+    def _page_count(self, document: "_LazyPDF", url: str) -> int:
+        key = f"{normalize_url(url)}#pages"
+        entry = self.cache.get(key) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return int(entry.body)
+        total = len(document.pdf.pages)
+        if self.cache:
+            self.cache.set(key, str(total).encode("utf-8"))
+        return total
+
+    def _cached_page(self, url: str, idx: int) -> Optional[str]:
+        entry = self.cache.get(f"{normalize_url(url)}#page={idx}") if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.body.decode("utf-8")
+        return None
+
+    def _page_texts(self, document: "_LazyPDF", url: str, indices: List[int], budget: int) -> Dict[int, str]:
+        """
+        Text for the leading pages of indices: the run already in the page
+        cache, or else a run extracted until budget characters are filled
+        (in the parse pool if there is one).
+        """
+        texts: Dict[int, str] = {}
+        for idx in indices:
+            text = self._cached_page(url, idx)
+            if text is None:
+                break
+            texts[idx] = text
+        if texts:
+            return texts
+
+        if self.parse_pool is not None:
+            extracted = self.parse_pool.run(_extract_pages_in_worker, document.path, indices, budget)
+        else:
+            extracted = self._extract_pages(document.pdf, indices, budget)
+        for idx, text in extracted:
+            if self.cache:
+                self.cache.set(f"{normalize_url(url)}#page={idx}", text.encode("utf-8"))
+        return dict(extracted)
+
+    def _extract_pages(self, pdf, indices: List[int], budget: int) -> List[Tuple[int, str]]:
+        """Extract pages in order until their text exceeds budget characters (at least one page)."""
+        extracted = []
+        for idx in indices:
+            page = pdf.pages[idx]
+            try:
+                text = self._extract_page(page)
+            finally:
+                # Drop the page's parsed layout objects once its text is out
+                close = getattr(page, "close", None)
+                if close:
+                    close()
+            extracted.append((idx, text))
+            budget -= len(text) + len(f"\n--- Page {idx + 1} ---") + 2
+            if budget <= 0:
+                break
+        return extracted
+
+    def _extract_page(self, page) -> str:
+        parts: List[str] = []
+
+        # Extract tables first (structural data is most valuable).  One
+        # find_tables() pass serves both the table text and the bounding boxes.
+        tables = page.find_tables()
+        for t_idx, found in enumerate(tables):
+            table = found.extract()
+            if table and any(any(cell for cell in row) for row in table):
+                parts.append(f"\n[Table {t_idx + 1}]")
+                parts.append(self._format_table(table))
+
+        # Extract remaining text (exclude table bounding boxes to avoid duplication)
+        try:
+            table_bboxes = [t.bbox for t in tables]
+            if table_bboxes:
+                # Crop out table regions and extract text from the rest
+                remaining_text = page.filter(
+                    lambda obj: not any(
+                        obj["x0"] >= bbox[0] and obj["top"] >= bbox[1]
+                        and obj["x1"] <= bbox[2] and obj["bottom"] <= bbox[3]
+                        for bbox in table_bboxes
+                    )
+                ).extract_text()
+            else:
+                remaining_text = page.extract_text()
+        except Exception:
+            remaining_text = page.extract_text()
+
+        if remaining_text and remaining_text.strip():
+            cleaned = _clean_text(remaining_text)
+            if cleaned:
+                parts.append(cleaned)
+
+        return "\n".join(parts)
+
+
+class _LazyPDF:
+    """A PDF that is only downloaded (to a temp file) and opened when a page is actually needed."""
 
-            return result
+    def __init__(self, tool: PDFExtractTool, url: str):
+        self._tool = tool
+        self._url = url
+        self._file = None
+        self._pdf = None
+
+    @property
+    def path(self) -> str:
+        if self._file is None:
+            self._file = self._tool._download(self._url)
+        return self._file.name
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.path)
+        return self._pdf
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self._file is not None:
+            _discard(self._file)
+            self._file = None
+
+
+def _discard(spool) -> None:
+    spool.close()
+    try:
+        os.unlink(spool.name)
+    except OSError:
+        pass
+
+
+# Built on first use in each parse worker
+_worker_tool: Optional[PDFExtractTool] = None
+
+
+def _extract_pages_in_worker(path: str, indices: List[int], budget: int) -> List[Tuple[int, str]]:
+    global _worker_tool
+    if _worker_tool is None:
+        _worker_tool = PDFExtractTool()
+    with pdfplumber.open(path) as pdf:
+        return _worker_tool._extract_pages(pdf, indices, budget)
 
 
 def _clean_text(text: str) -> str:
@@ -11,7 +11,18 @@ from bs4 import BeautifulSoup
 import html2text
 import logging
 from typing import Optional
+from requests.structures import CaseInsensitiveDict
 from .base import Tool
+from .cache import CacheEntry, DiskCache, normalize_url
+from .html_extract import (
+    CONTENT_SELECTORS as _CONTENT_SELECTORS,
+    REMOVED_TAGS,
+    extract_text,
+    resolve_backend,
+    table_rows_to_markdown,
+)
+from .http import HTTPClientMixin, content_length, read_body, read_text, release
+from .parse_pool import ParsePoolMixin
 
 # Patterns that indicate prompt injection attempts in scraped content
 _INJECTION_PATTERNS = [
@@ -35,48 +46,6 @@ _USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
 ]
 
-# CSS selectors tried in priority order to isolate main content
-_CONTENT_SELECTORS = [
-    # Semantic HTML5
-    "main",
-    "article",
-    '[role="main"]',
-    # Generic content IDs
-    "#content",
-    "#main-content",
-    "#main",
-    "#article",
-    "#story",
-    "#page-content",
-    # Common CMS / blog class names
-    ".content",
-    ".main-content",
-    ".article-body",
-    ".article-content",
-    ".article__body",
-    ".article__content",
-    ".post-content",
-    ".post-body",
-    ".entry-content",
-    ".entry-body",
-    ".story-body",
-    ".story-content",
-    ".body-content",
-    ".page-content",
-    ".text-content",
-    # News-site specific
-    '[data-component="article-body"]',
-    '[data-testid="article-body"]',
-    '[data-module="ArticleBody"]',
-    ".c-article-body",
-    ".l-article-body",
-    ".RichTextArticleBody",
-    ".paywall-article",
-    # Generic wrappers
-    ".container article",
-    ".wrapper article",
-]
-
 # Login-wall patterns detectable in 200-OK HTML even when text is substantial
 _AUTH_REDIRECT_PATTERNS = [
     r'<form[^>]+(?:action|id|class)[^>]*(?:login|sign.?in|signin|auth)[^>]*>',
@@ -89,12 +58,31 @@ _AUTH_REDIRECT_PATTERNS = [
 logger = logging.getLogger(__name__)
 
 
-class ScrapeTool(Tool):
+class ScrapeTool(HTTPClientMixin, ParsePoolMixin, Tool):
     """Tool for fetching and parsing web page content."""
 
-    def __init__(self, timeout: int = 30, max_length: int = 15000):
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_length: int = 15000,
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+        parser: str = "auto",
+        max_bytes: int = 10 * 1024 * 1024,
+    ):
         self.timeout = timeout
         self.max_length = max_length
+        self.session = session
+        # Bodies are streamed and cut off at max_bytes (0 = unlimited), so a
+        # runaway page can't balloon a worker's memory.
+        self.max_bytes = max_bytes
+        # HTML extraction backend: "selectolax" / "lxml" parse and render in a
+        # single pass; "bs4" is the BeautifulSoup + html2text pipeline.  "auto"
+        # takes the fastest one installed.
+        self.parser = resolve_backend(parser)
+        # Optional persistent fetch cache — fresh entries skip the network,
+        # stale ones are revalidated with a conditional GET.
+        self.cache = cache
         self.html_converter = html2text.HTML2Text()
         # ignore_links=True strips markdown URL noise ([text](https://...)) that
         # fills context windows with link strings rather than article content.
@@ -147,32 +135,68 @@ return no content, use the scrape_js tool.
             logger.error(f"Unexpected error scraping {url}: {str(e)}")
             return f"Error: Unexpected error scraping {url}: {str(e)}"
 
+        try:
+            return self._read_response(response, url)
+        except requests.exceptions.RequestException as e:
+            return f"Error: Failed to read response from {url}: {str(e)}"
+        finally:
+            release(response)
+
+    def _read_response(self, response: requests.Response, url: str) -> str:
+        """Read a streamed response (up to max_bytes) and render it by content type."""
         content_type = response.headers.get("Content-Type", "").lower()
 
         if "text/html" in content_type or "application/xhtml" in content_type:
+            self._read_body(response, url)
             # Fix encoding before accessing .text — requests defaults to ISO-8859-1
             # when charset is absent, which mangles special chars on EU/gov sites
             if response.encoding and response.encoding.upper() in ("ISO-8859-1", "LATIN-1"):
                 response.encoding = response.apparent_encoding
             return self._parse_html(response.text, url)
         elif "text/plain" in content_type:
-            return self._truncate_content(response.text)
+            return self._read_plain_text(response, url)
         elif "application/json" in content_type:
-            return f"JSON content from {url}:\n\n{self._truncate_content(response.text)}"
+            return f"JSON content from {url}:\n\n{self._read_plain_text(response, url)}"
         elif "text/csv" in content_type or url.endswith(".csv"):
-            return f"CSV content from {url}:\n\n{self._truncate_content(response.text)}"
+            return f"CSV content from {url}:\n\n{self._read_plain_text(response, url)}"
         elif "application/pdf" in content_type or url.endswith(".pdf"):
+            # Don't download the PDF here — pdf_extract will stream it itself
+            length = content_length(response)
+            size = f" ({length:,} bytes)" if length is not None else ""
             return (
-                f"PDF detected at {url} ({len(response.content):,} bytes). "
+                f"PDF detected at {url}{size}. "
                 "Use the pdf_extract tool with this URL to read its text and tables. "
                 'Example: Action: pdf_extract / Action Input: {"url": "' + url + '"}'
             )
         else:
+            self._read_body(response, url)
             return self._parse_html(response.text, url)
 
+    def _read_body(self, response: requests.Response, url: str) -> bytes:
+        """Stream the body up to max_bytes; only complete bodies go into the fetch cache."""
+        body, complete = read_body(response, self.max_bytes)
+        if not complete:
+            logger.warning(f"{url} is larger than {self.max_bytes:,} bytes; parsing the first {self.max_bytes:,}")
+        elif self.cache and not getattr(response, "from_cache", False):
+            self._store_in_cache(normalize_url(url), response)
+        return body
+
+    def _read_plain_text(self, response: requests.Response, url: str) -> str:
+        """Decode a text body incrementally, downloading only as much as max_length needs."""
+        text, complete = read_text(response, self.max_bytes, self.max_length)
+        if not complete:
+            return self._sanitize_content(
+                text + f"\n\n... [Content truncated. Showing the first {len(text)} characters; "
+                "the rest was not downloaded]"
+            )
+        if self.cache and not getattr(response, "from_cache", False):
+            self._store_in_cache(normalize_url(url), response, body=text.encode("utf-8"), encoding="utf-8")
+        return self._truncate_content(text)
+
     def _fetch_with_retry(self, url: str):
         """
         Fetch URL with randomised UA, Brotli accept-encoding, and 5xx retry.
+        Serves fresh entries from the fetch cache and revalidates stale ones.
         Returns a Response on success or a str error message for 4xx skip conditions.
         """
         headers = {
@@ -186,10 +210,34 @@ return no content, use the scrape_js tool.
             "Referer": "https://www.google.com/",
         }
 
+        cache_key = normalize_url(url) if self.cache else None
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            if self.cache.is_fresh(cached):
+                logger.info(f"Fetch cache hit: {url}")
+                return self._response_from_cache(url, cached)
+            # Stale — ask the server whether our copy is still current
+            if cached.meta.get("etag"):
+                headers["If-None-Match"] = cached.meta["etag"]
+            if cached.meta.get("last_modified"):
+                headers["If-Modified-Since"] = cached.meta["last_modified"]
+
         last_exc = None
         for attempt in range(3):
             try:
-                response = requests.get(url, headers=headers, timeout=self.timeout)
+                response = self.http.get(url, headers=headers, timeout=self.timeout, stream=True)
+
+                if response.status_code >= 300:
+                    # Nothing below reads a non-2xx body; release the connection
+                    release(response)
+
+                if response.status_code == 304 and cached is not None:
+                    logger.info(f"Fetch cache revalidated (304): {url}")
+                    self.cache.refresh(cache_key, {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    })
+                    return self._response_from_cache(url, cached)
 
                 # 4xx — return actionable skip messages immediately, no retry
                 if response.status_code in (401, 403):
@@ -223,6 +271,7 @@ return no content, use the scrape_js tool.
                     )
 
                 response.raise_for_status()
+                # The body is streamed (and cached) by execute()
                 return response
 
             except requests.exceptions.Timeout:
@@ -237,33 +286,43 @@ return no content, use the scrape_js tool.
         if last_exc:
             raise last_exc
 
+    def _store_in_cache(
+        self,
+        key: str,
+        response: requests.Response,
+        body: Optional[bytes] = None,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """Persist a 200 response body with its validators, honouring no-store."""
+        if response.status_code != 200:
+            return
+        if "no-store" in response.headers.get("Cache-Control", "").lower():
+            return
+        self.cache.set(key, response.content if body is None else body, {
+            "url": response.url,
+            "content_type": response.headers.get("Content-Type", ""),
+            "encoding": encoding or response.encoding,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        })
+
+    @staticmethod
+    def _response_from_cache(url: str, entry: CacheEntry) -> requests.Response:
+        """Rebuild a Response from a cache entry so execute() handles it like a live fetch."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry.meta.get("url") or url
+        response._content = entry.body
+        response.encoding = entry.meta.get("encoding")
+        response.headers = CaseInsensitiveDict({
+            "Content-Type": entry.meta.get("content_type", ""),
+        })
+        response.from_cache = True
+        return response
+
     def _parse_html(self, html_content: str, url: str) -> str:
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # Remove non-content elements
-            for tag in soup(["script", "style", "nav", "footer", "header",
-                              "aside", "noscript", "iframe", "svg"]):
-                tag.decompose()
-
-            # Try to isolate main content region
-            main_content = None
-            for selector in _CONTENT_SELECTORS:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            if not main_content:
-                main_content = soup.find("body") or soup
-
-            # Convert HTML tables to markdown before html2text (which mangles them)
-            self._replace_tables_with_markdown(main_content, soup)
-
-            # Convert to markdown-like text
-            text = self.html_converter.handle(str(main_content))
-
-            # Clean up whitespace
-            lines = [l.strip() for l in text.split("\n") if l.strip()]
-            text = "\n".join(lines)
+            text = self._extract_text(html_content)
 
             # JS-only page detection
             _JS_HINTS = [
@@ -322,6 +381,47 @@ return no content, use the scrape_js tool.
             logger.error(f"Error parsing HTML: {str(e)}")
             return f"Error parsing HTML from {url}: {str(e)}"
 
+    def _extract_text(self, html_content: str) -> str:
+        """Main content of the page as cleaned, markdown-like text (in the parse pool if there is one)."""
+        pool = self.parse_pool
+        if pool is not None and len(html_content) >= pool.min_size:
+            return pool.run(_extract_text_in_worker, html_content, self.parser)
+        return self._extract_text_local(html_content)
+
+    def _extract_text_local(self, html_content: str) -> str:
+        if self.parser != "bs4":
+            try:
+                return extract_text(html_content, self.parser)
+            except Exception as e:
+                logger.warning(f"{self.parser} extraction failed, falling back to BeautifulSoup: {str(e)}")
+        return self._extract_text_bs4(html_content)
+
+    def _extract_text_bs4(self, html_content: str) -> str:
+        soup = BeautifulSoup(html_content, "html.parser")
+
+        # Remove non-content elements
+        for tag in soup(REMOVED_TAGS):
+            tag.decompose()
+
+        # Try to isolate main content region
+        main_content = None
+        for selector in _CONTENT_SELECTORS:
+            main_content = soup.select_one(selector)
+            if main_content:
+                break
+        if not main_content:
+            main_content = soup.find("body") or soup
+
+        # Convert HTML tables to markdown before html2text (which mangles them)
+        self._replace_tables_with_markdown(main_content, soup)
+
+        # Convert to markdown-like text
+        text = self.html_converter.handle(str(main_content))
+
+        # Clean up whitespace
+        lines = [l.strip() for l in text.split("\n") if l.strip()]
+        return "\n".join(lines)
+
     def _replace_tables_with_markdown(self, content_tag, soup) -> None:
         """
         Find all <table> elements within content_tag and replace each with a
@@ -345,33 +445,9 @@ return no content, use the scrape_js tool.
                 text = cell.get_text(separator=" ", strip=True)
                 text = re.sub(r"\s+", " ", text).strip()
                 cells.append(text)
-            if any(cells):
-                rows.append(cells)
-
-        if not rows:
-            return ""
-
-        # Normalise column count across all rows
-        n_cols = max(len(r) for r in rows)
-        rows = [r + [""] * (n_cols - len(r)) for r in rows]
-
-        # Column widths (minimum 3 for the separator dashes)
-        col_widths = [
-            max(max(len(rows[i][j]) for i in range(len(rows))), 3)
-            for j in range(n_cols)
-        ]
+            rows.append(cells)
 
-        def fmt_row(row):
-            return "| " + " | ".join(
-                cell.ljust(col_widths[j]) for j, cell in enumerate(row)
-            ) + " |"
-
-        lines = [fmt_row(rows[0])]
-        lines.append("| " + " | ".join("-" * w for w in col_widths) + " |")
-        for row in rows[1:]:
-            lines.append(fmt_row(row))
-
-        return "\n".join(lines)
+        return table_rows_to_markdown(rows)
 
     def _sanitize_content(self, content: str) -> str:
         for pattern in _INJECTION_PATTERNS:
@@ -384,3 +460,14 @@ return no content, use the scrape_js tool.
         truncated = content[: self.max_length]
         truncated += f"\n\n... [Content truncated. Total length: {len(content)} characters, showing first {self.max_length}]"
         return self._sanitize_content(truncated)
+
+
+# One ScrapeTool per parser backend, built on first use in each parse worker
+_worker_tools = {}
+
+
+def _extract_text_in_worker(html_content: str, parser: str) -> str:
+    tool = _worker_tools.get(parser)
+    if tool is None:
+        tool = _worker_tools[parser] = ScrapeTool(parser=parser)
+    return tool._extract_text_local(html_content)
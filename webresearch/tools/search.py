@@ -5,72 +5,232 @@ Allows the agent to search Google for information.
 
 import json
 import logging
+import sqlite3
 import threading
+import time
 import requests
+from contextlib import closing
 from datetime import datetime
+from multiprocessing.util import Finalize
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Union
 
 from .base import Tool
+from .cache import DiskCache, normalize_query, normalize_url
+from .http import HTTPClientMixin
 
 logger = logging.getLogger(__name__)
 
 _MONTHLY_LIMIT = 2500
-_usage_lock = threading.Lock()  # guards concurrent read-increment-write in parallel mode
+
+# Searches buffered in memory before they are written to the usage database.
+# The in-process total is always exact; other processes see it after a flush.
+_FLUSH_EVERY = 10
+_FLUSH_INTERVAL = 5.0       # seconds
+_READ_TTL = 2.0             # seconds get_monthly_usage() reuses the stored count
+
+# Serper accepts up to 100 queries in one batch request
+_MAX_BATCH = 100
+
+# Reciprocal-rank-fusion constant for merging result lists (Cormack et al.)
+_RRF_K = 60
 
 
 def _get_usage_path() -> Path:
-    path = Path.home() / ".webresearch" / "usage.json"
+    path = Path.home() / ".webresearch" / "usage.db"
     path.parent.mkdir(exist_ok=True)
     return path
 
 
+def _current_month() -> str:
+    return datetime.now().strftime("%Y-%m")
+
+
+class UsageCounter:
+    """
+    Monthly Serper search counter in a SQLite database.
+
+    Increments are buffered in memory and added to the stored count with one
+    atomic UPSERT every _FLUSH_EVERY searches or _FLUSH_INTERVAL seconds, and
+    when the process exits.  SQLite's file locking makes concurrent flushes
+    from batch worker processes safe.  Reads combine the stored count (cached
+    for _READ_TTL seconds) with this process's unflushed searches.
+
+    Args:
+        path: SQLite database file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()   # guards the in-memory buffer only; no I/O under it
+        self._pending = 0
+        self._pending_month = _current_month()
+        self._last_flush = time.monotonic()
+        self._stored: Optional[int] = None
+        self._stored_month = ""
+        self._stored_at = 0.0
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=10)
+
+    def _init_db(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS usage (month TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+        self._import_legacy_json()
+
+    def _import_legacy_json(self) -> None:
+        """Carry this month's count over from the old usage.json file, once."""
+        legacy = self.path.with_name("usage.json")
+        if not legacy.exists():
+            return
+        try:
+            data = json.loads(legacy.read_text(encoding="utf-8"))
+            if data.get("month") == _current_month():
+                with closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO usage (month, count) VALUES (?, ?)",
+                        (data["month"], int(data.get("count", 0))),
+                    )
+            legacy.rename(legacy.with_suffix(".json.migrated"))
+        except Exception as e:
+            logger.debug(f"Could not import legacy usage file: {e}")
+
+    def increment(self) -> int:
+        """Count one search and return this month's total (thread-safe)."""
+        month = _current_month()
+        with self._lock:
+            if month != self._pending_month:
+                flush_month, flush_count = self._pending_month, self._pending
+                self._pending, self._pending_month = 0, month
+            else:
+                flush_month, flush_count = None, 0
+            self._pending += 1
+            due = (
+                self._pending >= _FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= _FLUSH_INTERVAL
+            )
+        if flush_month and flush_count:
+            self._write(flush_month, flush_count)
+        if due:
+            self.flush()
+        return self.total()
+
+    def flush(self) -> None:
+        """Write buffered searches to the database."""
+        with self._lock:
+            month, count = self._pending_month, self._pending
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        if count:
+            self._write(month, count)
+
+    def total(self) -> int:
+        """This month's searches across all processes (up to their last flush) plus ours."""
+        month = _current_month()
+        if (
+            self._stored is None
+            or self._stored_month != month
+            or time.monotonic() - self._stored_at > _READ_TTL
+        ):
+            self._stored = self._read(month)
+            self._stored_month = month
+            self._stored_at = time.monotonic()
+        with self._lock:
+            pending = self._pending if self._pending_month == month else 0
+        return self._stored + pending
+
+    def _read(self, month: str) -> int:
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT count FROM usage WHERE month = ?", (month,)).fetchone()
+            return int(row[0]) if row else 0
+        except sqlite3.Error as e:
+            logger.debug(f"Usage read failed: {e}")
+            return 0
+
+    def _write(self, month: str, count: int) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT INTO usage (month, count) VALUES (?, ?) "
+                    "ON CONFLICT(month) DO UPDATE SET count = count + excluded.count",
+                    (month, count),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record {count} Serper searches: {e}")
+            return
+        self._stored = None   # force a re-read so the total includes the flushed searches
+
+
+_counters: Dict[Path, UsageCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def _counter() -> UsageCounter:
+    path = _get_usage_path()
+    counter = _counters.get(path)
+    if counter is None:
+        with _counters_lock:
+            counter = _counters.get(path)
+            if counter is None:
+                counter = _counters[path] = UsageCounter(path)
+    return counter
+
+
+def _flush_all() -> None:
+    for counter in list(_counters.values()):
+        counter.flush()
+
+
+# multiprocessing runs exit-priority finalizers both at interpreter exit and
+# when a worker process (which skips atexit) shuts down
+Finalize(None, _flush_all, exitpriority=10)
+
+
 def get_monthly_usage() -> int:
     """Return the number of Serper searches made this calendar month."""
-    path = _get_usage_path()
-    if not path.exists():
-        return 0
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        if data.get("month") == datetime.now().strftime("%Y-%m"):
-            return int(data.get("count", 0))
+        return _counter().total()
     except Exception:
-        pass
-    return 0
+        return 0
 
 
 def _increment_usage() -> int:
     """Increment the monthly search counter and return the new total (thread-safe)."""
-    with _usage_lock:
-        path = _get_usage_path()
-        current_month = datetime.now().strftime("%Y-%m")
-        try:
-            data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
-        except Exception:
-            data = {}
-
-        if data.get("month") != current_month:
-            data = {"month": current_month, "count": 0}
+    return _counter().increment()
 
-        data["count"] = data.get("count", 0) + 1
-        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-        return data["count"]
 
-
-class SearchTool(Tool):
+class SearchTool(HTTPClientMixin, Tool):
     """Tool for searching the web using Serper.dev API."""
 
-    def __init__(self, api_key: str, timeout: int = 30):
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int = 30,
+        session: Optional[requests.Session] = None,
+        cache: Optional[DiskCache] = None,
+    ):
         """
         Initialize the search tool.
 
         Args:
             api_key: Serper.dev API key
             timeout: Request timeout in seconds
+            session: Optional shared keep-alive session (see tools/http.py)
+            cache: Optional persistent result cache (see tools/cache.py),
+                   shared across sessions, sub-agents and processes
         """
         self.api_key = api_key
         self.timeout = timeout
+        self.session = session
         self.base_url = "https://google.serper.dev/search"
+        # Raw Serper JSON keyed by normalised query — a fresh hit skips the
+        # request and the monthly usage counter; stale entries are only
+        # served when the live request fails.
+        self.cache = cache
+        self._num_results = 10
         super().__init__()
 
     @property
@@ -120,6 +280,14 @@ query: "Epoch AI dataset large-scale models"
         if not query or not query.strip():
             return "Error: Search query cannot be empty"
 
+        cache_key = f"{normalize_query(query)}|num={self._num_results}" if self.cache else None
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None and self.cache.is_fresh(cached):
+            data = self._cached_data(cached.body)
+            if data is not None:
+                logger.info(f"Search cache hit: {query}")
+                return self._format_results(data, query)
+
         try:
             logger.info(f"Searching for: {query}")
 
@@ -130,10 +298,10 @@ query: "Epoch AI dataset large-scale models"
 
             payload = {
                 "q": query,
-                "num": 10,  # Number of results to return
+                "num": self._num_results,  # Number of results to return
             }
 
-            response = requests.post(
+            response = self.http.post(
                 self.base_url,
                 headers=headers,
                 json=payload,
@@ -147,13 +315,22 @@ query: "Epoch AI dataset large-scale models"
             if count >= _MONTHLY_LIMIT * 0.9:
                 logger.warning(f"Serper API usage at {count}/{_MONTHLY_LIMIT} ({count/_MONTHLY_LIMIT*100:.0f}%)")
 
+            if self.cache and data.get("organic"):
+                self.cache.set(cache_key, response.content, {"query": query})
+
             return self._format_results(data, query)
 
         except requests.exceptions.Timeout:
             logger.error(f"Search request timed out for query: {query}")
+            stale = self._stale_results(cached, query)
+            if stale:
+                return stale
             return f"Error: Search request timed out after {self.timeout} seconds"
         except requests.exceptions.RequestException as e:
             logger.error(f"Search request failed: {str(e)}")
+            stale = self._stale_results(cached, query)
+            if stale:
+                return stale
             return f"Error: Search request failed: {str(e)}"
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse search response: {str(e)}")
@@ -162,6 +339,124 @@ query: "Epoch AI dataset large-scale models"
             logger.error(f"Unexpected error during search: {str(e)}")
             return f"Error: Unexpected error during search: {str(e)}"
 
+    def search_many(self, queries: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Raw Serper results for several queries, fetched in one batch request.
+
+        Queries that normalise to the same cache key are sent once, fresh cache
+        hits are not sent at all, and every fetched result is cached as if it
+        came from execute().  Each query still counts once toward the monthly
+        quota, since Serper bills per query.
+
+        Returns:
+            One entry per input query: the Serper response dict, or None when
+            that query could not be fetched.
+        """
+        keys = [f"{normalize_query(q)}|num={self._num_results}" for q in queries]
+        found: Dict[str, Dict[str, Any]] = {}
+        stale: Dict[str, Any] = {}
+        to_fetch: Dict[str, str] = {}   # key -> first query with that key
+
+        for query, key in zip(queries, keys):
+            if key in found or key in to_fetch or not query.strip():
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            data = self._cached_data(cached.body) if cached is not None else None
+            if data is not None and self.cache.is_fresh(cached):
+                found[key] = data
+            else:
+                to_fetch[key] = query
+                if data is not None:
+                    stale[key] = data
+
+        pending = list(to_fetch.items())
+        for start in range(0, len(pending), _MAX_BATCH):
+            chunk = pending[start:start + _MAX_BATCH]
+            try:
+                logger.info(f"Batch search: {len(chunk)} queries in one request")
+                response = self.http.post(
+                    self.base_url,
+                    headers={"X-API-KEY": self.api_key, "Content-Type": "application/json"},
+                    json=[{"q": q, "num": self._num_results} for _, q in chunk],
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                payload = response.json()
+                if isinstance(payload, dict):
+                    payload = [payload]
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error(f"Batch search request failed: {str(e)}")
+                for key, _ in chunk:
+                    if key in stale:
+                        found[key] = stale[key]
+                continue
+
+            count = 0
+            for (key, query), data in zip(chunk, payload):
+                count = _increment_usage()
+                if not isinstance(data, dict):
+                    continue
+                found[key] = data
+                if self.cache and data.get("organic"):
+                    self.cache.set(key, json.dumps(data).encode("utf-8"), {"query": query})
+            if count >= _MONTHLY_LIMIT * 0.9:
+                logger.warning(f"Serper API usage at {count}/{_MONTHLY_LIMIT} ({count/_MONTHLY_LIMIT*100:.0f}%)")
+
+        return [found.get(key) for key in keys]
+
+    @staticmethod
+    def merge_results(results: List[Optional[Dict[str, Any]]], limit: int = 15) -> List[Dict[str, Any]]:
+        """
+        Merge several organic result lists into one ranked, de-duplicated list.
+
+        Links are compared by normalize_url(), and each hit scores
+        1 / (_RRF_K + rank) in every list it appears in, so a page that ranks
+        well for several phrasings comes first.  Each merged item carries the
+        first title/snippet seen plus "matches", the number of lists it was in.
+        A response that appears more than once in results (search_many returns
+        the same dict for queries sharing a cache key) is counted once.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        seen: Set[int] = set()
+        for data in results:
+            if data is not None:
+                if id(data) in seen:
+                    continue
+                seen.add(id(data))
+            for rank, hit in enumerate((data or {}).get("organic", []), 1):
+                link = hit.get("link")
+                if not link:
+                    continue
+                key = normalize_url(link)
+                item = merged.get(key)
+                if item is None:
+                    item = merged[key] = {
+                        "title": hit.get("title", "No title"),
+                        "link": link,
+                        "snippet": hit.get("snippet", "No description available"),
+                        "score": 0.0,
+                        "matches": 0,
+                    }
+                item["score"] += 1.0 / (_RRF_K + rank)
+                item["matches"] += 1
+        ranked = sorted(merged.values(), key=lambda item: item["score"], reverse=True)
+        return ranked[:limit]
+
+    @staticmethod
+    def _cached_data(body: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(body.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+    def _stale_results(self, cached, query: str) -> Optional[str]:
+        """Format an expired cache entry when Serper is unreachable, or None."""
+        data = self._cached_data(cached.body) if cached is not None else None
+        if data is None:
+            return None
+        logger.info(f"Serving stale search results ({cached.age() / 3600:.1f}h old): {query}")
+        return self._format_results(data, query)
+
     def _format_results(self, data: Dict[str, Any], query: str) -> str:
         """
         Format search results into a readable string.
@@ -218,3 +513,87 @@ query: "Epoch AI dataset large-scale models"
                 results.append(f"Snippet: {answer_box['snippet']}")
 
         return "\n".join(results)
+
+
+class MultiSearchTool(Tool):
+    """Agent-facing wrapper around SearchTool.search_many()."""
+
+    def __init__(self, search: SearchTool, max_results: int = 15):
+        """
+        Initialize the batch search tool.
+
+        Args:
+            search: The SearchTool whose key, session and cache are reused
+            max_results: Number of merged results returned
+        """
+        self.search = search
+        self.max_results = max_results
+        super().__init__()
+
+    @property
+    def name(self) -> str:
+        return "search_many"
+
+    @property
+    def description(self) -> str:
+        return """Run several Google searches in a single request and get one merged list.
+
+Parameters:
+- queries (list of str, required): 2-5 different phrasings or angles on what you are looking for
+
+Returns:
+One ranked list of results with duplicate URLs removed. Pages that appear for several
+of the queries rank first; each result shows how many of the queries returned it.
+Any answer boxes are listed after the results.
+
+Use this tool instead of several separate search calls when you would otherwise
+search for multiple rephrasings or related angles back to back.
+
+Example usage:
+queries: ["Geneva AI talks 2023 mediator", "secret US China AI meeting Geneva organization"]
+"""
+
+    def execute(self, queries: Union[List[str], str]) -> str:
+        if isinstance(queries, str):
+            queries = [q for q in (part.strip() for part in queries.splitlines()) if q]
+        # Phrasings that share a cache key get the same result; counting it
+        # once per phrasing would inflate its rank and its "Returned by" tally
+        unique: Dict[str, str] = {}
+        for q in queries:
+            if isinstance(q, str) and q.strip():
+                unique.setdefault(normalize_query(q), q)
+        queries = list(unique.values())
+        if not queries:
+            return "Error: search_many needs at least one non-empty query"
+
+        results = self.search.search_many(queries)
+        if all(data is None for data in results):
+            return "Error: Batch search request failed"
+
+        merged = self.search.merge_results(results, limit=self.max_results)
+        if not merged:
+            return f"No search results found for: {'; '.join(queries)}"
+
+        lines = [f"Merged search results for {len(queries)} queries:"]
+        lines.extend(f"  - {q}" for q in queries)
+        lines.append("=" * 80 + "\n")
+        for idx, item in enumerate(merged, 1):
+            lines.append(f"\n[{idx}] {item['title']}")
+            lines.append(f"URL: {item['link']}")
+            lines.append(f"Snippet: {item['snippet']}")
+            lines.append(f"Returned by {item['matches']}/{len(queries)} queries")
+            lines.append("-" * 80)
+
+        answers = [
+            (q, data["answerBox"]) for q, data in zip(queries, results)
+            if data and data.get("answerBox")
+        ]
+        if answers:
+            lines.append("\n\nANSWER BOXES:")
+            lines.append("=" * 80)
+            for q, box in answers:
+                text = box.get("answer") or box.get("snippet")
+                if text:
+                    lines.append(f"{q}: {text}")
+
+        return "\n".join(lines)
@@ -39,3 +39,7 @@ Use this tool when:
     def execute(self, thought: str) -> str:
         # Return a neutral confirmation — the value is in the reasoning, not the result
         return "Reasoning recorded. Proceed with your next action."
+
+    async def aexecute(self, thought: str) -> str:
+        # Pure computation — no point paying for a thread hop
+        return self.execute(thought)